@@ -0,0 +1,70 @@
+"""Admission control dependencies for PROVENIQ Core route groups."""
+
+from typing import AsyncIterator, Callable
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.auth import AuthenticatedUser, get_current_user
+from app.services import deadline
+from app.services.admission import AdmissionController, AdmissionRejected, RouteGroupPolicy
+
+
+ROUTE_GROUP_POLICIES = {
+    "valuations": RouteGroupPolicy(
+        rate_per_second=50, burst=100, tenant_concurrency=32,
+        group_concurrency=128, interactive_reserve=32,
+    ),
+    "fraud": RouteGroupPolicy(
+        rate_per_second=50, burst=100, tenant_concurrency=32,
+        group_concurrency=128, interactive_reserve=32,
+    ),
+    "assets": RouteGroupPolicy(
+        rate_per_second=100, burst=200, tenant_concurrency=64,
+        group_concurrency=256, interactive_reserve=64,
+    ),
+    "gateway": RouteGroupPolicy(
+        rate_per_second=20, burst=40, tenant_concurrency=16,
+        group_concurrency=64, interactive_reserve=16,
+    ),
+}
+
+admission_controller = AdmissionController(ROUTE_GROUP_POLICIES)
+
+
+def tenant_key(current_user: AuthenticatedUser) -> str:
+    # Keyed on the verified principal: a client-supplied header would let
+    # any caller spend another app's budget. Apps call with their own
+    # service accounts, so each app is still its own tenant.
+    return f"user:{current_user.uid}"
+
+
+def require_admission(group: str) -> Callable:
+    """
+    Dependency factory admitting a request into `group`.
+
+    Callers mark background work with `X-Traffic-Class: bulk`; bulk
+    requests cannot use the capacity reserved for interactive traffic.
+    Shed requests get 429 with Retry-After.
+    """
+    async def dependency(
+        request: Request,
+        current_user: AuthenticatedUser = Depends(get_current_user),
+    ) -> AsyncIterator[None]:
+        interactive = request.headers.get("x-traffic-class", "interactive").lower() != "bulk"
+        try:
+            async with admission_controller.admit(
+                tenant_key(current_user),
+                group,
+                interactive,
+                # Don't queue past the caller's deadline
+                max_wait=deadline.remaining(),
+            ):
+                yield
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=e.reason,
+                headers={"Retry-After": e.retry_after_header},
+            )
+
+    return dependency
@@ -1,15 +1,169 @@
 """Authentication helpers for PROVENIQ Core backend."""
 
+import asyncio
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from fastapi import HTTPException, Request, status
+import firebase_admin
+import httpx
+from fastapi import Depends, HTTPException, Request, status
 from firebase_admin import auth
+from google.auth import jwt as google_jwt
 from pydantic import BaseModel
 
+from app.services.cache import SingleFlight, TTLCache
+
+
+FIREBASE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+
 
 class AuthenticatedUser(BaseModel):
     uid: str
     email: Optional[str] = None
+    admin: bool = False  # Firebase custom claim `admin: true`
+
+
+class TokenVerifier:
+    """
+    Firebase ID-token verification with a decoded-claims cache.
+
+    Verified tokens are cached by SHA-256 digest until their `exp`, so a
+    repeat token costs one hash and one dict lookup. Firebase's signing
+    certificates are held locally and refreshed in the background; cache
+    misses verify on a small thread pool so signature checks never block
+    the event loop. Falls back to `firebase_admin.auth.verify_id_token`
+    when local keys are unavailable or the Auth emulator is in use.
+
+    Revoked tokens stay accepted until they expire, as with the default
+    (non-`check_revoked`) Firebase verification.
+    """
+
+    def __init__(self, maxsize: int = 50_000, max_workers: int = 4, clock_skew_seconds: int = 10):
+        self.clock_skew_seconds = clock_skew_seconds
+        self._claims: TTLCache[bytes, AuthenticatedUser] = TTLCache(maxsize, ttl_seconds=0)
+        self._flights: SingleFlight[bytes] = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="token-verify")
+        self._certs: dict[str, str] = {}
+        self._certs_expire_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self.fallback_verifications = 0
+
+    # -------------------------------------------------------------------------
+    # Public keys
+    # -------------------------------------------------------------------------
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=10.0)
+        return self._http
+
+    async def refresh_certs(self) -> float:
+        """Fetch the signing certificates; returns seconds until they go stale."""
+        response = await self._get_http().get(FIREBASE_CERTS_URL)
+        response.raise_for_status()
+        max_age = 3600.0
+        match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+        if match:
+            max_age = float(match.group(1))
+        self._certs = response.json()
+        self._certs_expire_at = time.time() + max_age
+        return max_age
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                max_age = await self.refresh_certs()
+                # Refresh well before Google rotates the keys out
+                await asyncio.sleep(max(60.0, max_age * 0.8))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[TokenVerifier] Certificate refresh failed: {e}")
+                await asyncio.sleep(30.0)
+
+    def start(self) -> None:
+        """Start refreshing signing certificates in the background."""
+        if self._refresh_task is None and not os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self._executor.shutdown(wait=False)
+
+    # -------------------------------------------------------------------------
+    # Verification
+    # -------------------------------------------------------------------------
+
+    def _verify_locally(self, token: str, project_id: str, certs: dict[str, str]) -> dict:
+        """Check signature, audience, issuer and expiry like firebase_admin does."""
+        claims = google_jwt.decode(
+            token,
+            certs=certs,
+            audience=project_id,
+            clock_skew_in_seconds=self.clock_skew_seconds,
+        )
+        if claims.get("iss") != f"https://securetoken.google.com/{project_id}":
+            raise ValueError("Invalid token issuer")
+        subject = claims.get("sub")
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise ValueError("Invalid token subject")
+        claims["uid"] = subject
+        return claims
+
+    def _verify_sync(self, token: str) -> dict:
+        project_id = firebase_admin.get_app().project_id
+        certs = self._certs
+        if project_id and certs and time.time() < self._certs_expire_at:
+            # A kid we don't hold yet means keys rotated before our refresh
+            if google_jwt.decode_header(token).get("kid") in certs:
+                return self._verify_locally(token, project_id, certs)
+        self.fallback_verifications += 1
+        return auth.verify_id_token(token)
+
+    async def verify(self, token: str) -> AuthenticatedUser:
+        """Verify a Firebase ID token; raises on an invalid token."""
+        digest = hashlib.sha256(token.encode()).digest()
+        user = self._claims.get(digest)
+        if user is not None:
+            return user
+
+        async def verify_and_cache() -> AuthenticatedUser:
+            loop = asyncio.get_running_loop()
+            decoded = await loop.run_in_executor(self._executor, self._verify_sync, token)
+            verified = AuthenticatedUser(
+                uid=decoded["uid"],
+                email=decoded.get("email"),
+                admin=decoded.get("admin") is True,
+            )
+            ttl = float(decoded.get("exp", 0)) - time.time()
+            if ttl > 0:
+                self._claims.set(digest, verified, ttl_seconds=ttl)
+            return verified
+
+        user, _ = await self._flights.do(digest, verify_and_cache)
+        return user
+
+    def stats(self) -> dict:
+        return {
+            **self._claims.stats(),
+            "coalesced": self._flights.coalesced,
+            "fallback_verifications": self.fallback_verifications,
+            "certs_loaded": len(self._certs),
+            "certs_expire_in_seconds": max(0, round(self._certs_expire_at - time.time())),
+        }
+
+
+token_verifier = TokenVerifier()
 
 
 async def get_current_user(request: Request) -> AuthenticatedUser:
@@ -18,7 +172,12 @@ async def get_current_user(request: Request) -> AuthenticatedUser:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
     token = auth_header.split(" ", 1)[1]
     try:
-        decoded = auth.verify_id_token(token)
-        return AuthenticatedUser(uid=decoded["uid"], email=decoded.get("email"))
+        return await token_verifier.verify(token)
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+async def require_admin(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
+    if not current_user.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user
@@ -0,0 +1,60 @@
+"""Request deadline middleware for PROVENIQ Core."""
+
+import asyncio
+import json
+
+from app.services import deadline
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware that enforces the caller's request deadline.
+
+    Sets the deadline context for the request and cancels the handler
+    when it passes. If no response has started by then, answers 504.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        budget = deadline.budget_from_headers(headers)
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+        if budget <= 0:
+            await self._send_timeout(send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        with deadline.deadline_scope(budget):
+            try:
+                async with asyncio.timeout(budget):
+                    await self.app(scope, receive, send_wrapper)
+            except TimeoutError:
+                if not response_started:
+                    await self._send_timeout(send)
+
+    async def _send_timeout(self, send):
+        body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
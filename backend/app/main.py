@@ -1,39 +1,67 @@
 """PROVENIQ Core - Trust Kernel backend (FastAPI)."""
 
+import asyncio
+import csv
 import hashlib
 import io
 import json
 import os
+import time
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
 
 import firebase_admin
-from fastapi import FastAPI, Depends, HTTPException, Request, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, StreamingResponse
 from firebase_admin import credentials
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Integer, Text, select
-from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB
+from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Boolean, Index, Integer, Text, UniqueConstraint, delete, event, insert, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import aliased, declarative_base, relationship
 from sqlalchemy.sql import func
 
+from app.services.asset_registry import metadata as asset_registry_metadata
+from app.services.evidence_verifier import EvidenceVerifier, VerificationJob, VerificationResult, VerificationStatus
+from app.services import deadline
+from app.services.hashing import (
+    DuplicateItemKey,
+    HashScheme,
+    InvalidItemKey,
+    canonicalize,
+    content_hash_from_canonical,
+    STORED_ITEM_FIELDS,
+    item_key,
+    stored_item_fields,
+)
+from app.services.merkle import MerkleTree, ProofStep, leaf_hash_canonical
+from app.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+from app.services.storage import (
+    InvalidUploadToken,
+    LocalStorage,
+    ObjectTooLarge,
+    StorageBackend,
+    StorageProvider,
+    create_storage,
+)
+
 
 # -----------------------------------------------------------------------------
 # Settings
 # -----------------------------------------------------------------------------
 
-class StorageProvider(str, Enum):
-    GCS = "gcs"
-    S3 = "s3"
-
-
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -54,9 +82,45 @@ class Settings(BaseSettings):
     aws_secret_access_key: Optional[str] = None
     aws_region: Optional[str] = "us-east-1"
     s3_bucket_name: Optional[str] = None
+    local_storage_root: str = "./storage"
+    local_storage_secret: Optional[str] = None
+    public_base_url: str = "http://localhost:8000"
+    storage_max_workers: int = 16
 
     presign_ttl_seconds: int = 300
     max_upload_size_mb: int = 50
+    evidence_batch_max_files: int = 500
+    evidence_head_concurrency: int = 16
+    evidence_verify_workers: int = 8
+    evidence_verify_chunk_bytes: int = 1024 * 1024
+    # Pending evidence is claimed for this long by the worker that queued it;
+    # unclaimed or expired rows are picked up every EVIDENCE_REQUEUE_INTERVAL_SECONDS
+    evidence_verify_lease_seconds: int = 300
+    evidence_requeue_interval_seconds: int = 30
+
+    submit_max_items: int = 10_000
+    submit_budget_seconds: float = 10.0
+    submit_upsert_batch_size: int = 1000
+    submit_hash_batch_size: int = 1000
+
+    export_batch_size: int = 500
+
+    certificate_cache_dir: str = "./cache/certificates"
+    certificate_render_workers: int = 2
+    # Stale certificate versions unserved for this long are removed on the next render
+    certificate_prune_grace_seconds: float = 300.0
+    certificate_export_max: int = 1000
+
+    integrity_batch_size: int = 200
+    integrity_workers: int = 2
+    integrity_max_rows_per_second: float = 5000.0
+    integrity_report_max_findings: int = 1000
+    # A running sweep whose lease (updated_at) is older than this is taken over;
+    # live runners renew it every INTEGRITY_HEARTBEAT_SECONDS
+    integrity_resume_after_seconds: int = 60
+    integrity_heartbeat_seconds: int = 15
+
+    user_org_cache_ttl_seconds: int = 300
 
 
 settings = Settings()
@@ -104,6 +168,9 @@ class User(Base):
 
 class Property(Base):
     __tablename__ = "properties"
+    __table_args__ = (
+        Index("ix_properties_org_created", "org_id", "created_at", "id"),
+    )
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     org_id = Column(PGUUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
     name = Column(String(255), nullable=False)
@@ -116,8 +183,13 @@ class Property(Base):
 
 class Unit(Base):
     __tablename__ = "units"
+    __table_args__ = (
+        Index("ix_units_property_created", "property_id", "created_at", "id"),
+        Index("ix_units_org_created", "org_id", "created_at", "id"),
+    )
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     property_id = Column(PGUUID(as_uuid=True), ForeignKey("properties.id"), nullable=False)
+    org_id = Column(PGUUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True)
     unit_number = Column(String(50), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
 
@@ -134,8 +206,14 @@ class LeaseStatus(str, Enum):
 
 class Lease(Base):
     __tablename__ = "leases"
+    __table_args__ = (
+        Index("ix_leases_unit_status", "unit_id", "status"),
+        Index("ix_leases_org_status_created", "org_id", "status", "created_at", "id"),
+        Index("ix_leases_org_created", "org_id", "created_at", "id"),
+    )
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     unit_id = Column(PGUUID(as_uuid=True), ForeignKey("units.id"), nullable=False)
+    org_id = Column(PGUUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True)
     tenant_email = Column(String(255), nullable=False)
     status = Column(String(32), default=LeaseStatus.DRAFT.value, nullable=False)
     invite_token_hash = Column(String(128), nullable=True)
@@ -160,11 +238,21 @@ class InspectionType(str, Enum):
 
 class Inspection(Base):
     __tablename__ = "inspections"
+    __table_args__ = (
+        Index("ix_inspections_lease_status", "lease_id", "status"),
+        Index("ix_inspections_org_status_created", "org_id", "status", "created_at", "id"),
+        Index("ix_inspections_org_created", "org_id", "created_at", "id"),
+    )
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     lease_id = Column(PGUUID(as_uuid=True), ForeignKey("leases.id"), nullable=False)
+    org_id = Column(PGUUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True)
     inspection_type = Column(String(32), nullable=False)
     status = Column(String(32), default=InspectionStatus.DRAFT.value, nullable=False)
     content_hash = Column(String(64), nullable=True)
+    hash_scheme = Column(String(32), nullable=False, default=HashScheme.V1.value, server_default=HashScheme.V1.value)
+    merkle_root = Column(String(64), nullable=True)
+    # [{room_key, item_key, ordinal, leaf_hash}] sorted by key; see app.services.merkle
+    merkle_leaves = Column(JSONB, nullable=True)
     signed_at = Column(DateTime, nullable=True)
     submitted_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
@@ -176,6 +264,9 @@ class Inspection(Base):
 
 class InspectionItem(Base):
     __tablename__ = "inspection_items"
+    __table_args__ = (
+        UniqueConstraint("inspection_id", "room_key", "item_key", "ordinal", name="uq_inspection_items_key"),
+    )
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     inspection_id = Column(PGUUID(as_uuid=True), ForeignKey("inspections.id"), nullable=False)
     room_key = Column(String(100), nullable=False)
@@ -185,6 +276,11 @@ class InspectionItem(Base):
     condition_rating = Column(Integer, nullable=True)
     is_damaged = Column(Boolean, default=False)
     damage_description = Column(Text, nullable=True)
+    # Canonical JSON of the submitted item, exactly as hashed
+    canonical_json = Column(Text, nullable=True)
+    # Index in the submitted list; the v1 content hash depends on item order
+    position = Column(Integer, nullable=True)
+    leaf_hash = Column(String(64), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
 
     inspection = relationship("Inspection", back_populates="items")
@@ -193,15 +289,37 @@ class InspectionItem(Base):
 
 class InspectionEvidence(Base):
     __tablename__ = "inspection_evidence"
+    __table_args__ = (
+        # Keyset pagination of an inspection's evidence
+        Index("ix_inspection_evidence_inspection_created", "inspection_id", "created_at", "id"),
+        # Each uploaded object is confirmed once; dedup rows reuse the original's path
+        Index(
+            "uq_inspection_evidence_object_path_original", "object_path",
+            unique=True, postgresql_where=text("dedup_of_id IS NULL"),
+        ),
+        # Requeue scan over evidence still awaiting verification
+        Index(
+            "ix_inspection_evidence_pending", "created_at",
+            postgresql_where=text("verification_status = 'pending'"),
+        ),
+    )
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     inspection_id = Column(PGUUID(as_uuid=True), ForeignKey("inspections.id"), nullable=False)
     item_id = Column(PGUUID(as_uuid=True), ForeignKey("inspection_items.id"), nullable=False)
     storage_provider = Column(String(10), nullable=False)
-    object_path = Column(String(512), nullable=False, unique=True)
+    # Not unique: deduplicated evidence shares the original's object
+    object_path = Column(String(512), nullable=False, index=True)
     mime_type = Column(String(128), nullable=False)
     file_size = Column(Integer, nullable=False)
-    file_hash = Column(String(64), nullable=True)
+    file_hash = Column(String(64), nullable=True, index=True)
+    dedup_of_id = Column(PGUUID(as_uuid=True), ForeignKey("inspection_evidence.id"), nullable=True)
     is_confirmed = Column(Boolean, default=False)
+    verification_status = Column(
+        String(16), nullable=False, default=VerificationStatus.PENDING.value, server_default=VerificationStatus.PENDING.value
+    )
+    verified_at = Column(DateTime, nullable=True)
+    # Lease held by the worker that queued the verification; see requeue_pending_verifications
+    verification_claimed_at = Column(DateTime, nullable=True)
     created_by = Column(PGUUID(as_uuid=True), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
 
@@ -209,6 +327,194 @@ class InspectionEvidence(Base):
     item = relationship("InspectionItem", back_populates="evidence")
 
 
+class IntegritySweepStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class IntegritySweep(Base):
+    __tablename__ = "integrity_sweeps"
+    __table_args__ = (
+        Index("ix_integrity_sweeps_org_status", "org_id", "status"),
+    )
+    id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    org_id = Column(PGUUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    status = Column(String(16), nullable=False, default=IntegritySweepStatus.RUNNING.value)
+    # Keyset cursor after the last checked inspection; the sweep resumes from here
+    cursor = Column(String(256), nullable=True)
+    inspections_checked = Column(Integer, nullable=False, default=0)
+    items_checked = Column(Integer, nullable=False, default=0)
+    evidence_checked = Column(Integer, nullable=False, default=0)
+    rows_checked = Column(Integer, nullable=False, default=0)
+    elapsed_seconds = Column(Float, nullable=False, default=0.0)
+    findings_count = Column(Integer, nullable=False, default=0)
+    findings_by_kind = Column(JSONB, nullable=False, default=dict)
+    # The first INTEGRITY_REPORT_MAX_FINDINGS findings; see app.services.integrity
+    findings = Column(JSONB, nullable=False, default=list)
+    error = Column(Text, nullable=True)
+    started_by = Column(String(128), nullable=False)  # Firebase UID
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now())
+    finished_at = Column(DateTime, nullable=True)
+
+
+# -----------------------------------------------------------------------------
+# Schema upgrades
+# -----------------------------------------------------------------------------
+# create_all creates missing tables but never alters existing ones, so
+# columns, constraints and indexes added to existing tables are applied
+# here. Every statement is idempotent; they run in order at startup after
+# create_all, under an advisory lock so concurrently starting workers
+# don't race each other.
+
+SCHEMA_UPGRADE_LOCK_ID = 7_420_318_001
+
+# (table, parent table, foreign key to the parent); properties carry org_id natively
+ORG_ID_CHAIN = [
+    ("units", "properties", "property_id"),
+    ("leases", "units", "unit_id"),
+    ("inspections", "leases", "lease_id"),
+]
+
+
+def _create_trigger_if_missing(name: str, table: str, definition: str) -> str:
+    return f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = '{name}' AND tgrelid = '{table}'::regclass) THEN
+            CREATE TRIGGER {name} {definition};
+        END IF;
+    END $$
+    """
+
+
+def _org_id_upgrades() -> list[str]:
+    """
+    Denormalized org_id on units, leases and inspections.
+
+    The column lets org-scoped listings filter without joining up to
+    properties. Those rows are written outside this service, so it is
+    kept by triggers: each row copies org_id from its parent on insert or
+    update, and a change to a parent's org_id is pushed down to its
+    children. The models' org_id columns are only ever read.
+    """
+    statements = []
+    for table, parent, fk in ORG_ID_CHAIN:
+        statements += [
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS org_id UUID REFERENCES organizations (id)",
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_copy_org_id() RETURNS trigger LANGUAGE plpgsql AS $fn$
+            BEGIN
+                SELECT org_id INTO NEW.org_id FROM {parent} WHERE id = NEW.{fk};
+                RETURN NEW;
+            END
+            $fn$
+            """,
+            _create_trigger_if_missing(
+                f"{table}_copy_org_id", table,
+                f"BEFORE INSERT OR UPDATE ON {table} FOR EACH ROW EXECUTE FUNCTION {table}_copy_org_id()",
+            ),
+            f"""
+            CREATE OR REPLACE FUNCTION {parent}_push_org_id() RETURNS trigger LANGUAGE plpgsql AS $fn$
+            BEGIN
+                UPDATE {table} SET org_id = NEW.org_id WHERE {fk} = NEW.id;
+                RETURN NULL;
+            END
+            $fn$
+            """,
+            _create_trigger_if_missing(
+                f"{parent}_push_org_id", parent,
+                f"AFTER UPDATE ON {parent} FOR EACH ROW WHEN (OLD.org_id IS DISTINCT FROM NEW.org_id) "
+                f"EXECUTE FUNCTION {parent}_push_org_id()",
+            ),
+            # Backfill rows written before the column existed (parents first)
+            f"UPDATE {table} SET org_id = {parent}.org_id FROM {parent} "
+            f"WHERE {table}.{fk} = {parent}.id AND {table}.org_id IS NULL",
+        ]
+    statements += [
+        "CREATE INDEX IF NOT EXISTS ix_units_org_created ON units (org_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_leases_org_status_created ON leases (org_id, status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_leases_org_created ON leases (org_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_inspections_org_status_created ON inspections (org_id, status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_inspections_org_created ON inspections (org_id, created_at, id)",
+        # Superseded by the org-leading indexes above
+        "DROP INDEX IF EXISTS ix_units_created",
+        "DROP INDEX IF EXISTS ix_leases_status_created",
+        "DROP INDEX IF EXISTS ix_leases_created",
+        "DROP INDEX IF EXISTS ix_inspections_status_created",
+        "DROP INDEX IF EXISTS ix_inspections_created",
+    ]
+    return statements
+
+
+SCHEMA_UPGRADES: list[str] = [
+    # Server-side evidence verification. Existing evidence starts pending,
+    # so the startup requeue verifies it.
+    "ALTER TABLE inspection_evidence ADD COLUMN IF NOT EXISTS verification_status VARCHAR(16) NOT NULL DEFAULT 'pending'",
+    "ALTER TABLE inspection_evidence ADD COLUMN IF NOT EXISTS verified_at TIMESTAMP WITHOUT TIME ZONE",
+    "ALTER TABLE inspection_evidence ADD COLUMN IF NOT EXISTS verification_claimed_at TIMESTAMP WITHOUT TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_inspection_evidence_pending"
+    " ON inspection_evidence (created_at) WHERE verification_status = 'pending'",
+    # Evidence dedup: object_path is shared by dedup rows, so the column-level
+    # UNIQUE becomes a unique index over original (non-dedup) rows only.
+    "ALTER TABLE inspection_evidence ADD COLUMN IF NOT EXISTS dedup_of_id UUID REFERENCES inspection_evidence (id)",
+    "ALTER TABLE inspection_evidence DROP CONSTRAINT IF EXISTS inspection_evidence_object_path_key",
+    "CREATE INDEX IF NOT EXISTS ix_inspection_evidence_object_path ON inspection_evidence (object_path)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_inspection_evidence_object_path_original"
+    " ON inspection_evidence (object_path) WHERE dedup_of_id IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_inspection_evidence_file_hash ON inspection_evidence (file_hash)",
+    "CREATE INDEX IF NOT EXISTS ix_inspection_evidence_inspection_created"
+    " ON inspection_evidence (inspection_id, created_at, id)",
+    # Merkle roots. Inspections submitted earlier used the v1 scheme and have no root.
+    "ALTER TABLE inspections ADD COLUMN IF NOT EXISTS hash_scheme VARCHAR(32) NOT NULL DEFAULT 'sha256-json-v1'",
+    "ALTER TABLE inspections ADD COLUMN IF NOT EXISTS merkle_root VARCHAR(64)",
+    "ALTER TABLE inspections ADD COLUMN IF NOT EXISTS merkle_leaves JSONB",
+    # Stored item rows. Items submitted before the upsert key existed may repeat
+    # a key; later duplicates are moved to fresh ordinals (keeping their IDs and
+    # evidence) so the key can be enforced.
+    "ALTER TABLE inspection_items ADD COLUMN IF NOT EXISTS canonical_json TEXT",
+    "ALTER TABLE inspection_items ADD COLUMN IF NOT EXISTS leaf_hash VARCHAR(64)",
+    "ALTER TABLE inspection_items ADD COLUMN IF NOT EXISTS position INTEGER",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_inspection_items_key') THEN
+            WITH ranked AS (
+                SELECT id, inspection_id, room_key, item_key, ordinal, created_at,
+                       row_number() OVER (
+                           PARTITION BY inspection_id, room_key, item_key, ordinal ORDER BY created_at, id
+                       ) AS dup,
+                       max(ordinal) OVER (PARTITION BY inspection_id, room_key, item_key) AS top
+                FROM inspection_items
+            ), moved AS (
+                SELECT id, top + row_number() OVER (
+                           PARTITION BY inspection_id, room_key, item_key ORDER BY ordinal, created_at, id
+                       ) AS new_ordinal
+                FROM ranked
+                WHERE dup > 1
+            )
+            UPDATE inspection_items SET ordinal = moved.new_ordinal
+            FROM moved WHERE inspection_items.id = moved.id;
+            ALTER TABLE inspection_items
+                ADD CONSTRAINT uq_inspection_items_key UNIQUE (inspection_id, room_key, item_key, ordinal);
+        END IF;
+    END $$
+    """,
+    *_org_id_upgrades(),
+    # Asset registry lookups by owner and anchor
+    "CREATE INDEX IF NOT EXISTS ix_registered_assets_owner ON registered_assets (owner_id, registered_at, paid)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_registered_assets_anchor ON registered_assets (anchor_id)",
+]
+
+
+async def upgrade_schema(conn) -> None:
+    """Apply SCHEMA_UPGRADES; run inside the startup transaction holding the lock."""
+    for statement in SCHEMA_UPGRADES:
+        await conn.execute(text(statement))
+
+
 # -----------------------------------------------------------------------------
 # Firebase Init
 # -----------------------------------------------------------------------------
@@ -219,7 +525,19 @@ if not firebase_admin._apps:
     firebase_admin.initialize_app(cred)
 
 
-from app.auth import AuthenticatedUser, get_current_user
+from app.auth import AuthenticatedUser, get_current_user, require_admin, token_verifier
+from app.deadline import DeadlineMiddleware
+from app.services.cache import TTLCache
+from app.services.deadline import DeadlineExceeded
+from app.services.certificates import (
+    CertificateRenderer,
+    certificate_etag,
+    certificate_fields,
+    if_none_match,
+    stream_certificate_archive,
+)
+from app.services.evidence_dedup import DedupStats
+from app.services.integrity import IntegrityChecker
 
 
 # -----------------------------------------------------------------------------
@@ -232,12 +550,17 @@ class PresignRequest(BaseModel):
     file_name: str
     mime_type: str
     file_size_bytes: int
+    # SHA-256 of the file; lets Core skip the upload if the org already stores it
+    content_hash: Optional[str] = Field(default=None, pattern=r"^[0-9a-fA-F]{64}$")
 
 
 class PresignResponse(BaseModel):
-    upload_url: str
+    upload_url: Optional[str] = None
     object_path: str
-    expires_at: datetime
+    expires_at: Optional[datetime] = None
+    already_stored: bool = False
+    evidence_id: Optional[UUID] = None
+    dedup_of_id: Optional[UUID] = None
 
 
 class ConfirmEvidenceRequest(BaseModel):
@@ -248,8 +571,73 @@ class ConfirmEvidenceRequest(BaseModel):
     file_hash: Optional[str] = None
 
 
+class BatchPresignRequest(BaseModel):
+    files: list[PresignRequest] = Field(min_length=1)
+
+
+class BatchPresignResult(BaseModel):
+    index: int
+    item_id: UUID
+    file_name: str
+    status: str  # "ok" | "already_stored" | "error"
+    upload_url: Optional[str] = None
+    object_path: Optional[str] = None
+    evidence_id: Optional[UUID] = None
+    dedup_of_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class BatchPresignResponse(BaseModel):
+    expires_at: datetime
+    signed: int
+    already_stored: int
+    failed: int
+    results: list[BatchPresignResult]
+
+
+class BatchConfirmRequest(BaseModel):
+    files: list[ConfirmEvidenceRequest] = Field(min_length=1)
+
+
+class BatchConfirmResult(BaseModel):
+    index: int
+    item_id: UUID
+    object_path: str
+    status: str  # "confirmed" | "error"
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchConfirmResponse(BaseModel):
+    confirmed: int
+    failed: int
+    results: list[BatchConfirmResult]
+
+
+class CertificateExportRequest(BaseModel):
+    inspection_ids: Optional[list[UUID]] = None
+    submitted_from: Optional[datetime] = None
+    submitted_to: Optional[datetime] = None
+
+
 class SubmitInspectionRequest(BaseModel):
     items: list[dict] = Field(default_factory=list)
+    # Which scheme `content_hash` uses; the Merkle root is recorded either way
+    hash_scheme: HashScheme = HashScheme.V1
+
+
+class ItemProofResponse(BaseModel):
+    inspection_id: UUID
+    hash_scheme: HashScheme
+    content_hash: str
+    merkle_root: str
+    room_key: str
+    item_key: str
+    ordinal: int
+    leaf_index: int
+    tree_size: int
+    leaf_hash: str
+    audit_path: list[ProofStep]
 
 
 class MagicLinkRequest(BaseModel):
@@ -264,7 +652,7 @@ class MagicLinkResponse(BaseModel):
 
 
 # -----------------------------------------------------------------------------
-# Storage (stubbed presign for now)
+# Storage
 # -----------------------------------------------------------------------------
 
 
@@ -273,117 +661,274 @@ def generate_object_path(org_id: UUID, inspection_id: UUID, item_id: UUID, file_
     return f"orgs/{org_id}/inspections/{inspection_id}/items/{item_id}/{uuid4()}.{ext}"
 
 
+# Created at startup; holds the long-lived storage SDK client and its pool
+storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    global storage
+    if storage is None:
+        storage = create_storage(settings)
+    return storage
+
+
 async def presign_upload(object_path: str, mime_type: str, ttl_seconds: int) -> tuple[str, datetime]:
     expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-    if settings.storage_provider == StorageProvider.GCS:
-        from google.cloud import storage as gcs_storage
-        client = gcs_storage.Client(project=settings.gcs_project_id)
-        bucket = client.bucket(settings.gcs_bucket_name)
-        blob = bucket.blob(object_path)
-        url = blob.generate_signed_url(
-            version="v4",
-            expiration=timedelta(seconds=ttl_seconds),
-            method="PUT",
-            content_type=mime_type,
-        )
-        return url, expires_at
-    else:
-        import boto3
-        s3 = boto3.client(
-            "s3",
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-        )
-        url = s3.generate_presigned_url(
-            "put_object",
-            Params={
-                "Bucket": settings.s3_bucket_name,
-                "Key": object_path,
-                "ContentType": mime_type,
-            },
-            ExpiresIn=ttl_seconds,
+    url = await get_storage().presign_put(object_path, mime_type, ttl_seconds)
+    return url, expires_at
+
+
+async def record_verification(result: VerificationResult) -> None:
+    values = {"verification_status": result.status.value, "verified_at": result.verified_at}
+    async with SessionLocal() as db:
+        if result.status == VerificationStatus.VERIFIED:
+            # Adopt the server-computed hash when the client sent none
+            await db.execute(
+                update(InspectionEvidence)
+                .where(InspectionEvidence.id == result.evidence_id, InspectionEvidence.file_hash.is_(None))
+                .values(file_hash=result.computed_hash)
+            )
+        await db.execute(update(InspectionEvidence).where(InspectionEvidence.id == result.evidence_id).values(**values))
+        await db.commit()
+
+
+evidence_verifier = EvidenceVerifier(
+    storage=get_storage,
+    on_result=record_verification,
+    workers=settings.evidence_verify_workers,
+    chunk_size=settings.evidence_verify_chunk_bytes,
+)
+
+
+verification_requeue_task: Optional[asyncio.Task] = None
+
+
+async def requeue_pending_verifications() -> None:
+    """
+    Claim and resubmit evidence left pending by a restart or a full queue.
+
+    `verification_claimed_at` is a lease: rows are claimed (up to the free
+    queue space) only if unclaimed or expired, with SKIP LOCKED, so each
+    pending row is queued by one worker at a time.
+    """
+    limit = evidence_verifier.capacity()
+    if limit <= 0:
+        return
+    now = datetime.utcnow()
+    claimable = (
+        select(InspectionEvidence.id)
+        .where(
+            InspectionEvidence.is_confirmed.is_(True),
+            InspectionEvidence.verification_status == VerificationStatus.PENDING.value,
+            or_(
+                InspectionEvidence.verification_claimed_at.is_(None),
+                InspectionEvidence.verification_claimed_at < now - timedelta(seconds=settings.evidence_verify_lease_seconds),
+            ),
         )
-        return url, expires_at
+        .order_by(InspectionEvidence.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with SessionLocal() as db:
+        claimed = (await db.execute(
+            update(InspectionEvidence)
+            .where(InspectionEvidence.id.in_(claimable))
+            .values(verification_claimed_at=now)
+            .returning(InspectionEvidence.id, InspectionEvidence.object_path, InspectionEvidence.file_hash)
+            .execution_options(synchronize_session=False)
+        )).all()
+        await db.commit()
+    for evidence_id, object_path, file_hash in claimed:
+        # A deferred job keeps its claim and is retried when the lease expires
+        if not evidence_verifier.submit(VerificationJob(evidence_id=evidence_id, object_path=object_path, expected_hash=file_hash)):
+            break
+
+
+async def run_verification_requeue() -> None:
+    """Requeue pending evidence periodically, for the life of the process."""
+    while True:
+        await asyncio.sleep(settings.evidence_requeue_interval_seconds)
+        try:
+            await requeue_pending_verifications()
+        except Exception as e:
+            print(f"[EvidenceVerifier] Requeue failed: {e}")
 
 
-# -----------------------------------------------------------------------------
-# Hashing helpers
-# -----------------------------------------------------------------------------
+dedup_stats = DedupStats()
 
-def canonicalize_inspection(items: list[dict]) -> str:
-    # Sort keys and drop nulls/None
-    def clean(obj):
-        if isinstance(obj, dict):
-            return {k: clean(v) for k, v in sorted(obj.items()) if v is not None}
-        if isinstance(obj, list):
-            return [clean(x) for x in obj]
-        return obj
-    cleaned = clean(items)
-    return json.dumps(cleaned, separators=(",", ":"), sort_keys=True)
+certificate_renderer = CertificateRenderer(
+    settings.certificate_cache_dir,
+    max_workers=settings.certificate_render_workers,
+    prune_grace_seconds=settings.certificate_prune_grace_seconds,
+)
 
 
-def compute_content_hash(items: list[dict]) -> str:
-    canonical = canonicalize_inspection(items)
-    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+async def find_stored_evidence(db: AsyncSession, org_id: UUID, content_hashes: set[str]) -> dict[str, InspectionEvidence]:
+    """
+    Verified evidence already stored for the org, keyed by content hash.
+
+    Only server-verified hashes are trusted, so a client can't claim a
+    hash to reference an object whose content differs.
+    """
+    if not content_hashes:
+        return {}
+    rows = await db.execute(
+        select(InspectionEvidence)
+        .where(
+            InspectionEvidence.file_hash.in_(content_hashes),
+            InspectionEvidence.verification_status == VerificationStatus.VERIFIED.value,
+            InspectionEvidence.storage_provider == settings.storage_provider.value,
+            InspectionEvidence.object_path.startswith(f"orgs/{org_id}/"),
+        )
+        .order_by(InspectionEvidence.created_at)
+    )
+    stored: dict[str, InspectionEvidence] = {}
+    for ev in rows.scalars():
+        stored.setdefault(ev.file_hash, ev)
+    return stored
+
+
+def dedup_evidence_row(
+    original: InspectionEvidence,
+    inspection_id: UUID,
+    item_id: UUID,
+    mime_type: str,
+    created_by: UUID,
+) -> dict:
+    """Evidence row for an item that references an already-stored object."""
+    return {
+        "id": uuid4(),
+        "inspection_id": inspection_id,
+        "item_id": item_id,
+        "storage_provider": original.storage_provider,
+        "object_path": original.object_path,
+        "mime_type": mime_type,
+        "file_size": original.file_size,
+        "file_hash": original.file_hash,
+        "dedup_of_id": original.dedup_of_id or original.id,
+        "is_confirmed": True,
+        "verification_status": VerificationStatus.VERIFIED.value,
+        "verified_at": original.verified_at,
+        "created_by": created_by,
+    }
 
 
 # -----------------------------------------------------------------------------
 # Authorization helpers
 # -----------------------------------------------------------------------------
 
+# firebase_uid -> org_id. Entries are dropped when a User row is inserted,
+# updated or deleted through the ORM; the TTL bounds staleness for changes
+# made elsewhere (other workers, bulk SQL).
+user_org_cache: TTLCache[str, UUID] = TTLCache(maxsize=50_000, ttl_seconds=settings.user_org_cache_ttl_seconds)
+
+
+def invalidate_user_org(firebase_uid: str) -> None:
+    user_org_cache.pop(firebase_uid)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_membership_changed(mapper, connection, target: User) -> None:
+    invalidate_user_org(target.firebase_uid)
+
+
+def _user_org_subquery(current_user: AuthenticatedUser):
+    return (
+        select(User.org_id)
+        .where(User.firebase_uid == current_user.uid)
+        .scalar_subquery()
+        .label("user_org_id")
+    )
+
+
+def _check_user_org(current_user: AuthenticatedUser, user_org_id: Optional[UUID], org_id: UUID) -> None:
+    if not user_org_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not assigned to organization")
+    user_org_cache.set(current_user.uid, user_org_id)
+    if user_org_id != org_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
 async def get_user_org_id(db: AsyncSession, current_user: AuthenticatedUser) -> UUID:
+    user_org_id = user_org_cache.get(current_user.uid)
+    if user_org_id:
+        return user_org_id
     user_row = await db.execute(
         select(User.org_id).where(User.firebase_uid == current_user.uid)
     )
     org_id = user_row.scalar_one_or_none()
     if not org_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not assigned to organization")
+    user_org_cache.set(current_user.uid, org_id)
     return org_id
 
 
-async def require_org_access_for_inspection(
+async def require_inspection_access(
     db: AsyncSession,
     inspection_id: UUID,
     current_user: AuthenticatedUser,
-) -> UUID:
-    org_row = await db.execute(
-        select(Property.org_id)
-        .join(Unit, Unit.property_id == Property.id)
-        .join(Lease, Lease.unit_id == Unit.id)
-        .join(Inspection, Inspection.lease_id == Lease.id)
+) -> tuple[UUID, Inspection]:
+    """
+    Authorize the user for an inspection and load it, in one round trip.
+
+    Resolves the inspection row, its org and (on a cache miss) the user's
+    org with a single query. Returns (org_id, inspection).
+    """
+    cached_user_org_id = user_org_cache.get(current_user.uid)
+    stmt = (
+        select(Inspection, Inspection.org_id)
         .where(Inspection.id == inspection_id)
     )
-    org_id = org_row.scalar_one_or_none()
-    if not org_id:
+    if cached_user_org_id is None:
+        stmt = stmt.add_columns(_user_org_subquery(current_user))
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Inspection not found")
 
-    user_org_id = await get_user_org_id(db, current_user)
-    if user_org_id != org_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    inspection, org_id = row[0], row[1]
+    _check_user_org(current_user, cached_user_org_id or row[2], org_id)
+    return org_id, inspection
+
 
+async def require_org_access_for_inspection(
+    db: AsyncSession,
+    inspection_id: UUID,
+    current_user: AuthenticatedUser,
+) -> UUID:
+    org_id, _ = await require_inspection_access(db, inspection_id, current_user)
     return org_id
 
 
-async def require_org_access_for_lease(
+async def require_lease_access(
     db: AsyncSession,
     lease_id: UUID,
     current_user: AuthenticatedUser,
-) -> UUID:
-    org_row = await db.execute(
-        select(Property.org_id)
-        .join(Unit, Unit.property_id == Property.id)
-        .join(Lease, Lease.unit_id == Unit.id)
+) -> tuple[UUID, Lease]:
+    """Authorize the user for a lease and load it, in one round trip."""
+    cached_user_org_id = user_org_cache.get(current_user.uid)
+    stmt = (
+        select(Lease, Lease.org_id)
         .where(Lease.id == lease_id)
     )
-    org_id = org_row.scalar_one_or_none()
-    if not org_id:
+    if cached_user_org_id is None:
+        stmt = stmt.add_columns(_user_org_subquery(current_user))
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Lease not found")
 
-    user_org_id = await get_user_org_id(db, current_user)
-    if user_org_id != org_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    lease, org_id = row[0], row[1]
+    _check_user_org(current_user, cached_user_org_id or row[2], org_id)
+    return org_id, lease
 
+
+async def require_org_access_for_lease(
+    db: AsyncSession,
+    lease_id: UUID,
+    current_user: AuthenticatedUser,
+) -> UUID:
+    org_id, _ = await require_lease_access(db, lease_id, current_user)
     return org_id
 
 
@@ -402,12 +947,36 @@ async def require_inspection_item(
         raise HTTPException(status_code=400, detail="Item does not belong to inspection")
 
 
+async def inspection_item_ids(db: AsyncSession, inspection_id: UUID, item_ids: set[UUID]) -> set[UUID]:
+    """Subset of `item_ids` that belong to the inspection, in one query."""
+    if not item_ids:
+        return set()
+    rows = await db.execute(
+        select(InspectionItem.id).where(
+            InspectionItem.inspection_id == inspection_id,
+            InspectionItem.id.in_(item_ids),
+        )
+    )
+    return set(rows.scalars())
+
+
+def require_batch_size(n: int) -> None:
+    if n > settings.evidence_batch_max_files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.evidence_batch_max_files} files per batch",
+        )
+
+
 # -----------------------------------------------------------------------------
 # FastAPI app
 # -----------------------------------------------------------------------------
 
 app = FastAPI(title=settings.app_name, version="1.0.0")
 
+# Added before CORS so CORS stays outermost and decorates 504s too
+app.add_middleware(DeadlineMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[o.strip() for o in settings.allowed_origins.split(",") if o.strip()],
@@ -417,10 +986,26 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": str(exc)})
+
+
 @app.on_event("startup")
 async def on_startup():
     async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": SCHEMA_UPGRADE_LOCK_ID})
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(asset_registry_metadata.create_all)
+        await upgrade_schema(conn)
+    token_verifier.start()
+    get_storage()
+    evidence_verifier.start()
+    await requeue_pending_verifications()
+    await resume_integrity_sweeps()
+    global integrity_lease_task, verification_requeue_task
+    integrity_lease_task = asyncio.create_task(run_integrity_leases())
+    verification_requeue_task = asyncio.create_task(run_verification_requeue())
 
 
 @app.get("/health")
@@ -428,16 +1013,34 @@ async def health():
     return {"status": "healthy", "service": settings.app_name}
 
 
+@app.get("/metrics")
+async def metrics(current_user: AuthenticatedUser = Depends(require_admin)):
+    """
+    Live runtime metrics for admission, auth, storage, evidence, certificates, integrity sweeps and assets.
+
+    Admin only: admission utilisation is reported per tenant, i.e. per user.
+    """
+    from app.admission import admission_controller
+    from app.routers.assets import asset_registry
+    return {
+        "admission": [group.model_dump() for group in admission_controller.utilization()],
+        "auth": token_verifier.stats(),
+        "storage": get_storage().metrics(),
+        "evidence_verification": evidence_verifier.stats(),
+        "evidence_dedup": dedup_stats.stats(),
+        "certificates": certificate_renderer.stats(),
+        "integrity": {"running_sweeps": len(integrity_tasks), **integrity_checker.stats()},
+        "assets": asset_registry.stats(),
+    }
+
+
 @app.post("/auth/magic-link/request", response_model=MagicLinkResponse)
 async def request_magic_link(
     payload: MagicLinkRequest,
     db: AsyncSession = Depends(get_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    await require_org_access_for_lease(db, payload.lease_id, current_user)
-    lease = await db.get(Lease, payload.lease_id)
-    if not lease:
-        raise HTTPException(status_code=404, detail="Lease not found")
+    _, lease = await require_lease_access(db, payload.lease_id, current_user)
     # Verify email matches lease tenant email
     if lease.tenant_email.lower() != payload.email.lower():
         raise HTTPException(status_code=400, detail="Email does not match lease tenant email")
@@ -458,6 +1061,508 @@ async def request_magic_link(
     )
 
 
+# -----------------------------------------------------------------------------
+# Org-scoped listings (keyset pagination on created_at, id)
+# -----------------------------------------------------------------------------
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _columns(model, exclude: tuple[str, ...] = ()):
+    return [c for c in model.__table__.columns if c.name not in exclude]
+
+
+async def _list_page(
+    db: AsyncSession,
+    model,
+    stmt,
+    limit: int,
+    cursor: Optional[str],
+    exclude: tuple[str, ...] = (),
+) -> JSONResponse:
+    """Run a keyset-paginated listing and serialize the rows directly."""
+    stmt = stmt.order_by(model.created_at, model.id).limit(limit + 1)
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        stmt = stmt.where(tuple_(model.created_at, model.id) > after)
+    rows = list((await db.execute(stmt)).all())
+    next_page = next_cursor(rows, limit)
+    columns = _columns(model, exclude)
+    return JSONResponse({
+        "items": [{c.name: _json_value(getattr(row, c.name)) for c in columns} for row in rows],
+        "next_cursor": next_page,
+    })
+
+
+@app.get("/properties")
+async def list_properties(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    org_id = await get_user_org_id(db, current_user)
+    stmt = select(*_columns(Property)).where(Property.org_id == org_id)
+    return await _list_page(db, Property, stmt, limit, cursor)
+
+
+@app.get("/units")
+async def list_units(
+    property_id: Optional[UUID] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    org_id = await get_user_org_id(db, current_user)
+    stmt = select(*_columns(Unit)).where(Unit.org_id == org_id)
+    if property_id:
+        stmt = stmt.where(Unit.property_id == property_id)
+    return await _list_page(db, Unit, stmt, limit, cursor)
+
+
+LEASE_LIST_EXCLUDE = ("invite_token_hash",)
+
+
+@app.get("/leases")
+async def list_leases(
+    unit_id: Optional[UUID] = None,
+    status_filter: Optional[LeaseStatus] = Query(None, alias="status"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    org_id = await get_user_org_id(db, current_user)
+    stmt = select(*_columns(Lease, LEASE_LIST_EXCLUDE)).where(Lease.org_id == org_id)
+    if unit_id:
+        stmt = stmt.where(Lease.unit_id == unit_id)
+    if status_filter:
+        stmt = stmt.where(Lease.status == status_filter.value)
+    return await _list_page(db, Lease, stmt, limit, cursor, exclude=LEASE_LIST_EXCLUDE)
+
+
+INSPECTION_LIST_EXCLUDE = ("merkle_leaves",)
+
+
+@app.get("/inspections")
+async def list_inspections(
+    lease_id: Optional[UUID] = None,
+    status_filter: Optional[InspectionStatus] = Query(None, alias="status"),
+    inspection_type: Optional[InspectionType] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    org_id = await get_user_org_id(db, current_user)
+    stmt = select(*_columns(Inspection, INSPECTION_LIST_EXCLUDE)).where(Inspection.org_id == org_id)
+    if lease_id:
+        stmt = stmt.where(Inspection.lease_id == lease_id)
+    if status_filter:
+        stmt = stmt.where(Inspection.status == status_filter.value)
+    if inspection_type:
+        stmt = stmt.where(Inspection.inspection_type == inspection_type.value)
+    return await _list_page(db, Inspection, stmt, limit, cursor, exclude=INSPECTION_LIST_EXCLUDE)
+
+
+# -----------------------------------------------------------------------------
+# Org data export
+# -----------------------------------------------------------------------------
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_COLUMNS = {
+    "inspection": _columns(Inspection, INSPECTION_LIST_EXCLUDE),
+    "item": _columns(InspectionItem, ("canonical_json",)),
+    "evidence": _columns(InspectionEvidence),
+}
+# One flat CSV for all record types; a cursor row carries its token in `cursor`
+EXPORT_CSV_HEADER = ["record_type"] + list(dict.fromkeys(
+    c.name for columns in EXPORT_COLUMNS.values() for c in columns
+)) + ["cursor"]
+
+
+def _export_record(record_type: str, row) -> dict:
+    record = {"record_type": record_type}
+    for c in EXPORT_COLUMNS[record_type]:
+        record[c.name] = _json_value(getattr(row, c.name))
+    return record
+
+
+async def stream_org_export(org_id: UUID, after: Optional[tuple[datetime, UUID]], fmt: ExportFormat):
+    """
+    Yield the org's inspections, items and evidence, one inspection batch at a time.
+
+    Inspections come from a server-side cursor on one connection; items and
+    evidence for each batch are fetched on a second. After each batch a
+    cursor record marks the last fully exported inspection, so an
+    interrupted export resumes with `?cursor=`. Memory is bounded by the
+    batch size, not the org size.
+    """
+    batch_size = settings.export_batch_size
+    stmt = (
+        select(*EXPORT_COLUMNS["inspection"])
+        .where(Inspection.org_id == org_id)
+        .order_by(Inspection.created_at, Inspection.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if after:
+        stmt = stmt.where(tuple_(Inspection.created_at, Inspection.id) > after)
+
+    def encode(records: list[dict]) -> str:
+        if fmt == ExportFormat.NDJSON:
+            return "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=EXPORT_CSV_HEADER, extrasaction="ignore")
+        for r in records:
+            writer.writerow({k: json.dumps(v) if isinstance(v, (dict, list)) else v for k, v in r.items()})
+        return out.getvalue()
+
+    if fmt == ExportFormat.CSV:
+        out = io.StringIO()
+        csv.writer(out).writerow(EXPORT_CSV_HEADER)
+        yield out.getvalue()
+
+    async with engine.connect() as cursor_conn, engine.connect() as detail_conn:
+        result = await cursor_conn.stream(stmt)
+        async for inspections in result.partitions(batch_size):
+            ids = [row.id for row in inspections]
+            items = await detail_conn.execute(
+                select(*EXPORT_COLUMNS["item"])
+                .where(InspectionItem.inspection_id.in_(ids))
+                .order_by(InspectionItem.inspection_id, InspectionItem.room_key, InspectionItem.item_key, InspectionItem.ordinal)
+            )
+            evidence = await detail_conn.execute(
+                select(*EXPORT_COLUMNS["evidence"])
+                .where(InspectionEvidence.inspection_id.in_(ids))
+                .order_by(InspectionEvidence.inspection_id, InspectionEvidence.created_at, InspectionEvidence.id)
+            )
+            records = [_export_record("inspection", row) for row in inspections]
+            records += [_export_record("item", row) for row in items]
+            records += [_export_record("evidence", row) for row in evidence]
+            last = inspections[-1]
+            records.append({"record_type": "cursor", "cursor": encode_cursor(last.created_at, last.id)})
+            yield encode(records)
+
+
+@app.get("/exports/inspections")
+async def export_org_inspections(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Stream every inspection, item and evidence record in the caller's org."""
+    org_id = await get_user_org_id(db, current_user)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = "application/x-ndjson" if export_format == ExportFormat.NDJSON else "text/csv"
+    filename = f"inspections_{org_id}_{datetime.utcnow():%Y%m%dT%H%M%SZ}.{export_format.value}"
+    return StreamingResponse(
+        stream_org_export(org_id, after, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# -----------------------------------------------------------------------------
+# Integrity sweeps
+# -----------------------------------------------------------------------------
+
+integrity_checker = IntegrityChecker(max_workers=settings.integrity_workers)
+integrity_tasks: dict[UUID, asyncio.Task] = {}
+integrity_lease_task: Optional[asyncio.Task] = None
+
+
+async def _integrity_batch(conn, inspections) -> list[dict]:
+    """Items and evidence for a batch of inspections, as plain dicts for the pool."""
+    ids = [row.id for row in inspections]
+    batch = {
+        row.id: {
+            "id": str(row.id),
+            "content_hash": row.content_hash,
+            "hash_scheme": row.hash_scheme,
+            "merkle_root": row.merkle_root,
+            "items": [],
+            "evidence": [],
+        }
+        for row in inspections
+    }
+    items = await conn.execute(
+        select(
+            InspectionItem.inspection_id,
+            InspectionItem.room_key,
+            InspectionItem.item_key,
+            InspectionItem.ordinal,
+            InspectionItem.position,
+            InspectionItem.canonical_json,
+            InspectionItem.leaf_hash,
+            *(getattr(InspectionItem, name) for name in STORED_ITEM_FIELDS),
+        ).where(InspectionItem.inspection_id.in_(ids))
+    )
+    for row in items:
+        item = dict(row._mapping)
+        batch[item.pop("inspection_id")]["items"].append(item)
+
+    original = aliased(InspectionEvidence)
+    evidence = await conn.execute(
+        select(
+            InspectionEvidence.id,
+            InspectionEvidence.inspection_id,
+            InspectionEvidence.file_hash,
+            InspectionEvidence.verification_status,
+            original.file_hash.label("original_hash"),
+        )
+        .outerjoin(original, InspectionEvidence.dedup_of_id == original.id)
+        .where(InspectionEvidence.inspection_id.in_(ids))
+    )
+    for row in evidence:
+        batch[row.inspection_id]["evidence"].append({
+            "id": str(row.id),
+            "file_hash": row.file_hash,
+            "verification_status": row.verification_status,
+            "original_hash": row.original_hash,
+        })
+    return list(batch.values())
+
+
+async def _save_integrity_progress(sweep_id: UUID, results: list[dict], cursor: str, elapsed: float) -> str:
+    """Record a checked batch; returns the sweep's status, which may have been cancelled."""
+    findings = [f for r in results for f in r["findings"]]
+    async with SessionLocal() as db:
+        sweep = await db.get(IntegritySweep, sweep_id, with_for_update=True)
+        sweep.cursor = cursor
+        sweep.inspections_checked += len(results)
+        sweep.items_checked += sum(r["items"] for r in results)
+        sweep.evidence_checked += sum(r["evidence"] for r in results)
+        sweep.rows_checked += sum(1 + r["items"] + r["evidence"] for r in results)
+        sweep.elapsed_seconds += elapsed
+        sweep.findings_count += len(findings)
+        by_kind = dict(sweep.findings_by_kind or {})
+        for finding in findings:
+            by_kind[finding["kind"]] = by_kind.get(finding["kind"], 0) + 1
+        sweep.findings_by_kind = by_kind
+        room = settings.integrity_report_max_findings - len(sweep.findings or [])
+        if findings and room > 0:
+            sweep.findings = list(sweep.findings or []) + findings[:room]
+        sweep.updated_at = datetime.utcnow()
+        current_status = sweep.status
+        await db.commit()
+    return current_status
+
+
+async def _finish_integrity_sweep(sweep_id: UUID, new_status: IntegritySweepStatus, error: Optional[str] = None) -> None:
+    async with SessionLocal() as db:
+        await db.execute(
+            update(IntegritySweep)
+            .where(IntegritySweep.id == sweep_id, IntegritySweep.status == IntegritySweepStatus.RUNNING.value)
+            .values(status=new_status.value, error=error, finished_at=datetime.utcnow(), updated_at=datetime.utcnow())
+        )
+        await db.commit()
+
+
+async def run_integrity_sweep(sweep_id: UUID) -> None:
+    """
+    Recheck every submitted inspection in the sweep's org, batch by batch.
+
+    Each batch is a keyset query after the saved cursor on a short-lived
+    connection, so no snapshot stays open for the length of a throttled
+    sweep. Batches are checked on the process pool, and progress, findings
+    and the cursor are saved after each one, so an interrupted sweep
+    resumes where it stopped. Batches are paced to
+    INTEGRITY_MAX_ROWS_PER_SECOND to leave the database to live traffic.
+    """
+    async with SessionLocal() as db:
+        sweep = await db.get(IntegritySweep, sweep_id)
+    if sweep is None or sweep.status != IntegritySweepStatus.RUNNING.value:
+        return
+
+    stmt = (
+        select(Inspection.id, Inspection.created_at, Inspection.content_hash, Inspection.hash_scheme, Inspection.merkle_root)
+        .where(Inspection.org_id == sweep.org_id, Inspection.content_hash.is_not(None))
+        .order_by(Inspection.created_at, Inspection.id)
+        .limit(settings.integrity_batch_size)
+    )
+    after = decode_cursor(sweep.cursor) if sweep.cursor else None
+    last_saved = time.monotonic()
+    try:
+        while True:
+            started = time.monotonic()
+            page = stmt if after is None else stmt.where(tuple_(Inspection.created_at, Inspection.id) > after)
+            async with engine.connect() as conn:
+                inspections = (await conn.execute(page)).all()
+                if not inspections:
+                    break
+                batch = await _integrity_batch(conn, inspections)
+            results = await integrity_checker.check(batch)
+
+            after = (inspections[-1].created_at, inspections[-1].id)
+            now = time.monotonic()
+            current_status = await _save_integrity_progress(sweep_id, results, encode_cursor(*after), now - last_saved)
+            last_saved = now
+            if current_status != IntegritySweepStatus.RUNNING.value:
+                return
+
+            # Pace to the row budget, counting the time the batch itself took
+            rows = sum(1 + r["items"] + r["evidence"] for r in results)
+            await asyncio.sleep(max(0.0, rows / settings.integrity_max_rows_per_second - (time.monotonic() - started)))
+    except asyncio.CancelledError:
+        # Shutdown: leave the sweep running so the next startup resumes it
+        raise
+    except Exception as e:
+        await _finish_integrity_sweep(sweep_id, IntegritySweepStatus.FAILED, error=str(e))
+        return
+    await _finish_integrity_sweep(sweep_id, IntegritySweepStatus.COMPLETED)
+
+
+def start_integrity_sweep_task(sweep_id: UUID) -> None:
+    task = asyncio.create_task(run_integrity_sweep(sweep_id))
+    integrity_tasks[sweep_id] = task
+    task.add_done_callback(lambda _: integrity_tasks.pop(sweep_id, None))
+
+
+async def resume_integrity_sweeps() -> None:
+    """
+    Restart sweeps whose runner went away, e.g. with a previous process.
+
+    `updated_at` is the runner's lease. A sweep is claimed by bumping it
+    only if it is still stale, so when several workers look at once each
+    sweep resumes in one.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.integrity_resume_after_seconds)
+    async with SessionLocal() as db:
+        claimed = await db.execute(
+            update(IntegritySweep)
+            .where(IntegritySweep.status == IntegritySweepStatus.RUNNING.value, IntegritySweep.updated_at < stale_before)
+            .values(updated_at=datetime.utcnow())
+            .returning(IntegritySweep.id)
+        )
+        sweep_ids = list(claimed.scalars())
+        await db.commit()
+    for sweep_id in sweep_ids:
+        start_integrity_sweep_task(sweep_id)
+
+
+async def renew_integrity_leases() -> None:
+    """Bump `updated_at` on the sweeps this process is running."""
+    if not integrity_tasks:
+        return
+    async with SessionLocal() as db:
+        await db.execute(
+            update(IntegritySweep)
+            .where(IntegritySweep.id.in_(list(integrity_tasks)), IntegritySweep.status == IntegritySweepStatus.RUNNING.value)
+            .values(updated_at=datetime.utcnow())
+        )
+        await db.commit()
+
+
+async def run_integrity_leases() -> None:
+    """
+    Keep this process's sweep leases fresh and take over expired ones.
+
+    Runs for the life of the process, so a sweep left behind by a worker
+    that stopped resumes within INTEGRITY_RESUME_AFTER_SECONDS rather than
+    waiting for the next restart.
+    """
+    while True:
+        await asyncio.sleep(settings.integrity_heartbeat_seconds)
+        try:
+            await renew_integrity_leases()
+            await resume_integrity_sweeps()
+        except Exception as e:
+            print(f"[IntegritySweeps] Lease check failed: {e}")
+
+
+def _integrity_sweep_json(sweep: IntegritySweep) -> dict:
+    data = {c.name: _json_value(getattr(sweep, c.name)) for c in IntegritySweep.__table__.columns}
+    data["rows_per_second"] = round(sweep.rows_checked / sweep.elapsed_seconds, 1) if sweep.elapsed_seconds else None
+    return data
+
+
+async def require_integrity_sweep(db: AsyncSession, sweep_id: UUID, current_user: AuthenticatedUser) -> IntegritySweep:
+    org_id = await get_user_org_id(db, current_user)
+    sweep = await db.get(IntegritySweep, sweep_id)
+    if sweep is None or sweep.org_id != org_id:
+        raise HTTPException(status_code=404, detail="Integrity sweep not found")
+    return sweep
+
+
+@app.post("/integrity/sweeps", status_code=status.HTTP_202_ACCEPTED)
+async def start_integrity_sweep(
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Start a background recheck of every submitted inspection in the caller's org."""
+    org_id = await get_user_org_id(db, current_user)
+    running = await db.scalar(
+        select(IntegritySweep.id).where(
+            IntegritySweep.org_id == org_id, IntegritySweep.status == IntegritySweepStatus.RUNNING.value
+        )
+    )
+    if running is not None:
+        # If its runner is gone, take it over here so it doesn't block the org
+        await resume_integrity_sweeps()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Integrity sweep {running} is already running")
+
+    sweep = IntegritySweep(
+        org_id=org_id,
+        status=IntegritySweepStatus.RUNNING.value,
+        findings_by_kind={},
+        findings=[],
+        started_by=current_user.uid,
+    )
+    db.add(sweep)
+    await db.commit()
+    await db.refresh(sweep)
+    start_integrity_sweep_task(sweep.id)
+    return _integrity_sweep_json(sweep)
+
+
+@app.get("/integrity/sweeps/{sweep_id}")
+async def get_integrity_sweep(
+    sweep_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Progress and report of an integrity sweep."""
+    return _integrity_sweep_json(await require_integrity_sweep(db, sweep_id, current_user))
+
+
+@app.post("/integrity/sweeps/{sweep_id}/cancel")
+async def cancel_integrity_sweep(
+    sweep_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    sweep = await require_integrity_sweep(db, sweep_id, current_user)
+    if sweep.status != IntegritySweepStatus.RUNNING.value:
+        raise HTTPException(status_code=400, detail=f"Integrity sweep is {sweep.status}")
+    sweep.status = IntegritySweepStatus.CANCELLED.value
+    sweep.finished_at = datetime.utcnow()
+    sweep.updated_at = sweep.finished_at
+    await db.commit()
+    # A runner in another process stops at its next batch
+    task = integrity_tasks.get(sweep_id)
+    if task is not None:
+        task.cancel()
+    return _integrity_sweep_json(sweep)
+
+
 @app.post("/inspections/{inspection_id}/evidence/presign", response_model=PresignResponse)
 async def presign_evidence(
     inspection_id: UUID,
@@ -465,12 +1570,28 @@ async def presign_evidence(
     db: AsyncSession = Depends(get_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    org_id = await require_org_access_for_inspection(db, inspection_id, current_user)
-    await require_inspection_item(db, inspection_id, payload.item_id)
-
-    inspection = await db.get(Inspection, inspection_id)
+    org_id, inspection = await require_inspection_access(db, inspection_id, current_user)
     if inspection.status != InspectionStatus.DRAFT.value:
         raise HTTPException(status_code=400, detail="Inspection not in draft state")
+    await require_inspection_item(db, inspection_id, payload.item_id)
+
+    if payload.content_hash:
+        content_hash = payload.content_hash.lower()
+        original = (await find_stored_evidence(db, org_id, {content_hash})).get(content_hash)
+        if original is not None and original.file_size != payload.file_size_bytes:
+            original = None
+        dedup_stats.record(original is not None, payload.file_size_bytes)
+        if original is not None:
+            created_by = UUID(current_user.uid) if len(current_user.uid) == 36 else uuid4()
+            row = dedup_evidence_row(original, inspection_id, payload.item_id, payload.mime_type, created_by)
+            await db.execute(insert(InspectionEvidence), [row])
+            await db.commit()
+            return PresignResponse(
+                object_path=row["object_path"],
+                already_stored=True,
+                evidence_id=row["id"],
+                dedup_of_id=row["dedup_of_id"],
+            )
 
     object_path = generate_object_path(org_id=org_id, inspection_id=inspection_id, item_id=payload.item_id, file_name=payload.file_name)
     upload_url, expires_at = await presign_upload(object_path, payload.mime_type, settings.presign_ttl_seconds)
@@ -484,44 +1605,23 @@ async def confirm_evidence(
     db: AsyncSession = Depends(get_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    org_id = await require_org_access_for_inspection(db, inspection_id, current_user)
-    await require_inspection_item(db, inspection_id, payload.item_id)
-
-    inspection = await db.get(Inspection, inspection_id)
+    org_id, inspection = await require_inspection_access(db, inspection_id, current_user)
     if inspection.status != InspectionStatus.DRAFT.value:
         raise HTTPException(status_code=400, detail="Inspection not in draft state")
+    await require_inspection_item(db, inspection_id, payload.item_id)
 
     expected_prefix = f"orgs/{org_id}/inspections/{inspection_id}/items/{payload.item_id}/"
     if not payload.object_path.startswith(expected_prefix):
         raise HTTPException(status_code=400, detail="Invalid object path")
+    existing = await db.execute(
+        select(InspectionEvidence.id).where(InspectionEvidence.object_path == payload.object_path).limit(1)
+    )
+    if existing.scalar() is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Evidence already confirmed")
 
     # HEAD check to verify object exists and size matches
-    head_ok = False
-    head_size = None
-    if settings.storage_provider == StorageProvider.GCS:
-        from google.cloud import storage as gcs_storage
-        client = gcs_storage.Client(project=settings.gcs_project_id)
-        bucket = client.bucket(settings.gcs_bucket_name)
-        blob = bucket.blob(payload.object_path)
-        if blob.exists():
-            blob.reload()
-            head_ok = True
-            head_size = blob.size
-    else:
-        import boto3
-        s3 = boto3.client(
-            "s3",
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-        )
-        try:
-            resp = s3.head_object(Bucket=settings.s3_bucket_name, Key=payload.object_path)
-            head_ok = True
-            head_size = resp.get("ContentLength")
-        except Exception:
-            head_ok = False
-
+    head_size = await get_storage().head(payload.object_path)
+    head_ok = head_size is not None
     if not head_ok:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File not found in storage")
     if head_size is not None and head_size != payload.file_size_bytes:
@@ -536,13 +1636,343 @@ async def confirm_evidence(
         file_size=payload.file_size_bytes,
         file_hash=payload.file_hash,
         is_confirmed=True,
+        verification_claimed_at=datetime.utcnow(),  # queued by this worker below
         created_by=UUID(current_user.uid) if len(current_user.uid) == 36 else uuid4(),
     )
     db.add(ev)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent confirm of the same object won the race
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Evidence already confirmed")
+    evidence_verifier.submit(VerificationJob(evidence_id=ev.id, object_path=ev.object_path, expected_hash=ev.file_hash))
     return {"status": "confirmed", "object_path": payload.object_path, "file_size": head_size}
 
 
+@app.post("/inspections/{inspection_id}/evidence/presign-batch", response_model=BatchPresignResponse)
+async def presign_evidence_batch(
+    inspection_id: UUID,
+    payload: BatchPresignRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    require_batch_size(len(payload.files))
+    org_id, inspection = await require_inspection_access(db, inspection_id, current_user)
+    if inspection.status != InspectionStatus.DRAFT.value:
+        raise HTTPException(status_code=400, detail="Inspection not in draft state")
+    valid_items = await inspection_item_ids(db, inspection_id, {f.item_id for f in payload.files})
+    stored = await find_stored_evidence(
+        db, org_id, {f.content_hash.lower() for f in payload.files if f.content_hash and f.item_id in valid_items}
+    )
+
+    created_by = UUID(current_user.uid) if len(current_user.uid) == 36 else uuid4()
+    results: list[BatchPresignResult] = []
+    to_sign: list[tuple[int, str, str]] = []
+    dedup_rows = []
+    for index, f in enumerate(payload.files):
+        result = BatchPresignResult(index=index, item_id=f.item_id, file_name=f.file_name, status="error")
+        results.append(result)
+        if f.item_id not in valid_items:
+            result.error = "Item does not belong to inspection"
+            continue
+        if f.content_hash:
+            original = stored.get(f.content_hash.lower())
+            if original is not None and original.file_size != f.file_size_bytes:
+                original = None
+            dedup_stats.record(original is not None, f.file_size_bytes)
+            if original is not None:
+                row = dedup_evidence_row(original, inspection_id, f.item_id, f.mime_type, created_by)
+                dedup_rows.append(row)
+                result.status = "already_stored"
+                result.object_path = row["object_path"]
+                result.evidence_id = row["id"]
+                result.dedup_of_id = row["dedup_of_id"]
+                continue
+        result.object_path = generate_object_path(org_id=org_id, inspection_id=inspection_id, item_id=f.item_id, file_name=f.file_name)
+        to_sign.append((index, result.object_path, f.mime_type))
+
+    if dedup_rows:
+        await db.execute(insert(InspectionEvidence), dedup_rows)
+        await db.commit()
+
+    ttl_seconds = settings.presign_ttl_seconds
+    expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+    urls = await get_storage().presign_put_many([(path, mime) for _, path, mime in to_sign], ttl_seconds)
+    for (index, _, _), url in zip(to_sign, urls):
+        results[index].upload_url = url
+        results[index].status = "ok"
+
+    return BatchPresignResponse(
+        expires_at=expires_at,
+        signed=len(to_sign),
+        already_stored=len(dedup_rows),
+        failed=len(results) - len(to_sign) - len(dedup_rows),
+        results=results,
+    )
+
+
+@app.post("/inspections/{inspection_id}/evidence/confirm-batch", response_model=BatchConfirmResponse)
+async def confirm_evidence_batch(
+    inspection_id: UUID,
+    payload: BatchConfirmRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    require_batch_size(len(payload.files))
+    org_id, inspection = await require_inspection_access(db, inspection_id, current_user)
+    if inspection.status != InspectionStatus.DRAFT.value:
+        raise HTTPException(status_code=400, detail="Inspection not in draft state")
+    valid_items = await inspection_item_ids(db, inspection_id, {f.item_id for f in payload.files})
+    existing = await db.execute(
+        select(InspectionEvidence.object_path).where(
+            InspectionEvidence.object_path.in_({f.object_path for f in payload.files})
+        )
+    )
+    seen_paths = set(existing.scalars())
+
+    results: list[BatchConfirmResult] = []
+    to_check: list[int] = []
+    for index, f in enumerate(payload.files):
+        result = BatchConfirmResult(index=index, item_id=f.item_id, object_path=f.object_path, status="error")
+        expected_prefix = f"orgs/{org_id}/inspections/{inspection_id}/items/{f.item_id}/"
+        if f.item_id not in valid_items:
+            result.error = "Item does not belong to inspection"
+        elif not f.object_path.startswith(expected_prefix):
+            result.error = "Invalid object path"
+        elif f.object_path in seen_paths:
+            result.error = "Evidence already confirmed"
+        else:
+            seen_paths.add(f.object_path)
+            to_check.append(index)
+        results.append(result)
+
+    # HEAD checks run concurrently, bounded so a large batch can't flood storage
+    heads = await get_storage().head_many(
+        [payload.files[i].object_path for i in to_check],
+        concurrency=settings.evidence_head_concurrency,
+    )
+
+    created_by = UUID(current_user.uid) if len(current_user.uid) == 36 else uuid4()
+    rows = []
+    for index, head_size in zip(to_check, heads):
+        f = payload.files[index]
+        result = results[index]
+        if isinstance(head_size, Exception):
+            result.error = "Storage check failed"
+            continue
+        if head_size is None:
+            result.error = "File not found in storage"
+            continue
+        if head_size != f.file_size_bytes:
+            result.error = "File size mismatch"
+            continue
+        rows.append({
+            "id": uuid4(),
+            "inspection_id": inspection_id,
+            "item_id": f.item_id,
+            "storage_provider": settings.storage_provider.value,
+            "object_path": f.object_path,
+            "mime_type": f.mime_type,
+            "file_size": f.file_size_bytes,
+            "file_hash": f.file_hash,
+            "is_confirmed": True,
+            "verification_status": VerificationStatus.PENDING.value,
+            "verification_claimed_at": datetime.utcnow(),  # queued by this worker below
+            "created_by": created_by,
+        })
+        result.status = "confirmed"
+        result.file_size = head_size
+
+    if rows:
+        try:
+            await db.execute(insert(InspectionEvidence), rows)
+            await db.commit()
+        except IntegrityError:
+            # A concurrent confirm claimed one of these objects; nothing was inserted
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Evidence already confirmed")
+        for row in rows:
+            evidence_verifier.submit(VerificationJob(evidence_id=row["id"], object_path=row["object_path"], expected_hash=row["file_hash"]))
+
+    return BatchConfirmResponse(confirmed=len(rows), failed=len(results) - len(rows), results=results)
+
+
+# Local objects are served from Core's own origin with the uploader's MIME type;
+# never let a browser render one (e.g. an uploaded text/html) as a page there
+LOCAL_DOWNLOAD_HEADERS = {"X-Content-Type-Options": "nosniff", "Content-Disposition": "attachment"}
+
+
+@app.put(LocalStorage.UPLOAD_ROUTE + "/{token}")
+async def local_storage_upload(token: str, request: Request):
+    """Upload target for presigned URLs issued by the local-disk provider."""
+    store = get_storage()
+    if not isinstance(store, LocalStorage):
+        raise HTTPException(status_code=404, detail="Not found")
+    try:
+        object_path, mime_type = store.verify_upload_token(token)
+    except InvalidUploadToken as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    # Signed cloud URLs are bound to the Content-Type; so is the token
+    if request.headers.get("content-type", "").split(";")[0].strip() != mime_type:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Content-Type does not match upload token")
+    try:
+        size = await store.write_stream(object_path, mime_type, request.stream(), settings.max_upload_size_mb * 1024 * 1024)
+    except ObjectTooLarge:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+    return {"object_path": object_path, "size": size}
+
+
+@app.get(LocalStorage.DOWNLOAD_ROUTE + "/{token}")
+async def local_storage_download(token: str):
+    """Download target for presigned URLs issued by the local-disk provider."""
+    store = get_storage()
+    if not isinstance(store, LocalStorage):
+        raise HTTPException(status_code=404, detail="Not found")
+    try:
+        object_path = store.verify_download_token(token)
+    except InvalidUploadToken as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    mime_type = await store.mime_type(object_path)
+    if mime_type is None or await store.head(object_path) is None:
+        raise HTTPException(status_code=404, detail="File not found in storage")
+    return FileResponse(store.path_for(object_path), media_type=mime_type, headers=LOCAL_DOWNLOAD_HEADERS)
+
+
+@app.get("/inspections/{inspection_id}/evidence/{evidence_id}/content")
+async def evidence_content(
+    inspection_id: UUID,
+    evidence_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    await require_inspection_access(db, inspection_id, current_user)
+    ev = (await db.execute(
+        select(InspectionEvidence).where(
+            InspectionEvidence.id == evidence_id,
+            InspectionEvidence.inspection_id == inspection_id,
+        )
+    )).scalar_one_or_none()
+    if ev is None:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+
+    store = get_storage()
+    if ev.storage_provider != store.provider.value:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Evidence is held by a different storage provider")
+    if isinstance(store, LocalStorage):
+        path = store.path_for(ev.object_path)
+        if await store.head(ev.object_path) is None:
+            raise HTTPException(status_code=404, detail="File not found in storage")
+        # Served from the path, so the server can sendfile() it
+        return FileResponse(path, media_type=ev.mime_type, headers=LOCAL_DOWNLOAD_HEADERS)
+    url = await store.presign_get(ev.object_path, settings.presign_ttl_seconds)
+    return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+
+def prepare_submitted_items(inspection_id: UUID, items: list[dict], offset: int = 0) -> list[dict]:
+    """
+    Validate a slice of submitted items and build their stored rows.
+
+    Each item is canonicalized once; that string is stored and feeds its
+    Merkle leaf and the v1 content hash. `offset` is the slice's position
+    in the submitted list.
+    """
+    rows: list[dict] = []
+    for position, item in enumerate(items, start=offset):
+        if not isinstance(item, dict):
+            raise InvalidItemKey("Each item must be an object")
+        key = item_key(item)
+        fields = stored_item_fields(item)
+        canonical = canonicalize(item)
+        digest = leaf_hash_canonical(canonical)
+        rows.append({
+            "id": uuid4(),
+            "inspection_id": inspection_id,
+            "room_key": key[0],
+            "item_key": key[1],
+            "ordinal": key[2],
+            **fields,
+            "canonical_json": canonical,
+            "position": position,
+            "leaf_hash": digest.hex(),
+        })
+    return rows
+
+
+async def prepare_submission(inspection_id: UUID, items: list[dict]) -> tuple[list[dict], str, MerkleTree]:
+    """
+    Rows, v1 content hash and Merkle tree for a submission.
+
+    Canonicalizing and hashing thousands of items is CPU work, so it runs
+    in a thread, in batches sized to the remaining budget: a thread can't
+    be cancelled, so the deadline is enforced before each batch starts.
+    """
+    rows: list[dict] = []
+    leaves: dict[tuple[str, str, int], bytes] = {}
+    for start, end in deadline.batches(len(items), settings.submit_hash_batch_size, "item hashing"):
+        batch = await asyncio.to_thread(prepare_submitted_items, inspection_id, items[start:end], start)
+        for row in batch:
+            key = (row["room_key"], row["item_key"], row["ordinal"])
+            if key in leaves:
+                raise DuplicateItemKey(f"Duplicate item {key[0]}/{key[1]}/{key[2]}")
+            leaves[key] = bytes.fromhex(row["leaf_hash"])
+        rows += batch
+    tree = MerkleTree(leaves)
+    deadline.check("Merkle root")
+    await asyncio.to_thread(tree.root)  # Computes (and memoizes) interior hashes off the loop
+    return rows, content_hash_from_canonical([row["canonical_json"] for row in rows]), tree
+
+
+class StaleItemsWithEvidence(Exception):
+    """Raised when items left out of a submission still have evidence attached."""
+
+
+async def delete_unsubmitted_items(db: AsyncSession, inspection_id: UUID, rows: list[dict]) -> None:
+    """
+    Delete the inspection's stored items that the submission left out.
+
+    Otherwise they would linger without canonical JSON, show up in the
+    inspection and fail integrity checks. Items with evidence are never
+    dropped silently; StaleItemsWithEvidence names them instead.
+    """
+    submitted = {(row["room_key"], row["item_key"], row["ordinal"]) for row in rows}
+    stored = await db.execute(
+        select(InspectionItem.id, InspectionItem.room_key, InspectionItem.item_key, InspectionItem.ordinal)
+        .where(InspectionItem.inspection_id == inspection_id)
+    )
+    stale = {row.id: f"{row.room_key}/{row.item_key}/{row.ordinal}" for row in stored if tuple(row[1:]) not in submitted}
+    if not stale:
+        return
+    with_evidence = await db.execute(
+        select(InspectionEvidence.item_id).where(InspectionEvidence.item_id.in_(stale)).distinct()
+    )
+    labels = sorted(stale[item_id] for item_id in with_evidence.scalars())
+    if labels:
+        raise StaleItemsWithEvidence(labels)
+    await db.execute(delete(InspectionItem).where(InspectionItem.id.in_(stale)))
+
+
+async def upsert_inspection_items(db: AsyncSession, rows: list[dict]) -> None:
+    """
+    Insert or update items by (inspection, room, item, ordinal).
+
+    Each batch is one executemany round trip on asyncpg. Existing items
+    keep their IDs, so evidence attached to them stays linked.
+    """
+    stmt = pg_insert(InspectionItem)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_inspection_items_key",
+        set_={
+            column: stmt.excluded[column]
+            for column in (
+                "notes", "condition_rating", "is_damaged", "damage_description", "canonical_json", "position", "leaf_hash",
+            )
+        },
+    )
+    for start, end in deadline.batches(len(rows), settings.submit_upsert_batch_size, "item upsert"):
+        await db.execute(stmt, rows[start:end])
+
+
 @app.post("/inspections/{inspection_id}/submit")
 async def submit_inspection(
     inspection_id: UUID,
@@ -550,55 +1980,265 @@ async def submit_inspection(
     db: AsyncSession = Depends(get_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    await require_org_access_for_inspection(db, inspection_id, current_user)
-
-    inspection = await db.get(Inspection, inspection_id)
+    _, inspection = await require_inspection_access(db, inspection_id, current_user)
     if inspection.status != InspectionStatus.DRAFT.value:
         raise HTTPException(status_code=400, detail="Inspection not in draft state")
 
-    content_hash = compute_content_hash(payload.items)
+    if len(payload.items) > settings.submit_max_items:
+        raise HTTPException(status_code=400, detail=f"At most {settings.submit_max_items} items per inspection")
+
+    # Bounded so thousands of items can't hold the request (and its locks) open
+    with deadline.deadline_scope(settings.submit_budget_seconds):
+        try:
+            rows, v1_hash, tree = await prepare_submission(inspection_id, payload.items)
+        except (InvalidItemKey, DuplicateItemKey) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid item: {e.errors()[0]['msg']}")
+
+        # Same transaction as the upsert: the stored items become exactly the submitted ones
+        try:
+            await delete_unsubmitted_items(db, inspection_id, rows)
+        except StaleItemsWithEvidence as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Items with evidence are missing from the submission: {', '.join(e.args[0])}",
+            )
+        await upsert_inspection_items(db, rows)
+
+    merkle_root = tree.root()
+    content_hash = merkle_root if payload.hash_scheme == HashScheme.V2 else v1_hash
+
     inspection.content_hash = content_hash
+    inspection.hash_scheme = payload.hash_scheme.value
+    inspection.merkle_root = merkle_root
+    inspection.merkle_leaves = tree.to_json()
     inspection.status = InspectionStatus.SUBMITTED.value
     inspection.submitted_at = datetime.utcnow()
     await db.commit()
-    return {"status": "submitted", "content_hash": content_hash}
+    return {
+        "status": "submitted",
+        "content_hash": content_hash,
+        "hash_scheme": payload.hash_scheme.value,
+        "merkle_root": merkle_root,
+    }
 
 
-@app.get("/inspections/{inspection_id}/certificate.pdf")
-async def inspection_certificate(inspection_id: UUID, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(get_current_user)):
-    await require_org_access_for_inspection(db, inspection_id, current_user)
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _uuid(value: Optional[UUID]) -> Optional[str]:
+    return str(value) if value is not None else None
 
-    inspection = await db.get(Inspection, inspection_id)
+
+@app.get("/inspections/{inspection_id}")
+async def get_inspection_tree(
+    inspection_id: UUID,
+    evidence_limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    evidence_cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    An inspection with its items and a keyset page of its evidence.
+
+    Three queries regardless of size: the authorized inspection, all
+    items, and one evidence page. Items and evidence are read as plain
+    column rows and serialized directly, without ORM identity-map or
+    response-model overhead per row. Follow `evidence_next_cursor` for
+    further evidence pages.
+    """
+    _, inspection = await require_inspection_access(db, inspection_id, current_user)
+
+    item_rows = (await db.execute(
+        select(
+            InspectionItem.id,
+            InspectionItem.room_key,
+            InspectionItem.item_key,
+            InspectionItem.ordinal,
+            InspectionItem.notes,
+            InspectionItem.condition_rating,
+            InspectionItem.is_damaged,
+            InspectionItem.damage_description,
+        )
+        .where(InspectionItem.inspection_id == inspection_id)
+        .order_by(InspectionItem.room_key, InspectionItem.item_key, InspectionItem.ordinal)
+    )).all()
+
+    evidence_stmt = (
+        select(
+            InspectionEvidence.id,
+            InspectionEvidence.item_id,
+            InspectionEvidence.object_path,
+            InspectionEvidence.mime_type,
+            InspectionEvidence.file_size,
+            InspectionEvidence.file_hash,
+            InspectionEvidence.is_confirmed,
+            InspectionEvidence.verification_status,
+            InspectionEvidence.verified_at,
+            InspectionEvidence.dedup_of_id,
+            InspectionEvidence.created_at,
+        )
+        .where(InspectionEvidence.inspection_id == inspection_id)
+        .order_by(InspectionEvidence.created_at, InspectionEvidence.id)
+        .limit(evidence_limit + 1)
+    )
+    if evidence_cursor:
+        try:
+            after = decode_cursor(evidence_cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        evidence_stmt = evidence_stmt.where(tuple_(InspectionEvidence.created_at, InspectionEvidence.id) > after)
+    evidence_rows = list((await db.execute(evidence_stmt)).all())
+    cursor = next_cursor(evidence_rows, evidence_limit)
+
+    evidence_by_item: dict[UUID, list[dict]] = {}
+    for ev in evidence_rows:
+        evidence_by_item.setdefault(ev.item_id, []).append({
+            "id": str(ev.id),
+            "object_path": ev.object_path,
+            "mime_type": ev.mime_type,
+            "file_size": ev.file_size,
+            "file_hash": ev.file_hash,
+            "is_confirmed": ev.is_confirmed,
+            "verification_status": ev.verification_status,
+            "verified_at": _iso(ev.verified_at),
+            "dedup_of_id": _uuid(ev.dedup_of_id),
+            "created_at": _iso(ev.created_at),
+        })
+
+    return JSONResponse({
+        "id": str(inspection.id),
+        "lease_id": str(inspection.lease_id),
+        "inspection_type": inspection.inspection_type,
+        "status": inspection.status,
+        "content_hash": inspection.content_hash,
+        "hash_scheme": inspection.hash_scheme,
+        "merkle_root": inspection.merkle_root,
+        "submitted_at": _iso(inspection.submitted_at),
+        "signed_at": _iso(inspection.signed_at),
+        "created_at": _iso(inspection.created_at),
+        "items": [
+            {
+                "id": str(item.id),
+                "room_key": item.room_key,
+                "item_key": item.item_key,
+                "ordinal": item.ordinal,
+                "notes": item.notes,
+                "condition_rating": item.condition_rating,
+                "is_damaged": item.is_damaged,
+                "damage_description": item.damage_description,
+                "evidence": evidence_by_item.get(item.id, []),
+            }
+            for item in item_rows
+        ],
+        "evidence_next_cursor": cursor,
+    })
+
+
+@app.get("/inspections/{inspection_id}/items/proof", response_model=ItemProofResponse)
+async def inspection_item_proof(
+    inspection_id: UUID,
+    room_key: str,
+    item_key: str,
+    ordinal: int = 0,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Inclusion proof for one item against the inspection's Merkle root."""
+    _, inspection = await require_inspection_access(db, inspection_id, current_user)
+    if not inspection.merkle_root:
+        raise HTTPException(status_code=400, detail="Inspection has no Merkle root")
+    tree = MerkleTree.from_json(inspection.merkle_leaves)
+    key = (room_key, item_key, ordinal)
+    if key not in tree:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return ItemProofResponse(
+        inspection_id=inspection_id,
+        hash_scheme=inspection.hash_scheme,
+        content_hash=inspection.content_hash,
+        merkle_root=inspection.merkle_root,
+        room_key=room_key,
+        item_key=item_key,
+        ordinal=ordinal,
+        leaf_index=tree.index_of(key),
+        tree_size=len(tree),
+        leaf_hash=tree.leaf(key).hex(),
+        audit_path=tree.proof(key),
+    )
+
+
+@app.get("/inspections/{inspection_id}/certificate.pdf")
+async def inspection_certificate(
+    inspection_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    _, inspection = await require_inspection_access(db, inspection_id, current_user)
     if inspection.status == InspectionStatus.DRAFT.value:
         raise HTTPException(status_code=400, detail="Inspection not submitted")
     if not inspection.content_hash:
         raise HTTPException(status_code=400, detail="Missing content hash")
 
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(72, 720, "PROVENIQ Core - Inspection Certificate")
-    c.setFont("Helvetica", 11)
-    lines = [
-        f"Inspection ID: {inspection_id}",
-        f"Lease ID: {inspection.lease_id}",
-        f"Content Hash (SHA-256): {inspection.content_hash}",
-        f"Status: {inspection.status}",
-        f"Submitted At: {inspection.submitted_at}",
-        f"Signed At: {inspection.signed_at}",
-        f"Generated At: {datetime.utcnow().isoformat()}",
-    ]
-    y = 690
-    for line in lines:
-        c.drawString(72, y, line)
-        y -= 18
-    c.showPage()
-    c.save()
-    buffer.seek(0)
+    fields = certificate_fields(inspection)
+    etag = certificate_etag(fields)
     headers = {
-        "Content-Disposition": f'inline; filename="inspection_{inspection_id}_certificate.pdf"'
+        "Content-Disposition": f'inline; filename="inspection_{inspection_id}_certificate.pdf"',
+        "ETag": f'"{etag}"',
+        "Cache-Control": "private, no-cache",
     }
-    return StreamingResponse(buffer, media_type="application/pdf", headers=headers)
+    # The ETag is derived from the fields, so a revalidation never renders
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path, _, hit = await certificate_renderer.get(fields)
+    headers["X-Certificate-Cache"] = "HIT" if hit else "MISS"
+    return FileResponse(path, media_type="application/pdf", headers=headers)
+
+
+@app.post("/certificates/export")
+async def export_certificates(
+    payload: CertificateExportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Stream a ZIP of the org's certificates for the given inspections or submission window."""
+    if not payload.inspection_ids and not (payload.submitted_from or payload.submitted_to):
+        raise HTTPException(status_code=400, detail="Provide inspection_ids or a submitted_from/submitted_to range")
+    org_id = await get_user_org_id(db, current_user)
+
+    stmt = (
+        select(Inspection)
+        .where(
+            Inspection.org_id == org_id,
+            Inspection.status != InspectionStatus.DRAFT.value,
+            Inspection.content_hash.is_not(None),
+        )
+        .order_by(Inspection.submitted_at, Inspection.id)
+        .limit(settings.certificate_export_max + 1)
+    )
+    if payload.inspection_ids:
+        stmt = stmt.where(Inspection.id.in_(payload.inspection_ids))
+    if payload.submitted_from:
+        stmt = stmt.where(Inspection.submitted_at >= payload.submitted_from)
+    if payload.submitted_to:
+        stmt = stmt.where(Inspection.submitted_at < payload.submitted_to)
+    inspections = (await db.execute(stmt)).scalars().all()
+    if len(inspections) > settings.certificate_export_max:
+        raise HTTPException(status_code=400, detail=f"At most {settings.certificate_export_max} certificates per export")
+    if not inspections:
+        raise HTTPException(status_code=404, detail="No submitted inspections match")
+
+    # Only plain field dicts cross into the stream; the session is closed by then
+    certificates = [certificate_fields(inspection) for inspection in inspections]
+    filename = f"certificates_{datetime.utcnow():%Y%m%dT%H%M%SZ}.zip"
+    return StreamingResponse(
+        stream_certificate_archive(certificate_renderer, certificates, window=settings.certificate_render_workers * 4),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # -----------------------------------------------------------------------------
@@ -614,6 +2254,39 @@ app.include_router(fraud_router)
 app.include_router(assets_router)
 app.include_router(gateway_router)
 
+# Cached Protect quotes are priced off the asset valuation
+from app.routers.assets import asset_registry
+from app.routers.gateway import quote_cache
+
+asset_registry.attach(SessionLocal)
+asset_registry.add_valuation_listener(quote_cache.invalidate_asset)
+
+
+@app.on_event("startup")
+async def start_health_prober():
+    # Keep replica health current for gateway load balancing
+    from app.routers.gateway import health_prober
+    health_prober.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    from app.routers.gateway import close_http_client, health_prober
+    await health_prober.close()
+    await close_http_client()
+    await token_verifier.close()
+    await evidence_verifier.close()
+    certificate_renderer.close()
+    if verification_requeue_task is not None:
+        verification_requeue_task.cancel()
+    if integrity_lease_task is not None:
+        integrity_lease_task.cancel()
+    for task in list(integrity_tasks.values()):
+        task.cancel()
+    integrity_checker.close()
+    if storage is not None:
+        await storage.close()
+
 
 @app.get("/")
 async def root():
@@ -1,23 +1,39 @@
 """PROVENIQ Core - Asset Registry API Routes"""
 
+import os
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel
 
 from app.services.asset_registry import (
+    AnchorAlreadyBound,
     AssetRegistry,
     AssetRegistration,
+    NotAssetOwner,
     RegisteredAsset,
+    RegistrationConflict,
 )
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, decode_cursor, next_cursor
 from app.services.ledger import LedgerClient
+from app.admission import require_admission
 from app.auth import AuthenticatedUser, get_current_user
+from app.services.deadline import DeadlineExceeded
 
-router = APIRouter(prefix="/v1/assets", tags=["assets"])
+router = APIRouter(
+    prefix="/v1/assets",
+    tags=["assets"],
+    dependencies=[Depends(require_admission("assets"))],
+)
 
 # Service instances
 ledger_client = LedgerClient()
-asset_registry = AssetRegistry(ledger_client=ledger_client)
+# Attached to the app's database in app.main
+asset_registry = AssetRegistry(
+    ledger_client=ledger_client,
+    cache_size=int(os.getenv("ASSET_CACHE_SIZE", "10000")),
+    cache_ttl_seconds=float(os.getenv("ASSET_CACHE_TTL_SECONDS", "30")),
+)
 
 
 class BindAnchorRequest(BaseModel):
@@ -34,6 +50,19 @@ class UpdateValuationRequest(BaseModel):
     valuation_id: UUID
 
 
+async def require_asset_for_write(paid: UUID, current_user: AuthenticatedUser) -> RegisteredAsset:
+    """Load the asset uncached and check the caller owns it (or it is unowned)."""
+    asset = await asset_registry.get(paid, use_cache=False)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    if asset.owner_id and asset.owner_id != current_user.uid:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return asset
+
+
+OWNER_CHANGED = "Asset owner changed; retry"
+
+
 @router.post("", response_model=RegisteredAsset, status_code=201)
 async def register_asset(
     registration: AssetRegistration,
@@ -52,10 +81,30 @@ async def register_asset(
                 registration.owner_id = current_user.uid
         result = await asset_registry.register(registration)
         return result
+    except AnchorAlreadyBound:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Anchor is bound to another asset")
+    except RegistrationConflict:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Asset registration conflicted; retry")
+    except (HTTPException, DeadlineExceeded):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/by-anchor/{anchor_id}", response_model=RegisteredAsset)
+async def get_asset_by_anchor(
+    anchor_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Get the asset an anchor is bound to."""
+    asset = await asset_registry.get_by_anchor(anchor_id)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    if asset.owner_id and asset.owner_id != current_user.uid:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return asset
+
+
 @router.get("/{paid}", response_model=RegisteredAsset)
 async def get_asset(
     paid: UUID,
@@ -72,13 +121,19 @@ async def get_asset(
 
 @router.get("", response_model=list[RegisteredAsset])
 async def list_assets(
+    response: Response,
     owner_id: Optional[str] = Query(None, description="Filter by owner ID"),
     source_app: Optional[str] = Query(None, description="Filter by source app"),
     source_id: Optional[str] = Query(None, description="Source asset ID (requires source_app)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     List assets with optional filters.
+
+    Owner listings are paginated; the next page's cursor is returned in
+    the `X-Next-Cursor` header, which is absent on the last page.
     """
     if source_app and source_id:
         asset = await asset_registry.get_by_source(source_app, source_id)
@@ -88,10 +143,16 @@ async def list_assets(
     
     if owner_id and owner_id != current_user.uid:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    if owner_id:
-        return await asset_registry.list_by_owner(owner_id)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return await asset_registry.list_by_owner(current_user.uid)
+    assets = await asset_registry.list_by_owner(owner_id or current_user.uid, limit=limit + 1, after=after)
+    next_page = next_cursor(assets, limit, created_at_attr="registered_at", id_attr="paid")
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    return assets
 
 
 @router.post("/{paid}/anchor", response_model=RegisteredAsset)
@@ -101,11 +162,15 @@ async def bind_anchor(
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """Bind an anchor to an asset."""
-    asset = await asset_registry.bind_anchor(paid, request.anchor_id)
+    await require_asset_for_write(paid, current_user)
+    try:
+        asset = await asset_registry.bind_anchor(paid, request.anchor_id, acting_owner=current_user.uid)
+    except AnchorAlreadyBound:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Anchor is bound to another asset")
+    except NotAssetOwner:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=OWNER_CHANGED)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
-    if asset.owner_id and asset.owner_id != current_user.uid:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     return asset
 
 
@@ -116,16 +181,16 @@ async def transfer_asset(
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """Transfer asset ownership."""
-    asset = await asset_registry.get(paid)
-    if not asset:
-        raise HTTPException(status_code=404, detail="Asset not found")
-    if asset.owner_id and asset.owner_id != current_user.uid:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    asset = await asset_registry.transfer(
-        paid, 
-        request.new_owner_id, 
-        request.new_owner_type
-    )
+    await require_asset_for_write(paid, current_user)
+    try:
+        asset = await asset_registry.transfer(
+            paid,
+            request.new_owner_id,
+            request.new_owner_type,
+            acting_owner=current_user.uid,
+        )
+    except NotAssetOwner:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=OWNER_CHANGED)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     return asset
@@ -138,16 +203,16 @@ async def update_valuation(
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """Update the current valuation for an asset."""
-    asset = await asset_registry.get(paid)
-    if not asset:
-        raise HTTPException(status_code=404, detail="Asset not found")
-    if asset.owner_id and asset.owner_id != current_user.uid:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    asset = await asset_registry.update_valuation(
-        paid,
-        request.value_micros,
-        request.valuation_id
-    )
+    await require_asset_for_write(paid, current_user)
+    try:
+        asset = await asset_registry.update_valuation(
+            paid,
+            request.value_micros,
+            request.valuation_id,
+            acting_owner=current_user.uid,
+        )
+    except NotAssetOwner:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=OWNER_CHANGED)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     return asset
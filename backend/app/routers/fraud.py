@@ -9,9 +9,15 @@ from app.services.fraud import (
     FraudScoreResult,
 )
 from app.services.ledger import LedgerClient
+from app.admission import require_admission
 from app.auth import AuthenticatedUser, get_current_user
+from app.services.deadline import DeadlineExceeded
 
-router = APIRouter(prefix="/v1/fraud", tags=["fraud"])
+router = APIRouter(
+    prefix="/v1/fraud",
+    tags=["fraud"],
+    dependencies=[Depends(require_admission("fraud"))],
+)
 
 # Service instances
 ledger_client = LedgerClient()
@@ -31,6 +37,8 @@ async def score_entity(
     try:
         result = await fraud_scorer.score(request)
         return result
+    except (HTTPException, DeadlineExceeded):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4,18 +4,39 @@ Provides proxy/orchestration endpoints for inter-app communication.
 Apps can call Core to coordinate with other services.
 """
 
-from typing import Optional
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field
 
 import httpx
 
-from app.auth import AuthenticatedUser, get_current_user
-router = APIRouter(prefix="/v1/gateway", tags=["gateway"])
+from app.admission import require_admission
+from app.auth import AuthenticatedUser, get_current_user, require_admin
+from app.routers.valuation import valuation_engine
+from app.services import deadline
+from app.services.deadline import DeadlineExceeded, deadline_scope
+from app.services.health import HealthProber, HealthUpdate, probe_service
+from app.services.idempotency import IdempotencyKeyReusedError, IdempotencyStore, request_fingerprint
+from app.services.quote_cache import QuoteCache
+from app.services.service_registry import BalancingStrategy, EndpointStats, InvalidRegistryConfig, ServiceRegistry
+from app.services.valuation import ValuationRequest
+router = APIRouter(
+    prefix="/v1/gateway",
+    tags=["gateway"],
+    dependencies=[Depends(require_admission("gateway"))],
+)
 
 
-# Service URLs (in production, from config)
+# Default service URLs; replicas and overrides come from the registry config
 SERVICE_URLS = {
     "ledger": "http://localhost:8006/api/v1",
     "anchors": "http://localhost:8005/api/v1",
@@ -31,6 +52,44 @@ SERVICE_URLS = {
     "origins": "http://localhost:3009/api",
 }
 
+service_registry = ServiceRegistry(
+    SERVICE_URLS,
+    config_path=os.getenv("SERVICE_REGISTRY_PATH"),
+    strategy=BalancingStrategy(os.getenv("SERVICE_REGISTRY_STRATEGY", BalancingStrategy.LEAST_OUTSTANDING.value)),
+)
+
+# Shared prober behind /health/stream; one probing loop for all subscribers.
+# It also feeds the registry, which drops unhealthy replicas from rotation.
+health_prober = HealthProber(service_registry.probe_targets, interval_seconds=5.0, max_buffer=100)
+health_prober.add_listener(service_registry.observe_health)
+HEALTH_STREAM_KEEPALIVE_SECONDS = 15.0
+
+# Upstream response headers forwarded by streaming proxy endpoints
+PASSTHROUGH_HEADERS = ("content-length", "content-encoding", "etag", "last-modified", "cache-control")
+
+# Completed POST responses by client Idempotency-Key (24h, bounded)
+idempotency_store = IdempotencyStore(maxsize=10_000, ttl_seconds=24 * 3600)
+
+# Protect quotes by canonical input hash; invalidated on asset revaluation
+quote_cache = QuoteCache(maxsize=5_000, ttl_seconds=float(os.getenv("QUOTE_CACHE_TTL_SECONDS", "60")))
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Shared upstream client, so proxied calls reuse pooled connections."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=30.0)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class ServiceHealthResponse(BaseModel):
     service: str
@@ -40,6 +99,16 @@ class ServiceHealthResponse(BaseModel):
     error: Optional[str] = None
 
 
+def _to_health_response(update: HealthUpdate) -> ServiceHealthResponse:
+    return ServiceHealthResponse(
+        service=update.service,
+        status=update.status,
+        url=update.url,
+        latency_ms=update.latency_ms,
+        error=update.error,
+    )
+
+
 class GetQuoteRequest(BaseModel):
     asset_id: UUID
     asset_valuation_micros: str
@@ -68,44 +137,98 @@ class SubmitClaimRequest(BaseModel):
     evidence_ids: list[str] = []
 
 
+class ShipInsuredRequest(BaseModel):
+    valuation: ValuationRequest
+    sender_wallet_id: str
+    recipient_wallet_id: str
+    declared_value_micros: Optional[str] = None  # Defaults to the valuation
+    anchor_id: Optional[str] = None
+    require_quote: bool = False  # Only ship once a quote was obtained
+    
+    # Quote inputs (valuation comes from the valuation leg)
+    security_level: str = "MED"
+    last_verified_service_days: int = 0
+    transit_damage_history: bool = False
+    coverage_type: str = "FULL"
+    term_days: int = 365
+    
+    ledger_event_limit: int = 100
+    deadline_ms: int = Field(10_000, gt=0, le=60_000)
+
+
+class LegResult(BaseModel):
+    status: str  # "ok", "error", "timeout", "skipped"
+    started_ms: Optional[float] = None  # Offset from the start of the request
+    duration_ms: Optional[float] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+class ShipInsuredResponse(BaseModel):
+    asset_id: UUID
+    complete: bool  # True when every leg succeeded
+    total_ms: float
+    legs: dict[str, LegResult]  # valuation, quote, shipment, ledger_events
+
+
 @router.get("/health", response_model=list[ServiceHealthResponse])
 async def check_all_services(
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    """Check health of all PROVENIQ services."""
-    results = []
-    
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        for service, base_url in SERVICE_URLS.items():
-            try:
-                import time
-                start = time.time()
-                response = await client.get(f"{base_url.rstrip('/api/v1').rstrip('/api')}/health")
-                latency = (time.time() - start) * 1000
-                
-                if response.status_code == 200:
-                    results.append(ServiceHealthResponse(
-                        service=service,
-                        status="healthy",
-                        url=base_url,
-                        latency_ms=round(latency, 2),
-                    ))
-                else:
-                    results.append(ServiceHealthResponse(
-                        service=service,
-                        status="unhealthy",
-                        url=base_url,
-                        error=f"HTTP {response.status_code}",
-                    ))
-            except Exception as e:
-                results.append(ServiceHealthResponse(
-                    service=service,
-                    status="unavailable",
-                    url=base_url,
-                    error=str(e),
-                ))
-    
-    return results
+    """
+    Check health of all PROVENIQ services.
+    
+    Served from the shared prober's snapshot while a health stream is
+    active, so polling clients don't fan out to every upstream.
+    """
+    updates = health_prober.snapshot(max_age_seconds=health_prober.interval_seconds * 2)
+    if updates is None:
+        probe_timeout = deadline.timeout(5.0, "health check")
+        updates = await asyncio.gather(*(
+            probe_service(_get_http_client(), service, base_url, timeout=probe_timeout)
+            for service, base_urls in service_registry.probe_targets().items()
+            for base_url in base_urls
+        ))
+    
+    return [_to_health_response(update) for update in updates]
+
+
+@router.get("/health/stream")
+async def stream_service_health(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Stream service health as Server-Sent Events.
+    
+    Sends the current status of every service on connect, then each probe
+    result as the shared prober observes it (`changed` marks transitions).
+    Subscribers that fall too far behind are disconnected.
+    """
+    subscription = health_prober.subscribe()
+    
+    async def event_stream():
+        try:
+            while True:
+                try:
+                    update = await subscription.get(timeout=HEALTH_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if update is None:
+                    yield "event: dropped\ndata: {}\n\n"
+                    break
+                yield f"event: health\ndata: {update.model_dump_json()}\n\n"
+        finally:
+            health_prober.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/health/{service}", response_model=ServiceHealthResponse)
@@ -113,64 +236,101 @@ async def check_service(
     service: str,
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    """Check health of a specific service."""
-    if service not in SERVICE_URLS:
-        raise HTTPException(status_code=404, detail=f"Unknown service: {service}")
+    """
+    Check health of a specific service.
     
-    base_url = SERVICE_URLS[service]
+    With several replicas, reports the healthiest one.
+    """
+    if service not in service_registry:
+        raise HTTPException(status_code=404, detail=f"Unknown service: {service}")
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            import time
-            start = time.time()
-            # Try common health endpoints
-            health_url = base_url.rstrip('/api/v1').rstrip('/api') + "/health"
-            response = await client.get(health_url)
-            latency = (time.time() - start) * 1000
-            
-            if response.status_code == 200:
-                return ServiceHealthResponse(
-                    service=service,
-                    status="healthy",
-                    url=base_url,
-                    latency_ms=round(latency, 2),
-                )
-            else:
-                return ServiceHealthResponse(
-                    service=service,
-                    status="unhealthy",
-                    url=base_url,
-                    error=f"HTTP {response.status_code}",
-                )
-        except Exception as e:
-            return ServiceHealthResponse(
-                service=service,
-                status="unavailable",
-                url=base_url,
-                error=str(e),
-            )
+    probe_timeout = deadline.timeout(5.0, "health check")
+    updates = await asyncio.gather(*(
+        probe_service(_get_http_client(), service, endpoint.url, timeout=probe_timeout)
+        for endpoint in service_registry.endpoints(service)
+    ))
+    rank = {"healthy": 0, "unhealthy": 1, "unavailable": 2}
+    best = min(updates, key=lambda u: (rank.get(u.status, 3), u.latency_ms or 0.0))
+    return _to_health_response(best)
 
 
-@router.post("/protect/quote")
-async def get_protect_quote(
-    request: GetQuoteRequest,
+@router.get("/registry", response_model=list[EndpointStats])
+async def get_service_registry(
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
+    """List every registered replica with its live balancing stats."""
+    return service_registry.stats()
+
+
+@router.post("/registry/reload", response_model=list[EndpointStats])
+async def reload_service_registry(
+    current_user: AuthenticatedUser = Depends(require_admin),
+):
+    """Re-read the service registry config without a restart (admins only)."""
+    try:
+        service_registry.reload()
+    except InvalidRegistryConfig as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return service_registry.stats()
+
+
+async def _idempotent(
+    route: str,
+    idempotency_key: Optional[str],
+    current_user: AuthenticatedUser,
+    payload: BaseModel,
+    response: Response,
+    call: Callable[[], Awaitable[Any]],
+) -> Any:
     """
-    Get an insurance quote from Protect.
+    Run an upstream POST at most once per client Idempotency-Key.
     
-    Orchestrates the quote request with proper context.
+    Keys are scoped per user and route. Without a key the call is made
+    as before. The record holds the body and the headers `call` set on
+    the response, so a replay answers exactly what the first client got.
     """
-    import uuid
+    if not idempotency_key:
+        return await call()
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.post(
-                f"{SERVICE_URLS['protect']}/quote",
+    key = f"{current_user.uid}:{route}:{idempotency_key}"
+    fingerprint = request_fingerprint(payload.model_dump(mode="json"))
+    
+    async def record() -> tuple[Any, dict[str, str]]:
+        before = dict(response.headers)
+        body = await call()
+        return body, {name: value for name, value in response.headers.items() if before.get(name) != value}
+    
+    try:
+        (body, headers), replayed = await idempotency_store.run(key, fingerprint, record)
+    except IdempotencyKeyReusedError:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request body",
+        )
+    if replayed:
+        response.headers.update(headers)
+        response.headers["Idempotent-Replayed"] = "true"
+    return body
+
+
+def _upstream_headers(idempotency_key: Optional[str]) -> dict[str, str]:
+    return {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+
+
+async def _request_protect_quote(request: GetQuoteRequest) -> Any:
+    """POST a quote request to Protect; upstream failures raise 502."""
+    created_at = datetime.utcnow().isoformat() + "Z"
+    request_timeout = deadline.timeout(30.0, "Protect quote")
+    client = _get_http_client()
+    try:
+        async with service_registry.acquire("protect") as base_url:
+            upstream = await client.post(
+                f"{base_url}/quote",
+                timeout=request_timeout,
                 json={
                     "context": {
                         "schema_version": "1.0.0",
-                        "created_at": __import__("datetime").datetime.utcnow().isoformat() + "Z",
+                        "created_at": created_at,
                         "correlation_id": str(uuid.uuid4()),
                         "idempotency_key": str(uuid.uuid4()),
                         "asset_id": str(request.asset_id),
@@ -181,7 +341,7 @@ async def get_protect_quote(
                     },
                     "request": {
                         "schema_version": "1.0.0",
-                        "created_at": __import__("datetime").datetime.utcnow().isoformat() + "Z",
+                        "created_at": created_at,
                         "correlation_id": str(uuid.uuid4()),
                         "idempotency_key": str(uuid.uuid4()),
                         "asset_id": str(request.asset_id),
@@ -190,26 +350,38 @@ async def get_protect_quote(
                     },
                 }
             )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(status_code=502, detail=f"Protect service error: {e}")
+            upstream.raise_for_status()
+        return upstream.json()
+    except httpx.HTTPError as e:
+        deadline.check("Protect quote")
+        raise HTTPException(status_code=502, detail=f"Protect service error: {e}")
 
 
-@router.post("/transit/shipment")
-async def create_shipment(
-    request: CreateShipmentRequest,
-    current_user: AuthenticatedUser = Depends(get_current_user),
-):
+async def _cached_protect_quote(request: GetQuoteRequest) -> tuple[Any, bool]:
     """
-    Create a shipment in Transit.
+    Quote from the short-TTL cache, falling back to Protect.
     
-    Orchestrates shipment creation with optional insurance.
+    A cached or coalesced quote is shared by every caller with the same
+    inputs, so no one client's Idempotency-Key is sent with the fetch;
+    retries are answered by the gateway's idempotency record instead.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.post(
-                f"{SERVICE_URLS['transit']}/shipments",
+    return await quote_cache.get_or_fetch(
+        str(request.asset_id),
+        request.model_dump(mode="json"),
+        lambda: _request_protect_quote(request),
+    )
+
+
+async def _request_transit_shipment(request: CreateShipmentRequest, idempotency_key: Optional[str] = None) -> Any:
+    """POST a shipment to Transit; upstream failures raise 502."""
+    request_timeout = deadline.timeout(30.0, "Transit shipment")
+    client = _get_http_client()
+    try:
+        async with service_registry.acquire("transit") as base_url:
+            upstream = await client.post(
+                f"{base_url}/shipments",
+                headers=_upstream_headers(idempotency_key),
+                timeout=request_timeout,
                 json={
                     "asset_id": str(request.asset_id),
                     "sender_wallet_id": request.sender_wallet_id,
@@ -219,55 +391,309 @@ async def create_shipment(
                     "request_insurance": request.request_insurance,
                 }
             )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(status_code=502, detail=f"Transit service error: {e}")
+            upstream.raise_for_status()
+        return upstream.json()
+    except httpx.HTTPError as e:
+        deadline.check("Transit shipment")
+        raise HTTPException(status_code=502, detail=f"Transit service error: {e}")
+
+
+async def _request_protect_claim(request: SubmitClaimRequest, idempotency_key: Optional[str] = None) -> Any:
+    """POST a claim to Protect; upstream failures raise 502."""
+    request_timeout = deadline.timeout(30.0, "Protect claim")
+    client = _get_http_client()
+    try:
+        async with service_registry.acquire("protect") as base_url:
+            upstream = await client.post(
+                f"{base_url}/claims",
+                headers=_upstream_headers(idempotency_key),
+                timeout=request_timeout,
+                json={
+                    "policy_id": str(request.policy_id),
+                    "claim_type": request.claim_type,
+                    "description": request.description,
+                    "incident_date": request.incident_date,
+                    "claimed_amount_micros": request.claimed_amount_micros,
+                    "evidence_ids": request.evidence_ids,
+                }
+            )
+            upstream.raise_for_status()
+        return upstream.json()
+    except httpx.HTTPError as e:
+        deadline.check("Protect claim")
+        raise HTTPException(status_code=502, detail=f"Protect service error: {e}")
+
+
+async def _request_ledger_events(asset_id: UUID, limit: int) -> Any:
+    """GET an asset's Ledger events as parsed JSON; upstream failures raise 502."""
+    request_timeout = deadline.timeout(30.0, "Ledger read")
+    client = _get_http_client()
+    try:
+        async with service_registry.acquire("ledger") as base_url:
+            upstream = await client.get(
+                f"{base_url}/assets/{asset_id}/events",
+                params={"limit": limit},
+                timeout=request_timeout,
+            )
+            upstream.raise_for_status()
+        return upstream.json()
+    except httpx.HTTPError as e:
+        deadline.check("Ledger read")
+        raise HTTPException(status_code=502, detail=f"Ledger service error: {e}")
+
+
+@router.post("/protect/quote")
+async def get_protect_quote(
+    request: GetQuoteRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Get an insurance quote from Protect.
+    
+    Orchestrates the quote request with proper context. Identical quote
+    inputs are served from a short-TTL cache until the asset's valuation
+    changes. Retries with the same Idempotency-Key are answered from the
+    stored response, `X-Quote-Cache` included.
+    """
+    async def call():
+        quote, hit = await _cached_protect_quote(request)
+        response.headers["X-Quote-Cache"] = "hit" if hit else "miss"
+        return quote
+    
+    return await _idempotent("protect.quote", idempotency_key, current_user, request, response, call)
+
+
+@router.post("/transit/shipment")
+async def create_shipment(
+    request: CreateShipmentRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Create a shipment in Transit.
+    
+    Orchestrates shipment creation with optional insurance. Honors a
+    client Idempotency-Key.
+    """
+    return await _idempotent(
+        "transit.shipment", idempotency_key, current_user, request, response,
+        lambda: _request_transit_shipment(request, idempotency_key),
+    )
 
 
 @router.post("/protect/claim")
 async def submit_claim(
     request: SubmitClaimRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Submit a claim to Protect.
     
-    Note: Requires authentication in production.
+    Note: Requires authentication in production. Honors a client
+    Idempotency-Key.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    return await _idempotent(
+        "protect.claim", idempotency_key, current_user, request, response,
+        lambda: _request_protect_claim(request, idempotency_key),
+    )
+
+
+@router.post("/ship-insured", response_model=ShipInsuredResponse)
+async def ship_insured(
+    request: ShipInsuredRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Value, quote, ship and read Ledger history for an asset in one call.
+    
+    Independent legs run concurrently under a single `deadline_ms` budget;
+    only the quote waits for the valuation, and the shipment waits for it
+    when no declared value is given (or for the quote when
+    `require_quote` is set). Legs that fail, time out or lose a
+    dependency are reported individually next to the ones that succeeded.
+    A client Idempotency-Key is forwarded to Transit per leg; quotes come
+    from the shared quote cache.
+    """
+    with deadline_scope(request.deadline_ms / 1000):
+        return await _ship_insured(request, idempotency_key)
+
+
+async def _ship_insured(request: ShipInsuredRequest, idempotency_key: Optional[str]) -> ShipInsuredResponse:
+    """Run the ship-insured legs; the caller sets the deadline scope."""
+    asset_id = request.valuation.asset_id
+    started = time.perf_counter()
+    legs: dict[str, LegResult] = {}
+    
+    def leg_key(name: str) -> Optional[str]:
+        return f"{idempotency_key}:{name}" if idempotency_key else None
+    
+    async def run_leg(name: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        leg_started = time.perf_counter()
+        leg = LegResult(status="ok", started_ms=round((leg_started - started) * 1000, 2))
+        legs[name] = leg
         try:
-            response = await client.post(
-                f"{SERVICE_URLS['protect']}/claims",
-                json={
-                    "policy_id": str(request.policy_id),
-                    "claim_type": request.claim_type,
-                    "description": request.description,
-                    "incident_date": request.incident_date,
-                    "claimed_amount_micros": request.claimed_amount_micros,
-                    "evidence_ids": request.evidence_ids,
-                }
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(status_code=502, detail=f"Protect service error: {e}")
+            deadline.check(name)
+            result = await asyncio.wait_for(fn(), timeout=deadline.remaining())
+            leg.result = jsonable_encoder(result)
+            return result
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            leg.status = "timeout"
+            leg.error = "Deadline exceeded"
+        except HTTPException as e:
+            leg.status = "error"
+            leg.error = str(e.detail)
+        except Exception as e:
+            leg.status = "error"
+            leg.error = str(e)
+        finally:
+            leg.duration_ms = round((time.perf_counter() - leg_started) * 1000, 2)
+        return None
+    
+    def skip(name: str, reason: str) -> None:
+        legs[name] = LegResult(status="skipped", error=reason)
+    
+    valuation_task = asyncio.create_task(
+        run_leg("valuation", lambda: valuation_engine.value_asset(request.valuation))
+    )
+    
+    async def quote_leg() -> Any:
+        valuation = await valuation_task
+        if valuation is None:
+            skip("quote", "Valuation unavailable")
+            return None
+        quote_request = GetQuoteRequest(
+            asset_id=asset_id,
+            asset_valuation_micros=valuation.estimated_value_micros,
+            security_level=request.security_level,
+            last_verified_service_days=request.last_verified_service_days,
+            transit_damage_history=request.transit_damage_history,
+            coverage_type=request.coverage_type,
+            term_days=request.term_days,
+        )
+        
+        async def fetch_quote() -> Any:
+            quote, _ = await _cached_protect_quote(quote_request)
+            return quote
+        
+        return await run_leg("quote", fetch_quote)
+    
+    quote_task = asyncio.create_task(quote_leg())
+    
+    async def shipment_leg() -> None:
+        declared_value = request.declared_value_micros
+        if request.require_quote and await quote_task is None:
+            skip("shipment", "Quote unavailable")
+            return
+        if declared_value is None:
+            valuation = await valuation_task
+            if valuation is None:
+                skip("shipment", "Valuation unavailable and no declared value given")
+                return
+            declared_value = valuation.estimated_value_micros
+        shipment_request = CreateShipmentRequest(
+            asset_id=asset_id,
+            sender_wallet_id=request.sender_wallet_id,
+            recipient_wallet_id=request.recipient_wallet_id,
+            declared_value_micros=declared_value,
+            anchor_id=request.anchor_id,
+            request_insurance=True,
+        )
+        await run_leg("shipment", lambda: _request_transit_shipment(shipment_request, leg_key("shipment")))
+    
+    await asyncio.gather(
+        valuation_task,
+        quote_task,
+        shipment_leg(),
+        run_leg("ledger_events", lambda: _request_ledger_events(asset_id, request.ledger_event_limit)),
+    )
+    
+    return ShipInsuredResponse(
+        asset_id=asset_id,
+        complete=all(leg.status == "ok" for leg in legs.values()),
+        total_ms=round((time.perf_counter() - started) * 1000, 2),
+        legs=legs,
+    )
 
 
 @router.get("/ledger/asset/{asset_id}/events")
 async def get_asset_ledger_events(
     asset_id: UUID,
+    request: Request,
     limit: int = 100,
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    """Get all Ledger events for an asset."""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    """
+    Get all Ledger events for an asset.
+    
+    The upstream body is streamed through untouched: nothing is parsed or
+    re-serialized, so memory stays constant however large `limit` is.
+    """
+    request_timeout = deadline.timeout(30.0, "Ledger read")
+    client = _get_http_client()
+    endpoint = service_registry.begin("ledger")
+    started_at = time.perf_counter()
+    try:
+        upstream_request = client.build_request(
+            "GET",
+            f"{endpoint.url}/assets/{asset_id}/events",
+            params={"limit": limit},
+            # Let the client negotiate compression; raw bytes are forwarded as-is
+            headers={"Accept-Encoding": request.headers.get("accept-encoding", "identity")},
+            timeout=request_timeout,
+        )
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.HTTPError as e:
+        service_registry.end(endpoint, started_at, e)
+        deadline.check("Ledger read")
+        raise HTTPException(status_code=502, detail=f"Ledger service error: {e}")
+    
+    if upstream.is_error:
+        await upstream.aread()
+        await upstream.aclose()
+        error = httpx.HTTPStatusError(
+            f"HTTP {upstream.status_code}", request=upstream_request, response=upstream
+        )
+        service_registry.end(endpoint, started_at, error)
+        raise HTTPException(status_code=502, detail=f"Ledger service error: {error}")
+    
+    released = False
+
+    async def release(error: Optional[BaseException] = None) -> None:
+        # Once only: from the body when it runs, else from the background task,
+        # e.g. when the client went away before the body was ever iterated
+        nonlocal released
+        if released:
+            return
+        released = True
+        await upstream.aclose()
+        service_registry.end(endpoint, started_at, error)
+
+    async def body():
+        error = None
         try:
-            response = await client.get(
-                f"{SERVICE_URLS['ledger']}/assets/{asset_id}/events",
-                params={"limit": limit}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(status_code=502, detail=f"Ledger service error: {e}")
+            async for chunk in upstream.aiter_raw():
+                yield chunk
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            await release(error)
+    
+    headers = {
+        name: upstream.headers[name]
+        for name in PASSTHROUGH_HEADERS
+        if name in upstream.headers
+    }
+    return StreamingResponse(
+        body(),
+        status_code=upstream.status_code,
+        headers=headers,
+        media_type=upstream.headers.get("content-type", "application/json"),
+        background=BackgroundTask(release),
+    )
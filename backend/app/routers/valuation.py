@@ -9,9 +9,15 @@ from app.services.valuation import (
     ValuationResult,
 )
 from app.services.ledger import LedgerClient
+from app.admission import require_admission
 from app.auth import AuthenticatedUser, get_current_user
+from app.services.deadline import DeadlineExceeded
 
-router = APIRouter(prefix="/v1/valuations", tags=["valuations"])
+router = APIRouter(
+    prefix="/v1/valuations",
+    tags=["valuations"],
+    dependencies=[Depends(require_admission("valuations"))],
+)
 
 # Service instances (in production, use dependency injection)
 ledger_client = LedgerClient()
@@ -32,6 +38,8 @@ async def create_valuation(
     try:
         result = await valuation_engine.value_asset(request)
         return result
+    except (HTTPException, DeadlineExceeded):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2,5 +2,7 @@ from app.services.valuation import ValuationEngine
 from app.services.fraud import FraudScorer
 from app.services.ledger import LedgerClient
 from app.services.asset_registry import AssetRegistry
+from app.services.health import HealthProber
+from app.services.idempotency import IdempotencyStore
 
-__all__ = ["ValuationEngine", "FraudScorer", "LedgerClient", "AssetRegistry"]
+__all__ = ["ValuationEngine", "FraudScorer", "LedgerClient", "AssetRegistry", "HealthProber", "IdempotencyStore"]
@@ -0,0 +1,253 @@
+"""PROVENIQ Core - Admission Control
+
+Per-tenant rate limiting and concurrency caps for Core's route groups.
+Every PROVENIQ app shares one Core deployment; admission control keeps
+one app's bulk traffic from saturating the event loop and the database
+pool for everyone else.
+
+Each (tenant, route group) pair gets a token bucket and a concurrency cap.
+Each route group also has a global concurrency cap, part of which is
+reserved for interactive traffic. Requests that cannot be admitted wait
+briefly and are then shed with a retry hint.
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from pydantic import BaseModel
+
+
+class RouteGroupPolicy(BaseModel):
+    """Admission limits for one route group."""
+    rate_per_second: float  # Sustained requests/second per tenant
+    burst: int  # Token bucket capacity per tenant
+    tenant_concurrency: int  # In-flight requests per tenant
+    group_concurrency: int  # In-flight requests across all tenants
+    interactive_reserve: int  # Group slots bulk traffic may not use
+    max_queue_seconds: float = 0.25  # How long to wait before shedding
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; `retry_after` is in seconds."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens/second."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+    def take(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+
+class _TenantState:
+    def __init__(self, policy: RouteGroupPolicy):
+        self.bucket = TokenBucket(policy.rate_per_second, policy.burst)
+        self.in_flight = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+
+class _GroupState:
+    def __init__(self):
+        self.in_flight = 0
+        self.interactive_in_flight = 0
+        self.released = asyncio.Event()
+
+    def notify(self) -> None:
+        self.released.set()
+        self.released = asyncio.Event()
+
+
+class TenantUtilization(BaseModel):
+    tenant: str
+    group: str
+    in_flight: int
+    tenant_concurrency: int
+    tokens_available: float
+    admitted: int
+    queued: int
+    rejected: int
+
+
+class GroupUtilization(BaseModel):
+    group: str
+    in_flight: int
+    interactive_in_flight: int
+    group_concurrency: int
+    interactive_reserve: int
+    tenants: list[TenantUtilization]
+
+
+class AdmissionController:
+    """
+    Admits or sheds requests per tenant and route group.
+
+    Use `admit()` around the handler; the slot is held until it exits.
+    """
+
+    def __init__(self, policies: dict[str, RouteGroupPolicy], max_tenants: int = 10_000):
+        self.policies = policies
+        self.max_tenants = max_tenants
+        self._tenants: dict[tuple[str, str], _TenantState] = {}
+        self._groups: dict[str, _GroupState] = {group: _GroupState() for group in policies}
+
+    def _prune_idle_tenants(self) -> None:
+        # An idle tenant with a full bucket is indistinguishable from a new
+        # one, so dropping it loses only its counters
+        for key, state in list(self._tenants.items()):
+            if state.in_flight == 0 and state.bucket.available() >= state.bucket.capacity:
+                del self._tenants[key]
+
+    def _tenant_state(self, tenant: str, group: str) -> _TenantState:
+        key = (tenant, group)
+        state = self._tenants.get(key)
+        if state is None:
+            if len(self._tenants) >= self.max_tenants:
+                self._prune_idle_tenants()
+            state = self._tenants[key] = _TenantState(self.policies[group])
+        return state
+
+    def _blocked(
+        self,
+        policy: RouteGroupPolicy,
+        group: _GroupState,
+        tenant: _TenantState,
+        interactive: bool,
+    ) -> Optional[tuple[str, Optional[float]]]:
+        """
+        Return (reason, expected wait) if the request can't start now.
+
+        The wait is None for concurrency blocks: a slot can free up at
+        any moment, so only a token deficit is known in advance.
+        """
+        group_limit = policy.group_concurrency
+        if not interactive:
+            group_limit -= policy.interactive_reserve
+        if group.in_flight >= group_limit:
+            return "Route group at capacity", None
+        if tenant.in_flight >= policy.tenant_concurrency:
+            return "Too many concurrent requests", None
+        wait = tenant.bucket.wait_time()
+        if wait > 0:
+            return "Rate limit exceeded", wait
+        return None
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        tenant: str,
+        group: str,
+        interactive: bool = True,
+        max_wait: Optional[float] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of the block.
+
+        Raises AdmissionRejected if no slot frees up within the group's
+        queueing window, or within `max_wait` seconds if that is shorter.
+        """
+        policy = self.policies[group]
+        group_state = self._groups[group]
+        tenant_state = self._tenant_state(tenant, group)
+
+        queue_seconds = policy.max_queue_seconds
+        if max_wait is not None:
+            queue_seconds = max(0.0, min(queue_seconds, max_wait))
+        give_up_at = time.monotonic() + queue_seconds
+        queued = False
+        while True:
+            blocked = self._blocked(policy, group_state, tenant_state, interactive)
+            if blocked is None:
+                break
+            reason, expected_wait = blocked
+            remaining = give_up_at - time.monotonic()
+            # Shed early only when the token deficit outlasts the queue window
+            if remaining <= 0 or (expected_wait is not None and expected_wait > remaining):
+                tenant_state.rejected += 1
+                raise AdmissionRejected(reason, max(expected_wait or 0.0, policy.max_queue_seconds))
+            if not queued:
+                tenant_state.queued += 1
+                queued = True
+            timeout = remaining if expected_wait is None else min(remaining, expected_wait)
+            try:
+                await asyncio.wait_for(group_state.released.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        tenant_state.bucket.take()
+        tenant_state.admitted += 1
+        tenant_state.in_flight += 1
+        group_state.in_flight += 1
+        if interactive:
+            group_state.interactive_in_flight += 1
+        try:
+            yield
+        finally:
+            tenant_state.in_flight -= 1
+            group_state.in_flight -= 1
+            if interactive:
+                group_state.interactive_in_flight -= 1
+            group_state.notify()
+
+    def utilization(self) -> list[GroupUtilization]:
+        groups = []
+        for group, policy in self.policies.items():
+            state = self._groups[group]
+            tenants = [
+                TenantUtilization(
+                    tenant=tenant,
+                    group=group,
+                    in_flight=ts.in_flight,
+                    tenant_concurrency=policy.tenant_concurrency,
+                    tokens_available=round(ts.bucket.available(), 2),
+                    admitted=ts.admitted,
+                    queued=ts.queued,
+                    rejected=ts.rejected,
+                )
+                for (tenant, tenant_group), ts in self._tenants.items()
+                if tenant_group == group
+            ]
+            groups.append(GroupUtilization(
+                group=group,
+                in_flight=state.in_flight,
+                interactive_in_flight=state.interactive_in_flight,
+                group_concurrency=policy.group_concurrency,
+                interactive_reserve=policy.interactive_reserve,
+                tenants=tenants,
+            ))
+        return groups
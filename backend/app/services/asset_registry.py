@@ -2,15 +2,40 @@
 
 Central registry for all assets across the PROVENIQ ecosystem.
 Assets registered here get a canonical PROVENIQ Asset ID (PAID).
+
+Assets are stored in Postgres (`registered_assets`), so every worker
+shares one registry. Hot reads are served from a bounded in-process
+cache that every write goes through. Secondary indexes on owner and
+anchor are maintained by the database in the same statement as each
+write, so they can't drift from the rows they index.
 """
 
 import hashlib
 import json
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Optional
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, Text, UniqueConstraint, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services import deadline
+from app.services.cache import TTLCache
+
+
+class AnchorAlreadyBound(Exception):
+    """Raised when an anchor is already bound to a different asset."""
+
+
+class RegistrationConflict(Exception):
+    """Raised when a source asset's registration keeps racing a concurrent change."""
+
+
+class NotAssetOwner(Exception):
+    """Raised when a write on behalf of an owner finds the asset owned by someone else."""
 
 
 class AssetStatus(str, Enum):
@@ -91,21 +116,124 @@ class RegisteredAsset(BaseModel):
     updated_at: datetime
 
 
+# Own metadata: the registry doesn't depend on app.main's models.
+# The app creates the table at startup.
+metadata = MetaData()
+
+assets_table = Table(
+    "registered_assets",
+    metadata,
+    Column("paid", PGUUID(as_uuid=True), primary_key=True),
+    Column("source_app", String(32), nullable=False),
+    Column("source_asset_id", String(255), nullable=False),
+    Column("asset_type", String(64), nullable=False),
+    Column("category", String(64), nullable=False),
+    Column("name", String(255), nullable=False),
+    Column("description", Text, nullable=True),
+    Column("owner_id", String(128), nullable=True),
+    Column("owner_type", String(32), nullable=False),
+    Column("status", String(32), nullable=False),
+    Column("anchor_id", String(255), nullable=True),
+    Column("current_value_micros", String(64), nullable=True),
+    Column("valuation_id", PGUUID(as_uuid=True), nullable=True),
+    Column("valued_at", DateTime, nullable=True),
+    Column("provenance_hash", String(64), nullable=False),
+    Column("registered_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    UniqueConstraint("source_app", "source_asset_id", name="uq_registered_assets_source"),
+    # owner -> PAIDs, in keyset order for paginated listing
+    Index("ix_registered_assets_owner", "owner_id", "registered_at", "paid"),
+    # anchor -> PAID; an anchor is bound to at most one asset
+    Index("ix_registered_assets_anchor", "anchor_id", unique=True),
+)
+
+
 class AssetRegistry:
     """
     Central asset registry for PROVENIQ ecosystem.
     
     Every asset gets a PROVENIQ Asset ID (PAID) that serves as the
     canonical identifier across all apps and the Ledger.
+
+    Reads check a bounded TTL cache before the database; writes update
+    the row and then the cache with the row the database returned. The
+    TTL bounds how long another worker's write can go unseen.
     """
     
-    def __init__(self, db_session=None, ledger_client=None):
-        self.db = db_session
+    REGISTER_ATTEMPTS = 3
+    
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker] = None,
+        ledger_client=None,
+        cache_size: int = 10_000,
+        cache_ttl_seconds: float = 30.0,
+    ):
+        self.session_factory = session_factory
         self.ledger_client = ledger_client
         
-        # In-memory cache for demo (replace with DB in production)
-        self._assets: dict[UUID, RegisteredAsset] = {}
-        self._source_index: dict[str, UUID] = {}  # source_app:source_id -> PAID
+        self._assets: TTLCache[UUID, RegisteredAsset] = TTLCache(cache_size, cache_ttl_seconds)
+        self._source_index: TTLCache[str, UUID] = TTLCache(cache_size, cache_ttl_seconds)  # source_app:source_id -> PAID
+        self._anchor_index: TTLCache[str, UUID] = TTLCache(cache_size, cache_ttl_seconds)  # anchor_id -> PAID
+        
+        self._valuation_listeners: list[Callable[[UUID], None]] = []
+    
+    def attach(self, session_factory: async_sessionmaker) -> None:
+        """Use `session_factory` for database access."""
+        self.session_factory = session_factory
+    
+    def _session(self) -> AsyncSession:
+        if self.session_factory is None:
+            raise RuntimeError("AssetRegistry is not attached to a database")
+        return self.session_factory()
+    
+    def _remember(self, asset: RegisteredAsset) -> RegisteredAsset:
+        self._assets.set(asset.paid, asset)
+        self._source_index.set(self._make_source_key(asset.source_app.value, asset.source_asset_id), asset.paid)
+        if asset.anchor_id:
+            self._anchor_index.set(asset.anchor_id, asset.paid)
+        return asset
+    
+    def _load(self, row) -> RegisteredAsset:
+        return self._remember(RegisteredAsset.model_validate(dict(row._mapping)))
+    
+    @staticmethod
+    def _owned_by(acting_owner: str):
+        """Row condition: the asset is unowned or owned by `acting_owner`."""
+        return or_(assets_table.c.owner_id.is_(None), assets_table.c.owner_id == acting_owner)
+    
+    async def _not_found(self, db: AsyncSession, paid: UUID, acting_owner: Optional[str]) -> None:
+        """After a guarded statement matched no row: raise if the asset exists but isn't the owner's."""
+        self._assets.pop(paid)
+        if acting_owner is not None:
+            exists = (await db.execute(select(assets_table.c.paid).where(assets_table.c.paid == paid))).first()
+            if exists is not None:
+                raise NotAssetOwner(paid)
+    
+    async def _update(self, paid: UUID, acting_owner: Optional[str] = None, **values: Any) -> Optional[RegisteredAsset]:
+        """
+        Update one asset's row and write the result through to the cache.
+
+        With `acting_owner`, the update only applies if the row is still
+        unowned or theirs, checked in the same statement.
+        """
+        stmt = update(assets_table).where(assets_table.c.paid == paid)
+        if acting_owner is not None:
+            stmt = stmt.where(self._owned_by(acting_owner))
+        async with self._session() as db:
+            row = (await db.execute(stmt.values(**values).returning(*assets_table.c))).first()
+            if row is None:
+                await self._not_found(db, paid, acting_owner)
+                return None
+            await db.commit()
+        return self._load(row)
+    
+    def stats(self) -> dict[str, Any]:
+        return {"cache": self._assets.stats()}
+    
+    def add_valuation_listener(self, listener: Callable[[UUID], None]) -> None:
+        """Call `listener(paid)` whenever an asset's valuation changes."""
+        self._valuation_listeners.append(listener)
     
     def _compute_provenance_hash(self, registration: AssetRegistration) -> str:
         """Compute hash of registration data for provenance."""
@@ -130,12 +258,15 @@ class AssetRegistry:
         
         If asset already registered from same source, returns existing record.
         """
+        deadline.check("asset registration")
         source_key = self._make_source_key(registration.source_app.value, registration.source_asset_id)
         
         # Check if already registered
-        if source_key in self._source_index:
-            existing_paid = self._source_index[source_key]
-            return self._assets[existing_paid]
+        existing_paid = self._source_index.get(source_key)
+        if existing_paid is not None:
+            existing = await self.get(existing_paid)
+            if existing is not None:
+                return existing
         
         # Create new registration
         paid = uuid4()
@@ -160,9 +291,36 @@ class AssetRegistry:
             updated_at=now,
         )
         
-        # Store
-        self._assets[paid] = asset
-        self._source_index[source_key] = paid
+        # Store; the unique source index settles concurrent registrations
+        values = asset.model_dump()
+        values["source_app"] = asset.source_app.value
+        values["status"] = asset.status.value
+        async with self._session() as db:
+            for _ in range(self.REGISTER_ATTEMPTS):
+                try:
+                    row = (await db.execute(
+                        pg_insert(assets_table)
+                        .values(**values)
+                        .on_conflict_do_nothing(constraint="uq_registered_assets_source")
+                        .returning(*assets_table.c)
+                    )).first()
+                except IntegrityError as e:
+                    raise AnchorAlreadyBound(registration.anchor_id) from e
+                if row is not None:
+                    break
+                existing_row = (await db.execute(
+                    select(assets_table).where(
+                        assets_table.c.source_app == registration.source_app.value,
+                        assets_table.c.source_asset_id == registration.source_asset_id,
+                    )
+                )).first()
+                if existing_row is not None:
+                    return self._load(existing_row)
+                # The conflicting row was deleted between the two statements; insert again
+            else:
+                raise RegistrationConflict(source_key)
+            await db.commit()
+        asset = self._load(row)
         
         # Write to Ledger
         if self.ledger_client:
@@ -186,54 +344,75 @@ class AssetRegistry:
         
         return asset
     
-    async def get(self, paid: UUID) -> Optional[RegisteredAsset]:
-        """Get an asset by PROVENIQ Asset ID."""
-        return self._assets.get(paid)
+    async def get(self, paid: UUID, use_cache: bool = True) -> Optional[RegisteredAsset]:
+        """
+        Get an asset by PROVENIQ Asset ID.
+
+        Pass `use_cache=False` to read the row itself, e.g. to authorize a
+        write against the current owner rather than a cached one.
+        """
+        asset = self._assets.get(paid) if use_cache else None
+        if asset is not None:
+            return asset
+        async with self._session() as db:
+            row = (await db.execute(select(assets_table).where(assets_table.c.paid == paid))).first()
+        return self._load(row) if row is not None else None
     
     async def get_by_source(self, source_app: str, source_id: str) -> Optional[RegisteredAsset]:
         """Get an asset by source app and ID."""
         source_key = self._make_source_key(source_app, source_id)
         paid = self._source_index.get(source_key)
         if paid:
-            return self._assets.get(paid)
-        return None
+            asset = await self.get(paid)
+            if asset is not None:
+                return asset
+        async with self._session() as db:
+            row = (await db.execute(
+                select(assets_table).where(
+                    assets_table.c.source_app == source_app,
+                    assets_table.c.source_asset_id == source_id,
+                )
+            )).first()
+        return self._load(row) if row is not None else None
     
     async def update_valuation(
         self, 
         paid: UUID, 
         value_micros: str, 
-        valuation_id: UUID
+        valuation_id: UUID,
+        acting_owner: Optional[str] = None,
     ) -> Optional[RegisteredAsset]:
         """Update the current valuation for an asset."""
-        asset = self._assets.get(paid)
-        if not asset:
+        deadline.check("valuation update")
+        now = datetime.utcnow()
+        updated = await self._update(
+            paid,
+            acting_owner,
+            current_value_micros=value_micros,
+            valuation_id=valuation_id,
+            valued_at=now,
+            updated_at=now,
+        )
+        if not updated:
             return None
         
-        # Update in place (Pydantic model mutation)
-        asset_dict = asset.model_dump()
-        asset_dict["current_value_micros"] = value_micros
-        asset_dict["valuation_id"] = valuation_id
-        asset_dict["valued_at"] = datetime.utcnow()
-        asset_dict["updated_at"] = datetime.utcnow()
-        
-        updated = RegisteredAsset(**asset_dict)
-        self._assets[paid] = updated
+        for listener in self._valuation_listeners:
+            listener(paid)
         
         return updated
     
-    async def bind_anchor(self, paid: UUID, anchor_id: str) -> Optional[RegisteredAsset]:
+    async def bind_anchor(
+        self, paid: UUID, anchor_id: str, acting_owner: Optional[str] = None
+    ) -> Optional[RegisteredAsset]:
         """Bind an anchor to an asset."""
-        asset = self._assets.get(paid)
-        if not asset:
+        deadline.check("anchor binding")
+        try:
+            updated = await self._update(paid, acting_owner, anchor_id=anchor_id, updated_at=datetime.utcnow())
+        except IntegrityError as e:
+            raise AnchorAlreadyBound(anchor_id) from e
+        if not updated:
             return None
         
-        asset_dict = asset.model_dump()
-        asset_dict["anchor_id"] = anchor_id
-        asset_dict["updated_at"] = datetime.utcnow()
-        
-        updated = RegisteredAsset(**asset_dict)
-        self._assets[paid] = updated
-        
         # Write to Ledger
         if self.ledger_client:
             await self.ledger_client.write_event(
@@ -253,23 +432,41 @@ class AssetRegistry:
         self, 
         paid: UUID, 
         new_owner_id: str, 
-        new_owner_type: str = "individual"
+        new_owner_type: str = "individual",
+        acting_owner: Optional[str] = None,
     ) -> Optional[RegisteredAsset]:
-        """Transfer asset ownership."""
-        asset = self._assets.get(paid)
-        if not asset:
-            return None
-        
-        old_owner = asset.owner_id
-        
-        asset_dict = asset.model_dump()
-        asset_dict["owner_id"] = new_owner_id
-        asset_dict["owner_type"] = new_owner_type
-        asset_dict["status"] = AssetStatus.TRANSFERRED
-        asset_dict["updated_at"] = datetime.utcnow()
-        
-        updated = RegisteredAsset(**asset_dict)
-        self._assets[paid] = updated
+        """
+        Transfer asset ownership.
+
+        With `acting_owner`, only an unowned asset or one they own moves;
+        otherwise NotAssetOwner is raised.
+        """
+        deadline.check("asset transfer")
+        guard = [assets_table.c.paid == paid]
+        if acting_owner is not None:
+            guard.append(self._owned_by(acting_owner))
+        async with self._session() as db:
+            # Lock the row so the ledger event names the owner actually replaced
+            locked = (await db.execute(
+                select(assets_table.c.owner_id).where(*guard).with_for_update()
+            )).first()
+            if locked is None:
+                await self._not_found(db, paid, acting_owner)
+                return None
+            old_owner = locked.owner_id
+            row = (await db.execute(
+                update(assets_table)
+                .where(*guard)
+                .values(
+                    owner_id=new_owner_id,
+                    owner_type=new_owner_type,
+                    status=AssetStatus.TRANSFERRED.value,
+                    updated_at=datetime.utcnow(),
+                )
+                .returning(*assets_table.c)
+            )).first()
+            await db.commit()
+        updated = self._load(row)
         
         # Write to Ledger
         if self.ledger_client:
@@ -277,7 +474,7 @@ class AssetRegistry:
                 source="core",
                 event_type="ASSET_TRANSFERRED",
                 asset_id=str(paid),
-                anchor_id=asset.anchor_id,
+                anchor_id=updated.anchor_id,
                 payload={
                     "paid": str(paid),
                     "from_owner": old_owner,
@@ -288,6 +485,40 @@ class AssetRegistry:
         
         return updated
     
-    async def list_by_owner(self, owner_id: str) -> list[RegisteredAsset]:
-        """List all assets for an owner."""
-        return [a for a in self._assets.values() if a.owner_id == owner_id]
+    async def get_by_anchor(self, anchor_id: str) -> Optional[RegisteredAsset]:
+        """Get the asset an anchor is bound to."""
+        paid = self._anchor_index.get(anchor_id)
+        if paid:
+            asset = await self.get(paid)
+            # The anchor may have been rebound since it was cached
+            if asset is not None and asset.anchor_id == anchor_id:
+                return asset
+        async with self._session() as db:
+            row = (await db.execute(select(assets_table).where(assets_table.c.anchor_id == anchor_id))).first()
+        return self._load(row) if row is not None else None
+    
+    async def list_by_owner(
+        self,
+        owner_id: str,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[RegisteredAsset]:
+        """
+        List an owner's assets in (registered_at, paid) order.
+
+        Served from the owner index; pass the last asset's
+        (registered_at, paid) as `after` to fetch the next page.
+        """
+        stmt = (
+            select(assets_table)
+            .where(assets_table.c.owner_id == owner_id)
+            .order_by(assets_table.c.registered_at, assets_table.c.paid)
+        )
+        if after:
+            stmt = stmt.where(tuple_(assets_table.c.registered_at, assets_table.c.paid) > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        async with self._session() as db:
+            rows = await db.execute(stmt)
+        # Not cached: a page of listings would evict the hot single-asset entries
+        return [RegisteredAsset.model_validate(dict(row._mapping)) for row in rows]
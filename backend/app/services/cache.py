@@ -0,0 +1,140 @@
+"""PROVENIQ Core - In-Process Caching Primitives
+
+Bounded TTL cache and single-flight call coalescing shared by Core's
+response, quote and lookup caches.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+_MISSING = object()
+# Set on a flight whose leader was cancelled, telling waiters to retry
+_LEADER_CANCELLED = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache whose entries expire after a TTL.
+
+    Expired entries are dropped lazily on access; once `maxsize` is
+    reached the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key, _MISSING)
+        return entry is not _MISSING and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SingleFlight(Generic[K]):
+    """
+    Coalesce concurrent calls for the same key onto one execution.
+
+    The first caller runs the coroutine; callers arriving while it is in
+    flight await the same outcome, result or exception. If the running
+    caller is cancelled (e.g. its request timed out), the waiters are not:
+    one of them takes over and runs the coroutine itself.
+    """
+
+    def __init__(self):
+        self._inflight: dict[K, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def in_flight(self, key: K) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run `fn` once per key at a time.
+
+        Returns `(result, shared)` where `shared` is True for callers that
+        joined an execution already in flight.
+        """
+        joined = False
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            if not joined:
+                self.coalesced += 1
+                joined = True
+            outcome = await asyncio.shield(future)
+            if outcome is not _LEADER_CANCELLED:
+                return outcome, True
+            # The leader was cancelled; retry, and the first waiter to get here leads
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; retrieve the exception so it isn't logged
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_result(_LEADER_CANCELLED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._inflight.pop(key, None)
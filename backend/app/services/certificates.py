@@ -0,0 +1,260 @@
+"""PROVENIQ Core - Inspection Certificates
+
+Renders inspection certificate PDFs in a process pool and caches them on
+disk. A certificate's content is fully determined by its fields, so the
+cache key (and the ETag) is a hash of those fields. "Generated At" is
+the signing time (or the submission time, for unsigned inspections)
+rather than the wall clock, so every worker renders the same bytes for
+the same ETag.
+
+`render_certificate_pdf` is a top-level function in a module without
+import side effects so it can be pickled to worker processes.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.services.cache import SingleFlight
+
+
+def certificate_fields(inspection) -> dict[str, str]:
+    """The inspection fields a certificate shows, as strings."""
+    return {
+        "inspection_id": str(inspection.id),
+        "lease_id": str(inspection.lease_id),
+        "content_hash": inspection.content_hash,
+        "status": inspection.status,
+        "submitted_at": str(inspection.submitted_at),
+        "signed_at": str(inspection.signed_at),
+    }
+
+
+def certificate_etag(fields: dict[str, str]) -> str:
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def certificate_generated_at(fields: dict[str, str]) -> str:
+    """The "Generated At" shown on a certificate: when it was signed, else submitted."""
+    return fields["signed_at"] if fields["signed_at"] != "None" else fields["submitted_at"]
+
+
+def render_certificate_pdf(fields: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, invariant=1)
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(72, 720, "PROVENIQ Core - Inspection Certificate")
+    c.setFont("Helvetica", 11)
+    lines = [
+        f"Inspection ID: {fields['inspection_id']}",
+        f"Lease ID: {fields['lease_id']}",
+        f"Content Hash (SHA-256): {fields['content_hash']}",
+        f"Status: {fields['status']}",
+        f"Submitted At: {fields['submitted_at']}",
+        f"Signed At: {fields['signed_at']}",
+        f"Generated At: {certificate_generated_at(fields)}",
+    ]
+    y = 690
+    for line in lines:
+        c.drawString(72, y, line)
+        y -= 18
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison)."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/").strip('"') == etag:
+            return True
+    return False
+
+
+class CertificateRenderer:
+    """
+    Disk-cached certificate PDFs rendered in a process pool.
+
+    Files live at `<cache_dir>/<inspection_id>/<etag>.pdf`; rendering a new
+    version of an inspection's certificate removes stale versions that have
+    not been served for `prune_grace_seconds`, so a response still streaming
+    an old version keeps its file. Cache hits refresh the file's mtime.
+    Concurrent requests for the same uncached certificate share a render.
+    """
+
+    def __init__(self, cache_dir: str, max_workers: int = 2, prune_grace_seconds: float = 300.0):
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self.prune_grace_seconds = prune_grace_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._flights: SingleFlight[str] = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.render_seconds_total = 0.0
+        self.render_seconds_max = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process with a running event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def path_for(self, fields: dict[str, str], etag: str) -> Path:
+        return self.cache_dir / fields["inspection_id"] / f"{etag}.pdf"
+
+    def _store(self, path: Path, pdf: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        tmp.write_bytes(pdf)
+        os.replace(tmp, path)
+        cutoff = time.time() - self.prune_grace_seconds
+        for stale in path.parent.glob("*.pdf"):
+            try:
+                if stale != path and stale.stat().st_mtime < cutoff:
+                    stale.unlink()
+            except FileNotFoundError:
+                pass
+
+    async def get(self, fields: dict[str, str]) -> tuple[Path, str, bool]:
+        """Return (pdf_path, etag, cache_hit), rendering on a miss."""
+        etag = certificate_etag(fields)
+        path = self.path_for(fields, etag)
+        try:
+            # Touch on hit: the mtime is when the file was last served, for pruning
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            return path, etag, True
+
+        async def render() -> Path:
+            loop = asyncio.get_running_loop()
+            start = time.perf_counter()
+            pdf = await loop.run_in_executor(self.executor, render_certificate_pdf, fields)
+            elapsed = time.perf_counter() - start
+            self.renders += 1
+            self.render_seconds_total += elapsed
+            self.render_seconds_max = max(self.render_seconds_max, elapsed)
+            await asyncio.to_thread(self._store, path, pdf)
+            return path
+
+        await self._flights.do(etag, render)
+        return path, etag, False
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "renders": self.renders,
+            "coalesced": self._flights.coalesced,
+            "render_avg_ms": round(self.render_seconds_total / self.renders * 1000, 2) if self.renders else None,
+            "render_max_ms": round(self.render_seconds_max * 1000, 2),
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class _ZipSink:
+    """
+    Unseekable file object that collects what zipfile writes.
+
+    Having no tell()/seek() makes zipfile stream: it writes data
+    descriptors after each entry instead of seeking back to patch headers.
+    """
+
+    def __init__(self):
+        self._chunks: deque[bytes] = deque()
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_certificate_archive(
+    renderer: CertificateRenderer,
+    certificates: list[dict[str, str]],
+    window: int = 8,
+) -> AsyncIterator[bytes]:
+    """
+    Yield a ZIP of the given certificates, entry by entry as each is ready.
+
+    Up to `window` certificates are fetched or rendered at once, and
+    entries are written in completion order. A `manifest.json` entry at the
+    end lists each certificate's ETag or render error. Memory is bounded by
+    the window, not the archive size.
+    """
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+    semaphore = asyncio.Semaphore(max(1, window))
+    manifest = []
+
+    async def load(fields: dict[str, str]) -> tuple[dict[str, str], Optional[bytes], Optional[str]]:
+        # The slot is released by the consumer once the entry is written,
+        # so a slow client stalls rendering instead of piling up PDFs
+        await semaphore.acquire()
+        try:
+            path, _, _ = await renderer.get(fields)
+            return fields, await asyncio.to_thread(path.read_bytes), None
+        except Exception as e:
+            return fields, None, str(e)
+
+    tasks = [asyncio.create_task(load(fields)) for fields in certificates]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            fields, pdf, error = await next_done
+            entry = {"inspection_id": fields["inspection_id"], "content_hash": fields["content_hash"]}
+            if pdf is None:
+                entry["error"] = error
+            else:
+                name = f"inspection_{fields['inspection_id']}_certificate.pdf"
+                archive.writestr(name, pdf)
+                entry["file"] = name
+                entry["etag"] = certificate_etag(fields)
+            manifest.append(entry)
+            semaphore.release()
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Client went away: stop rendering what nobody will receive
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,135 @@
+"""PROVENIQ Core - Request Deadlines
+
+Carries a caller's deadline through engines, the registry, the Ledger
+client and gateway calls via a context variable. Downstream timeouts
+shrink to the remaining budget, and work is abandoned once nobody is
+waiting for the result any more.
+
+Callers set the deadline with either header:
+
+    X-Request-Deadline: <absolute deadline, Unix epoch milliseconds>
+    X-Request-Timeout-Ms: <budget in milliseconds from receipt>
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Mapping, Optional
+
+DEADLINE_HEADER = "x-request-deadline"
+TIMEOUT_HEADER = "x-request-timeout-ms"
+
+# Deadline as a time.monotonic() value; None means unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is attempted after the request deadline passed."""
+
+    def __init__(self, operation: str = "request"):
+        super().__init__(f"Deadline exceeded before {operation}")
+        self.operation = operation
+
+
+def budget_from_headers(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Seconds left according to the deadline headers, or None if absent.
+
+    The relative timeout wins over the absolute deadline when both are
+    sent, since it is immune to clock skew between caller and Core.
+    """
+    raw_timeout = headers.get(TIMEOUT_HEADER)
+    if raw_timeout:
+        try:
+            return float(raw_timeout) / 1000
+        except ValueError:
+            pass
+    raw_deadline = headers.get(DEADLINE_HEADER)
+    if raw_deadline:
+        try:
+            return float(raw_deadline) / 1000 - time.time()
+        except ValueError:
+            pass
+    return None
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound the enclosed work to `seconds` from now.
+
+    Nested scopes can only tighten an outer deadline, never extend it.
+    """
+    if seconds is None:
+        yield
+        return
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        new_deadline = min(new_deadline, current)
+    token = _deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds until the current deadline (may be negative), or None."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check(operation: str = "request") -> None:
+    """Raise DeadlineExceeded if the current deadline has passed."""
+    if expired():
+        raise DeadlineExceeded(operation)
+
+
+def batches(total: int, max_size: int, operation: str = "request") -> Iterator[tuple[int, int]]:
+    """
+    Yield (start, end) slices over `total` items, sized to the time left.
+
+    The deadline is checked before each batch. Once a batch has been
+    timed, the next is shrunk to what the remaining budget covers at the
+    measured rate, so work that can't be interrupted (e.g. in a thread)
+    stops before it would overrun rather than failing after it.
+    """
+    start = 0
+    per_item: Optional[float] = None
+    while start < total:
+        size = max_size
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded(operation)
+            if per_item:
+                size = min(size, int(left / per_item))
+                if size < 1:
+                    raise DeadlineExceeded(operation)
+        end = min(total, start + size)
+        began = time.monotonic()
+        yield start, end
+        per_item = (time.monotonic() - began) / (end - start)
+        start = end
+
+
+def timeout(default: float, operation: str = "request") -> float:
+    """
+    Timeout for a downstream call: `default` capped at the time left.
+
+    Raises DeadlineExceeded instead of returning a non-positive timeout.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded(operation)
+    return min(default, left)
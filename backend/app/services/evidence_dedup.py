@@ -0,0 +1,27 @@
+"""PROVENIQ Core - Evidence Deduplication Stats
+
+Counters for content-addressed evidence deduplication: how often a
+presigned upload was skipped because the org already stores an object
+with the same verified SHA-256, and how many bytes that saved.
+"""
+
+
+class DedupStats:
+    def __init__(self):
+        self.lookups = 0
+        self.hits = 0
+        self.bytes_saved = 0
+
+    def record(self, hit: bool, size_bytes: int = 0) -> None:
+        self.lookups += 1
+        if hit:
+            self.hits += 1
+            self.bytes_saved += size_bytes
+
+    def stats(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
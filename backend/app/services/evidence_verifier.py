@@ -0,0 +1,188 @@
+"""PROVENIQ Core - Evidence Hash Verification
+
+Verifies the SHA-256 of confirmed inspection evidence server-side. Each
+object is streamed from storage and hashed in fixed-size chunks, so
+memory per verification stays at one chunk regardless of file size.
+Verifications run in parallel on a dedicated thread pool; hashlib
+releases the GIL while hashing, so threads scale across cores.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.services.storage import ObjectNotFound, StorageBackend
+
+
+class VerificationStatus(str, Enum):
+    PENDING = "pending"
+    VERIFIED = "verified"
+    MISMATCHED = "mismatched"
+    MISSING = "missing"
+    ERROR = "error"
+
+
+class VerificationJob(BaseModel):
+    evidence_id: UUID
+    object_path: str
+    expected_hash: Optional[str] = None
+
+
+class VerificationResult(BaseModel):
+    evidence_id: UUID
+    status: VerificationStatus
+    computed_hash: Optional[str] = None
+    size_bytes: int = 0
+    duration_ms: float = 0.0
+    verified_at: datetime
+    error: Optional[str] = None
+
+
+def hash_chunks(chunks) -> tuple[str, int]:
+    """SHA-256 hex digest and byte count of an iterable of byte chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class EvidenceVerifier:
+    """
+    Background pool that hashes evidence objects and reports the outcome.
+
+    `submit()` enqueues a job without blocking the request; `on_result` is
+    awaited with each VerificationResult (e.g. to persist the status). The
+    queue is bounded: when it is full, jobs are deferred and stay pending
+    until they are resubmitted.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(
+        self,
+        storage: Callable[[], StorageBackend],
+        on_result: Callable[[VerificationResult], Awaitable[None]],
+        workers: int = 8,
+        chunk_size: int = 1024 * 1024,
+        max_queue: int = 10_000,
+    ):
+        self._storage = storage
+        self._on_result = on_result
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._queue: asyncio.Queue[VerificationJob] = asyncio.Queue(maxsize=max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="evidence-verify")
+        self._tasks: list[asyncio.Task] = []
+        self.counts = {status.value: 0 for status in VerificationStatus if status != VerificationStatus.PENDING}
+        self.deferred = 0
+        self.bytes_total = 0
+        self.hash_seconds_total = 0.0
+        self._recent: deque[tuple[float, int]] = deque(maxlen=4096)
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._executor.shutdown(wait=False)
+
+    def capacity(self) -> int:
+        """Jobs that can be queued right now without being deferred."""
+        return self._queue.maxsize - self._queue.qsize()
+
+    def submit(self, job: VerificationJob) -> bool:
+        """Queue a verification; returns False if it was deferred."""
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            self.deferred += 1
+            return False
+
+    def _verify_sync(self, job: VerificationJob) -> VerificationResult:
+        start = time.perf_counter()
+        try:
+            computed, size = hash_chunks(self._storage().iter_chunks_sync(job.object_path, self.chunk_size))
+        except ObjectNotFound:
+            return VerificationResult(
+                evidence_id=job.evidence_id,
+                status=VerificationStatus.MISSING,
+                verified_at=datetime.utcnow(),
+                error="Object not found in storage",
+            )
+        duration = time.perf_counter() - start
+        if job.expected_hash is None or job.expected_hash.lower() == computed:
+            result_status = VerificationStatus.VERIFIED
+        else:
+            result_status = VerificationStatus.MISMATCHED
+        return VerificationResult(
+            evidence_id=job.evidence_id,
+            status=result_status,
+            computed_hash=computed,
+            size_bytes=size,
+            duration_ms=round(duration * 1000, 2),
+            verified_at=datetime.utcnow(),
+        )
+
+    async def verify(self, job: VerificationJob) -> VerificationResult:
+        """Hash one object on the pool and return the outcome."""
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, self._verify_sync, job)
+        except Exception as e:
+            result = VerificationResult(
+                evidence_id=job.evidence_id,
+                status=VerificationStatus.ERROR,
+                verified_at=datetime.utcnow(),
+                error=str(e),
+            )
+        self.counts[result.status.value] += 1
+        if result.size_bytes:
+            self.bytes_total += result.size_bytes
+            self.hash_seconds_total += result.duration_ms / 1000
+            self._recent.append((time.monotonic(), result.size_bytes))
+        return result
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                result = await self.verify(job)
+                await self._on_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[EvidenceVerifier] Failed to record result for {job.evidence_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        recent_bytes = sum(n for ts, n in self._recent if now - ts <= self.WINDOW_SECONDS)
+        return {
+            **self.counts,
+            "queued": self._queue.qsize(),
+            "deferred": self.deferred,
+            "workers": self.workers,
+            "bytes_total": self.bytes_total,
+            # Aggregate rate over the last minute, across all workers
+            "bytes_per_second": round(recent_bytes / self.WINDOW_SECONDS),
+            # Rate of a single verification while it is hashing
+            "per_worker_bytes_per_second": (
+                round(self.bytes_total / self.hash_seconds_total) if self.hash_seconds_total else None
+            ),
+        }
@@ -12,6 +12,8 @@ from typing import Optional
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field
 
+from app.services import deadline
+
 
 class FraudRiskLevel(str, Enum):
     LOW = "low"           # 0-30 score
@@ -266,6 +268,7 @@ class FraudScorer:
         
         This is the primary scoring endpoint used by all PROVENIQ apps.
         """
+        deadline.check("fraud scoring")
         score_id = uuid4()
         signals = []
         
@@ -308,6 +311,7 @@ class FraudScorer:
         
         # Write to Ledger if available
         if self.ledger_client:
+            deadline.check("fraud score ledger write")
             await self.ledger_client.write_event(
                 source="core",
                 event_type="FRAUD_SCORE_COMPUTED",
@@ -0,0 +1,106 @@
+"""PROVENIQ Core - Inspection Content Hashing
+
+Canonical JSON and content hashes for inspection items. The hash scheme
+is versioned so stored hashes keep verifying as the scheme evolves:
+
+    sha256-json-v1    SHA-256 of the canonical JSON of the whole item list
+                      (the original scheme, byte-for-byte unchanged)
+    merkle-sha256-v2  Merkle root over items keyed by room/item/ordinal,
+                      which supports per-item inclusion proofs
+"""
+
+import hashlib
+import json
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class HashScheme(str, Enum):
+    V1 = "sha256-json-v1"
+    V2 = "merkle-sha256-v2"
+
+
+class InvalidItemKey(ValueError):
+    """Raised for an item without a usable room_key/item_key/ordinal."""
+
+
+class DuplicateItemKey(ValueError):
+    """Raised when two items share a room_key/item_key/ordinal."""
+
+
+ItemKey = tuple[str, str, int]
+
+
+def _clean(obj: Any) -> Any:
+    # Sort keys and drop nulls/None
+    if isinstance(obj, dict):
+        return {k: _clean(v) for k, v in sorted(obj.items()) if v is not None}
+    if isinstance(obj, list):
+        return [_clean(x) for x in obj]
+    return obj
+
+
+def canonicalize(obj: Any) -> str:
+    return json.dumps(_clean(obj), separators=(",", ":"), sort_keys=True)
+
+
+def canonicalize_inspection(items: list[dict]) -> str:
+    return canonicalize(items)
+
+
+def compute_content_hash(items: list[dict]) -> str:
+    """The v1 content hash."""
+    canonical = canonicalize_inspection(items)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def content_hash_from_canonical(canonical_items: list[str]) -> str:
+    """
+    The v1 content hash from already-canonicalized items.
+
+    A canonical list is its canonical items joined by "," inside "[...]",
+    so this equals `compute_content_hash(items)` without redoing the JSON.
+    """
+    canonical = "[" + ",".join(canonical_items) + "]"
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SubmittedItem(BaseModel):
+    """Stored fields of a submitted item; other keys are hashed but not stored."""
+    model_config = ConfigDict(extra="allow")
+
+    room_key: str = Field(min_length=1, max_length=100)
+    item_key: str = Field(min_length=1, max_length=100)
+    ordinal: Optional[int] = 0
+    notes: Optional[str] = None
+    condition_rating: Optional[int] = None
+    is_damaged: Optional[bool] = False
+    damage_description: Optional[str] = None
+
+
+STORED_ITEM_FIELDS = ("notes", "condition_rating", "is_damaged", "damage_description")
+
+
+def stored_item_fields(item: dict) -> dict[str, Any]:
+    """Column values stored for a submitted item; raises pydantic's ValidationError."""
+    fields = SubmittedItem.model_validate(item)
+    return {
+        "notes": fields.notes,
+        "condition_rating": fields.condition_rating,
+        "is_damaged": bool(fields.is_damaged),
+        "damage_description": fields.damage_description,
+    }
+
+
+def item_key(item: dict) -> ItemKey:
+    room_key, key, ordinal = item.get("room_key"), item.get("item_key"), item.get("ordinal", 0)
+    if not isinstance(room_key, str) or not room_key or not isinstance(key, str) or not key:
+        raise InvalidItemKey("Each item needs a room_key and item_key")
+    if ordinal is None:
+        ordinal = 0
+    if not isinstance(ordinal, int) or isinstance(ordinal, bool):
+        raise InvalidItemKey("Item ordinal must be an integer")
+    return room_key, key, ordinal
+
@@ -0,0 +1,264 @@
+"""PROVENIQ Core - Service Health Prober
+
+Runs a single background probing loop over the PROVENIQ services and
+pushes health transitions and latency updates to any number of subscribers.
+Dashboards subscribe once instead of polling the gateway, so upstream
+probe load stays constant no matter how many clients are watching.
+Services may list several replica URLs; each replica is probed separately.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Optional, Union
+
+import httpx
+from pydantic import BaseModel
+
+ServiceTargets = dict[str, Union[str, list[str]]]
+
+
+class HealthUpdate(BaseModel):
+    """A single probe observation for one service."""
+    service: str
+    status: str  # "healthy", "unhealthy", "unavailable"
+    url: str
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    previous_status: Optional[str] = None
+    changed: bool = False
+    observed_at: datetime
+
+
+def health_url(base_url: str) -> str:
+    """Derive the service health URL from its API base URL."""
+    root = base_url.rstrip("/")
+    for suffix in ("/api/v1", "/api"):
+        if root.endswith(suffix):
+            root = root[: -len(suffix)]
+            break
+    return f"{root}/health"
+
+
+async def probe_service(
+    client: httpx.AsyncClient,
+    service: str,
+    base_url: str,
+    timeout: Optional[float] = None,
+) -> HealthUpdate:
+    """Probe one service and return its observed health; `timeout` overrides the client's."""
+    try:
+        start = time.perf_counter()
+        if timeout is None:
+            response = await client.get(health_url(base_url))
+        else:
+            response = await client.get(health_url(base_url), timeout=timeout)
+        latency = (time.perf_counter() - start) * 1000
+
+        if response.status_code == 200:
+            return HealthUpdate(
+                service=service,
+                status="healthy",
+                url=base_url,
+                latency_ms=round(latency, 2),
+                observed_at=datetime.utcnow(),
+            )
+        return HealthUpdate(
+            service=service,
+            status="unhealthy",
+            url=base_url,
+            error=f"HTTP {response.status_code}",
+            observed_at=datetime.utcnow(),
+        )
+    except Exception as e:
+        return HealthUpdate(
+            service=service,
+            status="unavailable",
+            url=base_url,
+            error=str(e),
+            observed_at=datetime.utcnow(),
+        )
+
+
+class HealthSubscription:
+    """
+    A subscriber's bounded view of the health stream.
+
+    If the subscriber falls behind and its buffer fills up, the prober
+    drops it rather than blocking or buffering without bound.
+    """
+
+    def __init__(self, max_buffer: int):
+        self.queue: asyncio.Queue[Optional[HealthUpdate]] = asyncio.Queue(maxsize=max_buffer)
+        self.dropped = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[HealthUpdate]:
+        """
+        Wait for the next update.
+
+        Returns None once the subscription has been dropped. Raises
+        asyncio.TimeoutError if nothing arrives within `timeout`.
+        """
+        if self.dropped and self.queue.empty():
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class HealthProber:
+    """
+    Shared health prober for PROVENIQ services.
+
+    The probing loop starts with the first subscriber and stops when the
+    last one leaves, unless `start()` keeps it running for listeners such
+    as the service registry. Each subscriber gets the current snapshot on
+    subscribe, then every subsequent observation.
+    """
+
+    def __init__(
+        self,
+        services: Union[ServiceTargets, Callable[[], ServiceTargets]],
+        interval_seconds: float = 5.0,
+        timeout_seconds: float = 5.0,
+        max_buffer: int = 100,
+    ):
+        self._services = services
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_buffer = max_buffer
+
+        self._snapshot: dict[tuple[str, str], HealthUpdate] = {}
+        self._subscribers: set[HealthSubscription] = set()
+        self._listeners: list[Callable[[HealthUpdate], None]] = []
+        self._pinned = False
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._last_round_at: Optional[float] = None
+
+    def _get_targets(self) -> list[tuple[str, str]]:
+        services = self._services() if callable(self._services) else self._services
+        return [
+            (service, url)
+            for service, urls in services.items()
+            for url in ([urls] if isinstance(urls, str) else urls)
+        ]
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds)
+        return self._client
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def snapshot(self, max_age_seconds: Optional[float] = None) -> Optional[list[HealthUpdate]]:
+        """
+        Return the latest observation for every service.
+
+        Returns None if the loop is not running or the last completed
+        round is older than `max_age_seconds`.
+        """
+        if not self.running or self._last_round_at is None:
+            return None
+        if max_age_seconds is not None and time.monotonic() - self._last_round_at > max_age_seconds:
+            return None
+        return list(self._snapshot.values())
+
+    def add_listener(self, listener: Callable[[HealthUpdate], None]) -> None:
+        """Call `listener` synchronously with every observation."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Keep the probing loop running even with no subscribers."""
+        self._pinned = True
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def subscribe(self) -> HealthSubscription:
+        """Register a subscriber and start the probing loop if needed."""
+        subscription = HealthSubscription(self.max_buffer)
+        for update in list(self._snapshot.values())[: self.max_buffer]:
+            subscription.queue.put_nowait(update)
+        self._subscribers.add(subscription)
+
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: HealthSubscription) -> None:
+        """Remove a subscriber and stop the probing loop if it was the last."""
+        self._subscribers.discard(subscription)
+        if not self._subscribers and not self._pinned and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _drop(self, subscription: HealthSubscription) -> None:
+        """Disconnect a subscriber whose buffer is full."""
+        subscription.dropped = True
+        self._subscribers.discard(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def _publish(self, update: HealthUpdate) -> None:
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(update)
+            except asyncio.QueueFull:
+                print(f"[HealthProber] Dropping slow subscriber ({self.max_buffer} updates behind)")
+                self._drop(subscription)
+
+    def _record(self, update: HealthUpdate) -> None:
+        key = (update.service, update.url)
+        previous = self._snapshot.get(key)
+        if previous is not None:
+            update.previous_status = previous.status
+            update.changed = previous.status != update.status
+        else:
+            update.changed = True
+        self._snapshot[key] = update
+        for listener in self._listeners:
+            listener(update)
+        self._publish(update)
+
+    async def probe_all(self) -> list[HealthUpdate]:
+        """Probe every service replica concurrently."""
+        client = self._get_client()
+        return await asyncio.gather(*(
+            probe_service(client, service, base_url)
+            for service, base_url in self._get_targets()
+        ))
+
+    async def _run(self) -> None:
+        try:
+            while self._subscribers or self._pinned:
+                updates = await self.probe_all()
+                for update in updates:
+                    self._record(update)
+                # Forget replicas that were removed from the target list
+                current = {(update.service, update.url) for update in updates}
+                for key in [key for key in self._snapshot if key not in current]:
+                    del self._snapshot[key]
+                self._last_round_at = time.monotonic()
+                await asyncio.sleep(self.interval_seconds)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def close(self) -> None:
+        """Stop probing, disconnect subscribers and close the HTTP client."""
+        self._pinned = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for subscription in list(self._subscribers):
+            self._drop(subscription)
+        if self._client:
+            await self._client.aclose()
+            self._client = None
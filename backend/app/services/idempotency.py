@@ -0,0 +1,83 @@
+"""PROVENIQ Core - Idempotency Store
+
+Remembers completed gateway POST responses by client `Idempotency-Key`,
+so retries are answered locally instead of creating duplicate quotes,
+shipments or claims downstream. Concurrent duplicates of a request still
+in flight wait for the first one rather than calling upstream again.
+"""
+
+import hashlib
+import json
+from typing import Any, Awaitable, Callable
+
+from app.services.cache import SingleFlight, TTLCache
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an Idempotency-Key is reused with a different request body."""
+
+
+def request_fingerprint(payload: Any) -> str:
+    """SHA-256 of the canonical JSON form of a request payload."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Bounded TTL store of responses keyed by idempotency key.
+
+    Only successful results are stored; a failed call leaves the key free
+    so the client can retry it.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 24 * 3600):
+        self._responses: TTLCache[str, tuple[str, Any]] = TTLCache(maxsize, ttl_seconds)
+        self._fingerprints: dict[str, str] = {}
+        self._flights: SingleFlight[str] = SingleFlight()
+        self.replays = 0
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        fn: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, bool]:
+        """
+        Execute `fn` at most once per key.
+
+        Returns `(result, replayed)`; `replayed` is True when the result
+        came from the store or from a duplicate already in flight.
+        """
+        stored = self._responses.get(key)
+        if stored is not None:
+            stored_fingerprint, result = stored
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyKeyReusedError(key)
+            self.replays += 1
+            return result, True
+
+        in_flight_fingerprint = self._fingerprints.get(key)
+        if in_flight_fingerprint is not None and in_flight_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError(key)
+
+        async def execute() -> Any:
+            self._fingerprints[key] = fingerprint
+            try:
+                result = await fn()
+            finally:
+                self._fingerprints.pop(key, None)
+            self._responses.set(key, (fingerprint, result))
+            return result
+
+        result, shared = await self._flights.do(key, execute)
+        if shared:
+            self.replays += 1
+        return result, shared
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._responses.stats(),
+            "replays": self.replays,
+            "coalesced": self._flights.coalesced,
+        }
@@ -0,0 +1,196 @@
+"""PROVENIQ Core - Inspection Integrity Checks
+
+Recomputes an inspection's hashes from its stored items, checks the
+items' columns against their stored JSON, and cross-checks its evidence
+hashes. `check_inspections` is a pure, top-level function
+over plain dicts so batches can be checked in worker processes.
+
+A batch entry looks like:
+
+    {
+        "id", "content_hash", "hash_scheme", "merkle_root",
+        "items": [{"room_key", "item_key", "ordinal", "position",
+                   "canonical_json", "leaf_hash", "notes", "condition_rating",
+                   "is_damaged", "damage_description"}],
+        "evidence": [{"id", "file_hash", "verification_status", "original_hash"}],
+    }
+"""
+
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.services.hashing import (
+    STORED_ITEM_FIELDS,
+    HashScheme,
+    canonicalize,
+    content_hash_from_canonical,
+    item_key,
+    stored_item_fields,
+)
+from app.services.merkle import MerkleTree, leaf_hash_canonical
+
+# Evidence verification outcomes that indicate a problem
+BAD_EVIDENCE_STATUSES = {"mismatched", "missing", "error"}
+
+
+def _finding(kind: str, inspection_id: str, detail: str, **extra) -> dict:
+    return {"kind": kind, "inspection_id": inspection_id, "detail": detail, **extra}
+
+
+def _check_columns(item: dict, parsed: dict) -> list[str]:
+    """Names of the item's key and field columns that differ from its stored JSON."""
+    try:
+        expected_key = item_key(parsed)
+        expected = stored_item_fields(parsed)
+    except ValueError:  # InvalidItemKey, pydantic's ValidationError
+        return ["canonical_json"]
+    differing = [
+        name for name, value in zip(("room_key", "item_key", "ordinal"), expected_key) if item[name] != value
+    ]
+    differing += [name for name in STORED_ITEM_FIELDS if item[name] != expected[name]]
+    return differing
+
+
+def _check_items(inspection: dict, findings: list[dict]) -> None:
+    inspection_id = inspection["id"]
+    items = inspection["items"]
+    if not items:
+        # Inspections submitted before items were stored have no rows to rehash.
+        # Only an inspection genuinely submitted empty hashes to the empty list.
+        if inspection["hash_scheme"] == HashScheme.V2.value:
+            empty = MerkleTree().root()
+        else:
+            empty = content_hash_from_canonical([])
+        if inspection["content_hash"] != empty:
+            findings.append(_finding("unverifiable", inspection_id, "No stored items; submitted before items were kept"))
+        return
+    if any(item["canonical_json"] is None for item in items):
+        # Items stored before canonical JSON was kept can't be rehashed
+        findings.append(_finding("unverifiable", inspection_id, "Items lack stored canonical JSON"))
+        return
+
+    leaves = {}
+    for item in items:
+        key = (item["room_key"], item["item_key"], item["ordinal"])
+        label = f"{key[0]}/{key[1]}/{key[2]}"
+        canonical = item["canonical_json"]
+        try:
+            parsed = json.loads(canonical)
+        except ValueError:
+            findings.append(_finding("item_corrupt", inspection_id, "Stored item JSON does not parse", item=label))
+        else:
+            if canonicalize(parsed) != canonical:
+                findings.append(_finding("item_not_canonical", inspection_id, "Stored item JSON is not canonical", item=label))
+            # The hashes only cover the JSON; the columns are what the app reads
+            differing = _check_columns(item, parsed) if isinstance(parsed, dict) else ["canonical_json"]
+            if differing:
+                findings.append(_finding(
+                    "item_column_mismatch", inspection_id, "Stored item columns differ from the hashed JSON",
+                    item=label, columns=differing,
+                ))
+        digest = leaf_hash_canonical(canonical)
+        if item["leaf_hash"] != digest.hex():
+            findings.append(_finding("item_leaf_mismatch", inspection_id, "Stored leaf hash differs from item JSON", item=label))
+        leaves[key] = digest
+
+    merkle_root = MerkleTree(leaves).root()
+    if inspection["merkle_root"] and inspection["merkle_root"] != merkle_root:
+        findings.append(_finding("merkle_root_mismatch", inspection_id, "Merkle root differs from stored items"))
+
+    if inspection["hash_scheme"] == HashScheme.V2.value:
+        recomputed = merkle_root
+    elif any(item["position"] is None for item in items):
+        findings.append(_finding("unverifiable", inspection_id, "Item submission order unknown; v1 hash can't be recomputed"))
+        return
+    else:
+        # v1 hashes the list in submission order
+        ordered = sorted(items, key=lambda item: item["position"])
+        recomputed = content_hash_from_canonical([item["canonical_json"] for item in ordered])
+    if recomputed != inspection["content_hash"]:
+        findings.append(_finding("content_hash_mismatch", inspection_id, "content_hash differs from stored items"))
+
+
+def _check_evidence(inspection: dict, findings: list[dict]) -> None:
+    for ev in inspection["evidence"]:
+        if ev["verification_status"] in BAD_EVIDENCE_STATUSES:
+            findings.append(_finding(
+                f"evidence_{ev['verification_status']}", inspection["id"],
+                "Evidence failed server-side hash verification", evidence_id=ev["id"],
+            ))
+        if ev["original_hash"] is not None and ev["original_hash"] != ev["file_hash"]:
+            findings.append(_finding(
+                "evidence_dedup_mismatch", inspection["id"],
+                "Deduplicated evidence hash differs from its original", evidence_id=ev["id"],
+            ))
+
+
+def check_inspection(inspection: dict) -> dict:
+    """Recompute one inspection's hashes; returns counts and findings."""
+    findings: list[dict] = []
+    _check_items(inspection, findings)
+    _check_evidence(inspection, findings)
+    return {
+        "inspection_id": inspection["id"],
+        "items": len(inspection["items"]),
+        "evidence": len(inspection["evidence"]),
+        "findings": findings,
+    }
+
+
+def check_inspections(batch: list[dict]) -> list[dict]:
+    return [check_inspection(inspection) for inspection in batch]
+
+
+class IntegrityChecker:
+    """Runs `check_inspections` batches on a process pool."""
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.batches = 0
+        self.rows = 0
+        self.findings = 0
+        self.check_seconds_total = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process with a running event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def check(self, batch: list[dict]) -> list[dict]:
+        """Check a batch, split across the pool's workers."""
+        if not batch:
+            return []
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        size = -(-len(batch) // self.max_workers)
+        chunks = [batch[i:i + size] for i in range(0, len(batch), size)]
+        checked = await asyncio.gather(*(loop.run_in_executor(self.executor, check_inspections, c) for c in chunks))
+        results = [r for chunk in checked for r in chunk]
+        self.batches += 1
+        self.rows += sum(1 + r["items"] + r["evidence"] for r in results)
+        self.findings += sum(len(r["findings"]) for r in results)
+        self.check_seconds_total += time.perf_counter() - start
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "findings": self.findings,
+            "rows_per_second": round(self.rows / self.check_seconds_total, 1) if self.check_seconds_total else None,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
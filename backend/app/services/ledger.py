@@ -11,6 +11,8 @@ from uuid import uuid4
 
 import httpx
 
+from app.services import deadline
+
 
 class LedgerClient:
     """
@@ -51,7 +53,10 @@ class LedgerClient:
         Write an event to the Ledger.
         
         Returns the Ledger receipt with event_id and entry_hash.
+        Raises DeadlineExceeded instead of writing once the request
+        deadline has passed.
         """
+        request_timeout = deadline.timeout(30.0, "ledger write")
         client = self._get_client()
         
         # Add canonical hash to payload
@@ -76,7 +81,7 @@ class LedgerClient:
             event_body["correlation_id"] = correlation_id
         
         try:
-            response = await client.post(f"{self.base_url}/events", json=event_body)
+            response = await client.post(f"{self.base_url}/events", json=event_body, timeout=request_timeout)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
@@ -90,12 +95,14 @@ class LedgerClient:
     
     async def get_asset_events(self, asset_id: str, limit: int = 100) -> list[dict]:
         """Get all events for an asset."""
+        request_timeout = deadline.timeout(30.0, "ledger read")
         client = self._get_client()
         
         try:
             response = await client.get(
                 f"{self.base_url}/assets/{asset_id}/events",
-                params={"limit": limit}
+                params={"limit": limit},
+                timeout=request_timeout,
             )
             response.raise_for_status()
             data = response.json()
@@ -106,12 +113,14 @@ class LedgerClient:
     
     async def get_anchor_events(self, anchor_id: str, limit: int = 100) -> list[dict]:
         """Get all events for an anchor."""
+        request_timeout = deadline.timeout(30.0, "ledger read")
         client = self._get_client()
         
         try:
             response = await client.get(
                 f"{self.base_url}/anchors/{anchor_id}/events",
-                params={"limit": limit}
+                params={"limit": limit},
+                timeout=request_timeout,
             )
             response.raise_for_status()
             data = response.json()
@@ -122,12 +131,14 @@ class LedgerClient:
     
     async def verify_integrity(self, from_seq: int = 1, limit: int = 10000) -> dict:
         """Verify Ledger integrity."""
+        request_timeout = deadline.timeout(30.0, "ledger integrity check")
         client = self._get_client()
         
         try:
             response = await client.get(
                 f"{self.base_url}/integrity/verify",
-                params={"from": from_seq, "limit": limit}
+                params={"from": from_seq, "limit": limit},
+                timeout=request_timeout,
             )
             response.raise_for_status()
             return response.json()
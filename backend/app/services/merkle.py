@@ -0,0 +1,135 @@
+"""PROVENIQ Core - Inspection Merkle Trees
+
+Merkle tree over inspection items, keyed by (room_key, item_key, ordinal)
+and ordered by key. Hashing follows RFC 6962 (Certificate Transparency)
+with domain separation between leaves and interior nodes:
+
+    leaf  = SHA-256(0x00 || canonical item JSON)
+    node  = SHA-256(0x01 || left || right)
+    empty = SHA-256("")
+
+The left subtree of a node over n leaves holds the largest power of two
+smaller than n. Interior hashes are memoized per leaf range, so the root
+and every proof share one pass over the tree.
+"""
+
+import hashlib
+from typing import Iterable, Optional
+
+from pydantic import BaseModel
+
+from app.services.hashing import ItemKey
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash_canonical(canonical: str) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + canonical.encode("utf-8")).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _split(n: int) -> int:
+    """Largest power of two strictly less than n (n > 1)."""
+    k = 1
+    while k * 2 < n:
+        k *= 2
+    return k
+
+
+class ProofStep(BaseModel):
+    side: str  # "left" | "right": where the sibling sits
+    hash: str
+
+
+class MerkleTree:
+    """
+    Merkle tree over keyed leaves.
+
+    Persist it with `to_json()` and restore with `from_json()` to serve
+    proofs without rehashing the items.
+    """
+
+    def __init__(self, leaves: Optional[dict[ItemKey, bytes]] = None):
+        self._leaves: dict[ItemKey, bytes] = dict(leaves or {})
+        self._keys: list[ItemKey] = sorted(self._leaves)
+        self._index: dict[ItemKey, int] = {k: i for i, k in enumerate(self._keys)}
+        self._nodes: dict[tuple[int, int], bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._leaves)
+
+    def __contains__(self, key: ItemKey) -> bool:
+        return key in self._leaves
+
+    def keys(self) -> list[ItemKey]:
+        return list(self._keys)
+
+    def leaf(self, key: ItemKey) -> bytes:
+        return self._leaves[key]
+
+    # -------------------------------------------------------------------------
+    # Hashes and proofs
+    # -------------------------------------------------------------------------
+
+    def _hash(self, lo: int, hi: int) -> bytes:
+        if hi - lo == 1:
+            return self._leaves[self._keys[lo]]
+        cached = self._nodes.get((lo, hi))
+        if cached is None:
+            k = _split(hi - lo)
+            cached = node_hash(self._hash(lo, lo + k), self._hash(lo + k, hi))
+            self._nodes[(lo, hi)] = cached
+        return cached
+
+    def root(self) -> str:
+        if not self._keys:
+            return hashlib.sha256(b"").hexdigest()
+        return self._hash(0, len(self._keys)).hex()
+
+    def index_of(self, key: ItemKey) -> int:
+        return self._index[key]
+
+    def proof(self, key: ItemKey) -> list[ProofStep]:
+        """Audit path from the leaf to the root, leaf end first."""
+        index = self._index[key]
+        steps: list[ProofStep] = []
+        lo, hi = 0, len(self._keys)
+        while hi - lo > 1:
+            k = _split(hi - lo)
+            if index < lo + k:
+                steps.append(ProofStep(side="right", hash=self._hash(lo + k, hi).hex()))
+                hi = lo + k
+            else:
+                steps.append(ProofStep(side="left", hash=self._hash(lo, lo + k).hex()))
+                lo = lo + k
+        steps.reverse()
+        return steps
+
+    @staticmethod
+    def verify(leaf: bytes, proof: Iterable[ProofStep], root: str) -> bool:
+        digest = leaf
+        for step in proof:
+            sibling = bytes.fromhex(step.hash)
+            digest = node_hash(sibling, digest) if step.side == "left" else node_hash(digest, sibling)
+        return digest.hex() == root
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def to_json(self) -> list[dict]:
+        return [
+            {"room_key": k[0], "item_key": k[1], "ordinal": k[2], "leaf_hash": self._leaves[k].hex()}
+            for k in self._keys
+        ]
+
+    @classmethod
+    def from_json(cls, leaves: Optional[list[dict]]) -> "MerkleTree":
+        return cls({
+            (leaf["room_key"], leaf["item_key"], leaf["ordinal"]): bytes.fromhex(leaf["leaf_hash"])
+            for leaf in leaves or []
+        })
@@ -0,0 +1,47 @@
+"""PROVENIQ Core - Keyset Pagination
+
+Opaque cursors for keyset ("seek") pagination over (created_at, id).
+Pages are fetched with `WHERE (created_at, id) > (:created_at, :id)
+ORDER BY created_at, id LIMIT n`, which stays index-backed and constant
+cost at any depth, unlike OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that wasn't produced by `encode_cursor`."""
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def next_cursor(rows: list, limit: int, created_at_attr: str = "created_at", id_attr: str = "id") -> Optional[str]:
+    """
+    Cursor for the page after `rows`, which were fetched with `limit + 1`.
+
+    Trims the look-ahead row in place; returns None on the last page.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    last = rows[-1]
+    return encode_cursor(getattr(last, created_at_attr), getattr(last, id_attr))
@@ -0,0 +1,107 @@
+"""PROVENIQ Core - Protect Quote Cache
+
+Short-TTL cache of Protect insurance quotes keyed on a canonical hash of
+the quote inputs. Identical concurrent misses share one upstream call,
+and every cached quote for an asset is dropped when its valuation changes.
+"""
+
+import hashlib
+import json
+from typing import Any, Awaitable, Callable
+
+from app.services.cache import SingleFlight, TTLCache
+
+
+class QuoteCache:
+    """
+    Cache of Protect quotes per (asset, quote inputs).
+
+    A per-asset generation counter guards against a fetch that started
+    before a valuation change storing its now-stale quote afterwards.
+    Generations are only kept while an asset has fetches in flight, and
+    the asset -> quote keys index is swept of expired quotes as it grows,
+    so neither outlives the cached quotes.
+    """
+
+    def __init__(self, maxsize: int = 5_000, ttl_seconds: float = 60.0):
+        self.maxsize = maxsize
+        self._quotes: TTLCache[str, Any] = TTLCache(maxsize, ttl_seconds)
+        self._flights: SingleFlight[str] = SingleFlight()
+        self._asset_keys: dict[str, set[str]] = {}
+        self._fetching: dict[str, int] = {}  # asset -> fetches in flight
+        self._generations: dict[str, int] = {}  # only for assets in _fetching
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(inputs: dict) -> str:
+        """SHA-256 of the canonical JSON form of the quote inputs."""
+        canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    async def get_or_fetch(
+        self,
+        asset_id: str,
+        inputs: dict,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, bool]:
+        """
+        Return a cached quote or fetch one.
+
+        Returns `(quote, hit)`; `hit` is False only for the caller that
+        actually went upstream.
+        """
+        key = self.make_key(inputs)
+        quote = self._quotes.get(key)
+        if quote is not None:
+            return quote, True
+
+        async def fetch_and_store() -> Any:
+            self._fetching[asset_id] = self._fetching.get(asset_id, 0) + 1
+            generation = self._generations.get(asset_id, 0)
+            try:
+                result = await fetch()
+                if self._generations.get(asset_id, 0) == generation:
+                    self._store(asset_id, key, result)
+                return result
+            finally:
+                self._fetching[asset_id] -= 1
+                if not self._fetching[asset_id]:
+                    del self._fetching[asset_id]
+                    self._generations.pop(asset_id, None)
+
+        quote, shared = await self._flights.do(key, fetch_and_store)
+        return quote, shared
+
+    def _store(self, asset_id: str, key: str, quote: Any) -> None:
+        self._quotes.set(key, quote)
+        keys = self._asset_keys.setdefault(asset_id, set())
+        keys.add(key)
+        # Drop index entries for quotes that expired or were evicted
+        if len(keys) > 16:
+            keys.intersection_update(k for k in keys if k in self._quotes)
+        if len(self._asset_keys) > 2 * self.maxsize:
+            self._sweep_asset_keys()
+
+    def _sweep_asset_keys(self) -> None:
+        # At most `maxsize` quotes are live, so at most `maxsize` assets
+        # survive; sweeping at twice that keeps the cost amortized O(1)
+        for asset_id, keys in list(self._asset_keys.items()):
+            keys.intersection_update(k for k in keys if k in self._quotes)
+            if not keys:
+                del self._asset_keys[asset_id]
+
+    def invalidate_asset(self, asset_id) -> None:
+        """Drop every cached quote for an asset (e.g. after a revaluation)."""
+        asset_id = str(asset_id)
+        if asset_id in self._fetching:
+            self._generations[asset_id] = self._generations.get(asset_id, 0) + 1
+        for key in self._asset_keys.pop(asset_id, ()):
+            self._quotes.pop(key)
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._quotes.stats(),
+            "coalesced": self._flights.coalesced,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,312 @@
+"""PROVENIQ Core - Service Registry
+
+Configurable registry of upstream PROVENIQ service replicas used by the
+API gateway. Picks an endpoint per call by least outstanding requests or
+by an exponentially-weighted latency average, and takes replicas out of
+rotation when the health prober (or a failed call) reports them unhealthy.
+
+Configuration is a JSON file mapping service name to endpoints:
+
+    {
+        "protect": ["http://protect-a:3003/api", "http://protect-b:3003/api"],
+        "ledger": {"endpoints": ["http://ledger:8006/api/v1"], "strategy": "ewma"}
+    }
+
+Services missing from the file fall back to the built-in defaults. The
+file is re-read when it changes on disk, or on demand via `reload()`.
+"""
+
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Optional, Union
+
+import httpx
+from pydantic import BaseModel
+
+
+class BalancingStrategy(str, Enum):
+    LEAST_OUTSTANDING = "least_outstanding"
+    EWMA = "ewma"
+
+
+class UnknownServiceError(KeyError):
+    """Raised when a service is not present in the registry."""
+
+
+class InvalidRegistryConfig(ValueError):
+    """Raised when the registry config can't be read or doesn't validate."""
+
+
+class ServiceEndpoint:
+    """One replica of an upstream service, with live balancing stats."""
+
+    def __init__(self, service: str, url: str):
+        self.service = service
+        self.url = url.rstrip("/")
+        self.healthy = True
+        self.outstanding = 0
+        self.ewma_ms: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        return self.healthy and time.monotonic() >= self.ejected_until
+
+    def observe_latency(self, latency_ms: float, alpha: float) -> None:
+        if self.ewma_ms is None:
+            self.ewma_ms = latency_ms
+        else:
+            self.ewma_ms = alpha * latency_ms + (1 - alpha) * self.ewma_ms
+
+
+class EndpointStats(BaseModel):
+    service: str
+    url: str
+    available: bool
+    healthy: bool
+    outstanding: int
+    ewma_ms: Optional[float] = None
+    requests: int
+    failures: int
+    last_error: Optional[str] = None
+
+
+class ServiceRegistry:
+    """
+    Multi-replica registry with latency-aware endpoint selection.
+
+    `acquire()` is the only way calls should obtain an upstream URL: it
+    tracks outstanding requests, feeds call latency into the EWMA and
+    briefly ejects a replica after a transport failure.
+    """
+
+    def __init__(
+        self,
+        defaults: dict[str, Union[str, list[str]]],
+        config_path: Optional[str] = None,
+        strategy: BalancingStrategy = BalancingStrategy.LEAST_OUTSTANDING,
+        ewma_alpha: float = 0.3,
+        failure_ejection_seconds: float = 10.0,
+        reload_check_seconds: float = 5.0,
+    ):
+        self.defaults = defaults
+        self.config_path = config_path
+        self.default_strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self.failure_ejection_seconds = failure_ejection_seconds
+        self.reload_check_seconds = reload_check_seconds
+
+        self._endpoints: dict[str, list[ServiceEndpoint]] = {}
+        self._strategies: dict[str, BalancingStrategy] = {}
+        self._config_mtime: Optional[float] = None
+        self._last_reload_check = 0.0
+        self._try_reload()
+
+    # -------------------------------------------------------------------------
+    # Configuration
+    # -------------------------------------------------------------------------
+
+    def _load_config(self) -> dict:
+        if not self.config_path or not os.path.exists(self.config_path):
+            self._config_mtime = None
+            return {}
+        self._config_mtime = os.path.getmtime(self.config_path)
+        with open(self.config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _parse_spec(self, service: str, spec) -> tuple[list[str], BalancingStrategy]:
+        strategy = self.default_strategy
+        if isinstance(spec, dict):
+            try:
+                strategy = BalancingStrategy(spec.get("strategy", strategy))
+            except ValueError:
+                raise InvalidRegistryConfig(f"{service}: unknown strategy {spec.get('strategy')!r}")
+            spec = spec.get("endpoints", [])
+        urls = [spec] if isinstance(spec, str) else spec
+        if not isinstance(urls, list) or not all(isinstance(url, str) and url for url in urls):
+            raise InvalidRegistryConfig(f"{service}: endpoints must be a URL or a list of URLs")
+        return urls, strategy
+
+    def reload(self) -> None:
+        """
+        Rebuild the endpoint table from defaults and the config file.
+
+        The whole config is validated before anything is swapped in; on
+        InvalidRegistryConfig the current endpoints stay in place. Stats
+        for replicas that remain configured are carried over, so a reload
+        does not reset latency averages or in-flight counts.
+        """
+        try:
+            config = self._load_config()
+        except (OSError, ValueError) as e:
+            raise InvalidRegistryConfig(f"Can't read {self.config_path}: {e}") from e
+        if not isinstance(config, dict):
+            raise InvalidRegistryConfig("Config must be an object mapping service name to endpoints")
+
+        merged: dict[str, Union[str, list[str], dict]] = {**self.defaults, **config}
+        parsed = {service: self._parse_spec(service, spec) for service, spec in merged.items()}
+
+        endpoints: dict[str, list[ServiceEndpoint]] = {}
+        strategies: dict[str, BalancingStrategy] = {}
+        for service, (urls, strategy) in parsed.items():
+            if not urls:
+                continue
+
+            existing = {ep.url: ep for ep in self._endpoints.get(service, [])}
+            endpoints[service] = [
+                existing.get(url.rstrip("/")) or ServiceEndpoint(service, url)
+                for url in urls
+            ]
+            strategies[service] = strategy
+
+        self._endpoints = endpoints
+        self._strategies = strategies
+
+    def _maybe_reload(self) -> None:
+        """Reload if the config file changed; stat at most every few seconds."""
+        if not self.config_path:
+            return
+        now = time.monotonic()
+        if now - self._last_reload_check < self.reload_check_seconds:
+            return
+        self._last_reload_check = now
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            mtime = None
+        if mtime != self._config_mtime:
+            self._try_reload()
+
+    def _try_reload(self) -> None:
+        try:
+            self.reload()
+        except InvalidRegistryConfig as e:
+            print(f"[ServiceRegistry] Reload failed, keeping current endpoints: {e}")
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def __contains__(self, service: str) -> bool:
+        return service in self._endpoints
+
+    def services(self) -> list[str]:
+        return list(self._endpoints)
+
+    def endpoints(self, service: str) -> list[ServiceEndpoint]:
+        if service not in self._endpoints:
+            raise UnknownServiceError(service)
+        return self._endpoints[service]
+
+    def probe_targets(self) -> dict[str, list[str]]:
+        """All replica URLs per service, for the health prober."""
+        return {service: [ep.url for ep in eps] for service, eps in self._endpoints.items()}
+
+    def pick(self, service: str) -> ServiceEndpoint:
+        """
+        Choose a replica for the next call.
+
+        Unavailable replicas are skipped; if every replica is out of
+        rotation we still return one rather than failing closed.
+        """
+        self._maybe_reload()
+        candidates = self.endpoints(service)
+        available = [ep for ep in candidates if ep.available] or candidates
+
+        if self._strategies.get(service) == BalancingStrategy.EWMA:
+            # Unmeasured replicas score 0 so they get traffic and a sample;
+            # outstanding work inflates the expected latency.
+            return min(
+                available,
+                key=lambda ep: (ep.ewma_ms or 0.0) * (ep.outstanding + 1),
+            )
+        return min(available, key=lambda ep: (ep.outstanding, ep.ewma_ms or 0.0))
+
+    def begin(self, service: str) -> ServiceEndpoint:
+        """
+        Pick a replica and count a call against it.
+
+        Every `begin()` must be paired with `end()`; prefer `acquire()`
+        unless the call outlives the calling scope (e.g. a streamed body).
+        A streamed body may never be iterated, so don't rely on the body
+        alone to call `end()`.
+        """
+        endpoint = self.pick(service)
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        return endpoint
+
+    def end(self, endpoint: ServiceEndpoint, started_at: float, error: Optional[BaseException] = None) -> None:
+        """
+        Finish a call started with `begin()`.
+
+        `started_at` is a `time.perf_counter()` value. Connection failures
+        and upstream 5xx eject the replica for a short cooldown.
+        """
+        endpoint.outstanding -= 1
+        if error is None:
+            endpoint.observe_latency((time.perf_counter() - started_at) * 1000, self.ewma_alpha)
+        elif _is_replica_failure(error):
+            endpoint.failures += 1
+            endpoint.last_error = str(error)
+            endpoint.ejected_until = time.monotonic() + self.failure_ejection_seconds
+
+    @asynccontextmanager
+    async def acquire(self, service: str) -> AsyncIterator[str]:
+        """Pick a replica and yield its base URL for the duration of a call."""
+        endpoint = self.begin(service)
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            yield endpoint.url
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.end(endpoint, start, error)
+
+    # -------------------------------------------------------------------------
+    # Health
+    # -------------------------------------------------------------------------
+
+    def observe_health(self, update) -> None:
+        """HealthProber listener: move replicas in and out of rotation."""
+        for ep in self._endpoints.get(update.service, []):
+            if ep.url == update.url.rstrip("/"):
+                ep.healthy = update.status == "healthy"
+                if ep.healthy:
+                    ep.ejected_until = 0.0
+                    if update.latency_ms is not None:
+                        ep.observe_latency(update.latency_ms, self.ewma_alpha)
+                else:
+                    ep.last_error = update.error
+
+    def stats(self) -> list[EndpointStats]:
+        return [
+            EndpointStats(
+                service=ep.service,
+                url=ep.url,
+                available=ep.available,
+                healthy=ep.healthy,
+                outstanding=ep.outstanding,
+                ewma_ms=round(ep.ewma_ms, 2) if ep.ewma_ms is not None else None,
+                requests=ep.requests,
+                failures=ep.failures,
+                last_error=ep.last_error,
+            )
+            for eps in self._endpoints.values()
+            for ep in eps
+        ]
+
+
+def _is_replica_failure(exc: BaseException) -> bool:
+    """Connection-level errors and upstream 5xx count against a replica."""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
@@ -0,0 +1,489 @@
+"""PROVENIQ Core - Evidence Object Storage
+
+Storage backends for inspection evidence behind `StorageProvider`. Each
+backend holds one long-lived, pooled SDK client created at startup and
+runs the blocking SDK calls (URL signing, HEAD) on a bounded thread pool
+so they never stall the event loop.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, TypeVar
+from uuid import uuid4
+
+T = TypeVar("T")
+
+
+class StorageProvider(str, Enum):
+    GCS = "gcs"
+    S3 = "s3"
+    LOCAL = "local"
+
+
+class ObjectNotFound(Exception):
+    """Raised when reading an object that doesn't exist."""
+
+
+class InvalidUploadToken(Exception):
+    """Raised for a local storage token that is malformed, forged, expired or for another operation."""
+
+
+class ObjectTooLarge(Exception):
+    """Raised when an upload exceeds the allowed size."""
+
+
+class OperationStats:
+    """Latency and throughput of one storage operation."""
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, sample_size: int = 2048):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._recent: deque[tuple[float, float]] = deque(maxlen=sample_size)
+
+    def record(self, duration: float, error: bool = False) -> None:
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_seconds += duration
+        self.max_seconds = max(self.max_seconds, duration)
+        self._recent.append((time.monotonic(), duration))
+
+    def record_batch(self, n: int, duration: float) -> None:
+        """Record `n` operations that together took `duration` seconds."""
+        for _ in range(n):
+            self.record(duration / n)
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        recent = [d for ts, d in self._recent if now - ts <= self.WINDOW_SECONDS]
+        ordered = sorted(recent)
+
+        def percentile(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds / self.count * 1000, 2) if self.count else None,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "per_second": round(len(recent) / self.WINDOW_SECONDS, 2),
+        }
+
+
+class StorageBackend:
+    """
+    Base class for evidence storage backends.
+
+    Subclasses implement the synchronous `_presign_put_sync` and
+    `_head_sync`; the async wrappers run them on the backend's pool and
+    record metrics.
+    """
+
+    provider: StorageProvider
+
+    def __init__(self, max_workers: int = 16):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"storage-{self.provider.value}")
+        self.sign_stats = OperationStats()
+        self.head_stats = OperationStats()
+
+    async def run_blocking(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking SDK call on the storage thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _timed(self, stats: OperationStats, fn: Callable[..., T], *args: Any) -> T:
+        start = time.perf_counter()
+        try:
+            result = await self.run_blocking(fn, *args)
+        except Exception:
+            stats.record(time.perf_counter() - start, error=True)
+            raise
+        stats.record(time.perf_counter() - start)
+        return result
+
+    async def presign_put(self, object_path: str, mime_type: str, ttl_seconds: int) -> str:
+        """Signed URL the client can PUT the object to."""
+        return await self._timed(self.sign_stats, self._presign_put_sync, object_path, mime_type, ttl_seconds)
+
+    async def head(self, object_path: str) -> Optional[int]:
+        """Size of the stored object in bytes, or None if it doesn't exist."""
+        return await self._timed(self.head_stats, self._head_sync, object_path)
+
+    async def presign_get(self, object_path: str, ttl_seconds: int) -> str:
+        """Signed URL the client can download the object from."""
+        return await self._timed(self.sign_stats, self._presign_get_sync, object_path, ttl_seconds)
+
+    async def presign_put_many(self, objects: list[tuple[str, str]], ttl_seconds: int) -> list[str]:
+        """
+        Sign PUT URLs for many (object_path, mime_type) pairs.
+
+        Signing is CPU-bound, so the whole batch runs as one job on the pool
+        instead of one hop per URL.
+        """
+        if not objects:
+            return []
+
+        def sign_all() -> list[str]:
+            return [self._presign_put_sync(path, mime, ttl_seconds) for path, mime in objects]
+
+        start = time.perf_counter()
+        try:
+            urls = await self.run_blocking(sign_all)
+        except Exception:
+            self.sign_stats.record(time.perf_counter() - start, error=True)
+            raise
+        self.sign_stats.record_batch(len(objects), time.perf_counter() - start)
+        return urls
+
+    async def head_many(self, object_paths: list[str], concurrency: int) -> list[Optional[int] | Exception]:
+        """
+        HEAD many objects, at most `concurrency` at a time.
+
+        Results line up with `object_paths`; a failed check yields its
+        exception rather than failing the batch.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def head_one(path: str) -> Optional[int]:
+            async with semaphore:
+                return await self.head(path)
+
+        return await asyncio.gather(*(head_one(path) for path in object_paths), return_exceptions=True)
+
+    def _presign_put_sync(self, object_path: str, mime_type: str, ttl_seconds: int) -> str:
+        raise NotImplementedError
+
+    def _head_sync(self, object_path: str) -> Optional[int]:
+        raise NotImplementedError
+
+    def _presign_get_sync(self, object_path: str, ttl_seconds: int) -> str:
+        raise NotImplementedError
+
+    def iter_chunks_sync(self, object_path: str, chunk_size: int) -> Iterator[bytes]:
+        """
+        Stream an object's bytes in chunks of at most `chunk_size`.
+
+        Blocking; call from a worker thread. Raises ObjectNotFound if the
+        object doesn't exist.
+        """
+        raise NotImplementedError
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "provider": self.provider.value,
+            "max_workers": self.max_workers,
+            "sign": self.sign_stats.snapshot(),
+            "head": self.head_stats.snapshot(),
+        }
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class GCSStorage(StorageBackend):
+    provider = StorageProvider.GCS
+
+    def __init__(self, bucket_name: str, project_id: Optional[str] = None, max_workers: int = 16):
+        super().__init__(max_workers)
+        from google.cloud import storage as gcs_storage
+        self._client = gcs_storage.Client(project=project_id)
+        self._bucket = self._client.bucket(bucket_name)
+
+    def _presign_put_sync(self, object_path: str, mime_type: str, ttl_seconds: int) -> str:
+        return self._bucket.blob(object_path).generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=ttl_seconds),
+            method="PUT",
+            content_type=mime_type,
+        )
+
+    def _presign_get_sync(self, object_path: str, ttl_seconds: int) -> str:
+        return self._bucket.blob(object_path).generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=ttl_seconds),
+            method="GET",
+        )
+
+    def _head_sync(self, object_path: str) -> Optional[int]:
+        # One metadata GET instead of exists() + reload()
+        blob = self._bucket.get_blob(object_path)
+        return blob.size if blob is not None else None
+
+    def iter_chunks_sync(self, object_path: str, chunk_size: int) -> Iterator[bytes]:
+        from google.api_core.exceptions import NotFound
+        try:
+            with self._bucket.blob(object_path).open("rb", chunk_size=chunk_size) as reader:
+                while chunk := reader.read(chunk_size):
+                    yield chunk
+        except NotFound as e:
+            raise ObjectNotFound(object_path) from e
+
+
+class S3Storage(StorageBackend):
+    provider = StorageProvider.S3
+
+    def __init__(
+        self,
+        bucket_name: str,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        max_workers: int = 16,
+    ):
+        super().__init__(max_workers)
+        import boto3
+        from botocore.config import Config
+        # boto3 clients are thread-safe; size the pool to the worker count
+        self._client = boto3.client(
+            "s3",
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=Config(max_pool_connections=max_workers),
+        )
+        self._bucket_name = bucket_name
+
+    def _presign_put_sync(self, object_path: str, mime_type: str, ttl_seconds: int) -> str:
+        return self._client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self._bucket_name,
+                "Key": object_path,
+                "ContentType": mime_type,
+            },
+            ExpiresIn=ttl_seconds,
+        )
+
+    def _presign_get_sync(self, object_path: str, ttl_seconds: int) -> str:
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self._bucket_name, "Key": object_path},
+            ExpiresIn=ttl_seconds,
+        )
+
+    def _head_sync(self, object_path: str) -> Optional[int]:
+        try:
+            resp = self._client.head_object(Bucket=self._bucket_name, Key=object_path)
+        except Exception:
+            return None
+        return resp.get("ContentLength")
+
+    def iter_chunks_sync(self, object_path: str, chunk_size: int) -> Iterator[bytes]:
+        from botocore.exceptions import ClientError
+        try:
+            resp = self._client.get_object(Bucket=self._bucket_name, Key=object_path)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                raise ObjectNotFound(object_path) from e
+            raise
+        body = resp["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+
+class LocalStorage(StorageBackend):
+    """
+    Evidence stored on local disk, for on-prem deployments and load tests.
+
+    Objects live at `<root>/<h[0:2]>/<h[2:4]>/<h>`, where `h` is the
+    SHA-256 of the object path. That spreads millions of objects evenly
+    over 65,536 directories. Each object has a `.meta` JSON sidecar
+    recording its path, MIME type and size.
+
+    Presigned URLs point at Core's own endpoints and carry an HMAC-signed
+    token that names the operation, object, MIME type and expiry: PUT
+    tokens for uploads, GET tokens for downloads. The secret must be
+    shared by every worker, so it is required. Reads are memory-mapped,
+    and downloads are served from the file path so the server can use
+    sendfile.
+    """
+
+    provider = StorageProvider.LOCAL
+    UPLOAD_ROUTE = "/storage/local"
+    DOWNLOAD_ROUTE = "/storage/local/objects"
+
+    def __init__(self, root: str, base_url: str, secret: str, max_workers: int = 16):
+        if not secret:
+            # A per-process secret would reject tokens issued by other workers
+            raise ValueError("LOCAL_STORAGE_SECRET must be set for local storage")
+        super().__init__(max_workers)
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url.rstrip("/")
+        self._secret = secret.encode()
+
+    def path_for(self, object_path: str) -> Path:
+        digest = hashlib.sha256(object_path.encode()).hexdigest()
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    @staticmethod
+    def meta_path(path: Path) -> Path:
+        return path.with_name(path.name + ".meta")
+
+    # -------------------------------------------------------------------------
+    # Upload tokens
+    # -------------------------------------------------------------------------
+
+    def _sign(self, payload: bytes) -> str:
+        return base64.urlsafe_b64encode(hmac.new(self._secret, payload, hashlib.sha256).digest()).rstrip(b"=").decode()
+
+    def _issue_token(self, operation: str, object_path: str, mime_type: Optional[str], ttl_seconds: int) -> str:
+        payload = json.dumps(
+            {"o": operation, "p": object_path, "m": mime_type, "e": int(time.time()) + ttl_seconds},
+            separators=(",", ":"),
+        ).encode()
+        encoded = base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+        return f"{encoded}.{self._sign(payload)}"
+
+    def _verify_token(self, token: str, operation: str) -> dict:
+        try:
+            encoded, signature = token.split(".", 1)
+            payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        except ValueError as e:
+            raise InvalidUploadToken("Malformed token") from e
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidUploadToken("Invalid token signature")
+        claims = json.loads(payload)
+        if claims.get("o") != operation:
+            raise InvalidUploadToken("Token is not valid for this operation")
+        if claims["e"] < time.time():
+            raise InvalidUploadToken("Token expired")
+        return claims
+
+    def issue_upload_token(self, object_path: str, mime_type: str, ttl_seconds: int) -> str:
+        return self._issue_token("put", object_path, mime_type, ttl_seconds)
+
+    def verify_upload_token(self, token: str) -> tuple[str, str]:
+        """Return (object_path, mime_type) for a valid, unexpired upload token."""
+        claims = self._verify_token(token, "put")
+        return claims["p"], claims["m"]
+
+    def verify_download_token(self, token: str) -> str:
+        """Return the object_path of a valid, unexpired download token."""
+        return self._verify_token(token, "get")["p"]
+
+    def _presign_put_sync(self, object_path: str, mime_type: str, ttl_seconds: int) -> str:
+        return f"{self.base_url}{self.UPLOAD_ROUTE}/{self.issue_upload_token(object_path, mime_type, ttl_seconds)}"
+
+    def _presign_get_sync(self, object_path: str, ttl_seconds: int) -> str:
+        token = self._issue_token("get", object_path, None, ttl_seconds)
+        return f"{self.base_url}{self.DOWNLOAD_ROUTE}/{token}"
+
+    # -------------------------------------------------------------------------
+    # Objects
+    # -------------------------------------------------------------------------
+
+    async def write_stream(
+        self,
+        object_path: str,
+        mime_type: str,
+        chunks: AsyncIterator[bytes],
+        max_bytes: int,
+    ) -> int:
+        """
+        Store an uploaded object; returns its size.
+
+        Data goes to a temp file that is renamed into place, so readers
+        never see a partial object. Raises ObjectTooLarge past `max_bytes`.
+        """
+        path = self.path_for(object_path)
+        tmp = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        await self.run_blocking(lambda: path.parent.mkdir(parents=True, exist_ok=True))
+        f = await self.run_blocking(open, tmp, "wb")
+        size = 0
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ObjectTooLarge(object_path)
+                await self.run_blocking(f.write, chunk)
+            await self.run_blocking(f.close)
+
+            def commit() -> None:
+                meta = {"object_path": object_path, "mime_type": mime_type, "size": size, "stored_at": time.time()}
+                meta_tmp = self.meta_path(tmp)
+                meta_tmp.write_text(json.dumps(meta))
+                os.replace(tmp, path)
+                os.replace(meta_tmp, self.meta_path(path))
+
+            await self.run_blocking(commit)
+        except BaseException:
+            f.close()
+            tmp.unlink(missing_ok=True)
+            self.meta_path(tmp).unlink(missing_ok=True)
+            raise
+        return size
+
+    def _head_sync(self, object_path: str) -> Optional[int]:
+        try:
+            return os.stat(self.path_for(object_path)).st_size
+        except FileNotFoundError:
+            return None
+
+    async def mime_type(self, object_path: str) -> Optional[str]:
+        """MIME type recorded at upload, or None if the object has no sidecar."""
+        def read() -> Optional[str]:
+            try:
+                return json.loads(self.meta_path(self.path_for(object_path)).read_text())["mime_type"]
+            except FileNotFoundError:
+                return None
+        return await self.run_blocking(read)
+
+    def iter_chunks_sync(self, object_path: str, chunk_size: int) -> Iterator[bytes]:
+        try:
+            f = open(self.path_for(object_path), "rb")
+        except FileNotFoundError as e:
+            raise ObjectNotFound(object_path) from e
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            # Chunks are copied straight out of the page cache, with no read() syscalls
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, len(mapped), chunk_size):
+                    yield mapped[offset:offset + chunk_size]
+
+
+def create_storage(settings) -> StorageBackend:
+    """Build the configured storage backend from application settings."""
+    if settings.storage_provider == StorageProvider.LOCAL:
+        return LocalStorage(
+            root=settings.local_storage_root,
+            base_url=settings.public_base_url,
+            secret=settings.local_storage_secret,
+            max_workers=settings.storage_max_workers,
+        )
+    if settings.storage_provider == StorageProvider.GCS:
+        return GCSStorage(
+            bucket_name=settings.gcs_bucket_name,
+            project_id=settings.gcs_project_id,
+            max_workers=settings.storage_max_workers,
+        )
+    return S3Storage(
+        bucket_name=settings.s3_bucket_name,
+        region=settings.aws_region,
+        access_key_id=settings.aws_access_key_id,
+        secret_access_key=settings.aws_secret_access_key,
+        max_workers=settings.storage_max_workers,
+    )
@@ -12,6 +12,8 @@ from typing import Optional
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field
 
+from app.services import deadline
+
 
 class ValuationMethod(str, Enum):
     AI_VISION = "ai_vision"
@@ -191,6 +193,7 @@ class ValuationEngine:
         
         This is the primary valuation endpoint used by all PROVENIQ apps.
         """
+        deadline.check("valuation")
         valuation_id = uuid4()
         factors = []
         
@@ -293,6 +296,7 @@ class ValuationEngine:
         
         # Write to Ledger if available
         if self.ledger_client:
+            deadline.check("valuation ledger write")
             await self.ledger_client.write_event(
                 source="core",
                 event_type="VALUATION_COMPUTED",
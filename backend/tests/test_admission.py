@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.admission import AdmissionController, AdmissionRejected, RouteGroupPolicy
+
+
+def make_controller(max_tenants: int = 10_000, **overrides) -> AdmissionController:
+    policy = dict(
+        rate_per_second=100, burst=100, tenant_concurrency=1,
+        group_concurrency=10, interactive_reserve=0, max_queue_seconds=0.5,
+    )
+    policy.update(overrides)
+    return AdmissionController({"test": RouteGroupPolicy(**policy)}, max_tenants=max_tenants)
+
+
+def test_waits_for_tenant_slot_freed_within_queue_window():
+    controller = make_controller()
+
+    async def scenario() -> float:
+        async def holder():
+            async with controller.admit("tenant", "test"):
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)  # Let the holder take the only slot
+        start = time.monotonic()
+        async with controller.admit("tenant", "test"):
+            waited = time.monotonic() - start
+        await task
+        return waited
+
+    waited = asyncio.run(scenario())
+    assert 0.03 <= waited < 0.5
+
+
+def test_waits_for_group_slot_freed_within_queue_window():
+    controller = make_controller(tenant_concurrency=10, group_concurrency=1)
+
+    async def scenario() -> None:
+        async def holder():
+            async with controller.admit("a", "test"):
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        async with controller.admit("b", "test"):
+            pass
+        await task
+
+    asyncio.run(scenario())
+
+
+def test_sheds_when_slot_not_freed_within_queue_window():
+    controller = make_controller(max_queue_seconds=0.05)
+
+    async def scenario() -> None:
+        async with controller.admit("tenant", "test"):
+            with pytest.raises(AdmissionRejected):
+                async with controller.admit("tenant", "test"):
+                    pass
+
+    asyncio.run(scenario())
+
+
+def test_sheds_immediately_when_token_deficit_outlasts_window():
+    controller = make_controller(rate_per_second=1, burst=1, tenant_concurrency=10)
+
+    async def scenario() -> float:
+        async with controller.admit("tenant", "test"):
+            pass
+        start = time.monotonic()
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit("tenant", "test"):
+                pass
+        assert rejected.value.reason == "Rate limit exceeded"
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) < 0.05
+
+
+def test_idle_tenants_are_pruned():
+    controller = make_controller(max_tenants=3)
+
+    async def scenario() -> None:
+        for i in range(10):
+            async with controller.admit(f"tenant-{i}", "test"):
+                pass
+            # Refill so the tenant is idle with a full bucket
+            controller._tenants[(f"tenant-{i}", "test")].bucket.tokens = 100
+
+    asyncio.run(scenario())
+    assert len(controller._tenants) <= 3
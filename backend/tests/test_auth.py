@@ -0,0 +1,175 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app import auth as auth_module
+from app.auth import TokenVerifier
+
+PROJECT_ID = "proveniq-test"
+ISSUER = f"https://securetoken.google.com/{PROJECT_ID}"
+
+
+class FakeFirebase:
+    """Stands in for google.auth.jwt and firebase_admin.auth, keyed by token string."""
+
+    def __init__(self):
+        self.tokens: dict[str, dict] = {}
+        self.kids: dict[str, str] = {}
+        self.revoked: set[str] = set()
+        self.clock_skew_seconds = 0.0
+        self.local_decodes = 0
+        self.admin_verifications = 0
+
+    def claims(self, token: str) -> dict:
+        claims = self.tokens.get(token)
+        if claims is None:
+            raise ValueError("Could not verify token signature")
+        if claims["exp"] + self.clock_skew_seconds <= time.time():
+            raise ValueError("Token expired")
+        return dict(claims)
+
+    def decode(self, token, certs, audience, clock_skew_in_seconds):
+        self.local_decodes += 1
+        return self.claims(token)
+
+    def decode_header(self, token):
+        return {"kid": self.kids.get(token, "kid-1")}
+
+    def verify_id_token(self, token):
+        self.admin_verifications += 1
+        if token in self.revoked:
+            raise auth_module.auth.RevokedIdTokenError("The Firebase ID token has been revoked")
+        return dict(self.claims(token), uid=self.tokens[token]["sub"])
+
+    def issue(self, token: str, ttl: float, **claims) -> str:
+        self.tokens[token] = {"iss": ISSUER, "sub": f"uid-{token}", "exp": time.time() + ttl, **claims}
+        return token
+
+
+@pytest.fixture
+def firebase(monkeypatch):
+    fake = FakeFirebase()
+    monkeypatch.setattr(auth_module.firebase_admin, "get_app", lambda: SimpleNamespace(project_id=PROJECT_ID))
+    monkeypatch.setattr(auth_module.google_jwt, "decode", fake.decode)
+    monkeypatch.setattr(auth_module.google_jwt, "decode_header", fake.decode_header)
+    monkeypatch.setattr(auth_module.auth, "verify_id_token", fake.verify_id_token)
+    return fake
+
+
+@pytest.fixture
+def verifier():
+    verifier = TokenVerifier(max_workers=2)
+    verifier._certs = {"kid-1": "-----BEGIN CERTIFICATE-----"}
+    verifier._certs_expire_at = time.time() + 3600
+    yield verifier
+    verifier._executor.shutdown(wait=False)
+
+
+def test_verified_token_is_cached_until_it_expires(firebase, verifier):
+    token = firebase.issue("short", ttl=0.3, email="a@example.com", admin=True)
+
+    async def scenario():
+        first = await verifier.verify(token)
+        second = await verifier.verify(token)
+        decodes_while_valid = firebase.local_decodes
+        await asyncio.sleep(0.4)
+        with pytest.raises(ValueError, match="expired"):
+            await verifier.verify(token)
+        return first, second, decodes_while_valid
+
+    first, second, decodes_while_valid = asyncio.run(scenario())
+    assert first == second
+    assert (first.uid, first.email, first.admin) == ("uid-short", "a@example.com", True)
+    assert decodes_while_valid == 1
+    # The cache entry lapsed with `exp`, so the expired token was checked again and refused
+    assert firebase.local_decodes == 2
+
+
+def test_token_past_exp_within_clock_skew_is_not_cached(firebase, verifier):
+    # google_jwt accepts it within clock skew, but `exp` has already passed
+    firebase.clock_skew_seconds = 10
+    token = firebase.issue("skewed", ttl=-1)
+
+    async def scenario():
+        await verifier.verify(token)
+        await verifier.verify(token)
+
+    asyncio.run(scenario())
+    assert firebase.local_decodes == 2
+
+
+def test_invalid_tokens_are_not_cached(firebase, verifier):
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await verifier.verify("forged")
+
+    asyncio.run(scenario())
+    assert firebase.local_decodes == 2
+    assert verifier.stats()["size"] == 0
+
+
+def test_wrong_issuer_is_rejected_without_fallback(firebase, verifier):
+    token = firebase.issue("other-project", ttl=60, iss="https://securetoken.google.com/elsewhere")
+
+    with pytest.raises(ValueError, match="issuer"):
+        asyncio.run(verifier.verify(token))
+    assert firebase.admin_verifications == 0
+
+
+def test_unknown_kid_falls_back_to_firebase_admin(firebase, verifier):
+    token = firebase.issue("rotated", ttl=60)
+    firebase.kids[token] = "kid-2"
+
+    user = asyncio.run(verifier.verify(token))
+    assert user.uid == "uid-rotated"
+    assert firebase.local_decodes == 0
+    assert verifier.fallback_verifications == 1
+
+
+def test_missing_or_stale_certs_fall_back_to_firebase_admin(firebase, verifier):
+    first = firebase.issue("no-certs", ttl=60)
+    second = firebase.issue("stale-certs", ttl=60)
+
+    async def scenario():
+        certs = verifier._certs
+        verifier._certs = {}
+        await verifier.verify(first)
+        verifier._certs = certs
+        verifier._certs_expire_at = time.time() - 1
+        await verifier.verify(second)
+        # Fallback results are cached like local ones
+        await verifier.verify(second)
+
+    asyncio.run(scenario())
+    assert firebase.local_decodes == 0
+    assert firebase.admin_verifications == 2
+    assert verifier.fallback_verifications == 2
+
+
+def test_revoked_token_rejected_by_fallback_is_not_cached(firebase, verifier):
+    token = firebase.issue("revoked", ttl=60)
+    firebase.kids[token] = "kid-2"
+    firebase.revoked.add(token)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(auth_module.auth.RevokedIdTokenError):
+                await verifier.verify(token)
+
+    asyncio.run(scenario())
+    assert firebase.admin_verifications == 2
+    assert verifier.stats()["size"] == 0
+
+
+def test_concurrent_verifications_of_one_token_share_a_decode(firebase, verifier):
+    token = firebase.issue("burst", ttl=60)
+
+    async def scenario():
+        return await asyncio.gather(*(verifier.verify(token) for _ in range(5)))
+
+    users = asyncio.run(scenario())
+    assert {user.uid for user in users} == {"uid-burst"}
+    assert firebase.local_decodes == 1
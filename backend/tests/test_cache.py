@@ -0,0 +1,71 @@
+import asyncio
+
+from app.services.cache import SingleFlight
+
+
+def test_waiters_take_over_when_leader_is_cancelled():
+    flights: SingleFlight[str] = SingleFlight()
+    calls = []
+
+    async def fn() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def scenario():
+        leader = asyncio.create_task(flights.do("key", fn))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flights.do("key", fn)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        assert leader.cancelled()
+        return results
+
+    results = asyncio.run(scenario())
+    # One waiter re-ran fn as the new leader; the other shared its result
+    assert sorted(results, key=lambda r: r[1]) == [(2, False), (2, True)]
+    assert len(calls) == 2
+
+
+def test_waiters_share_result():
+    flights: SingleFlight[str] = SingleFlight()
+    calls = []
+
+    async def fn() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", fn) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+    assert [r[0] for r in results] == ["done"] * 3
+    assert len(calls) == 1
+    assert flights.coalesced == 2
+
+
+def test_exception_reaches_every_waiter_and_clears_key():
+    flights: SingleFlight[str] = SingleFlight()
+    calls = []
+
+    async def failing() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def ok() -> str:
+        return "recovered"
+
+    async def scenario():
+        outcomes = await asyncio.gather(*(flights.do("key", failing) for _ in range(3)), return_exceptions=True)
+        in_flight_after = flights.in_flight("key")
+        # The failed execution is not reused by the next caller
+        return outcomes, in_flight_after, await flights.do("key", ok)
+
+    outcomes, in_flight_after, retry = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(isinstance(o, ValueError) and str(o) == "upstream down" for o in outcomes)
+    assert not in_flight_after
+    assert retry == ("recovered", False)
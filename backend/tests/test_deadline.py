@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from app.services import deadline
+from app.services.deadline import DeadlineExceeded
+
+
+def test_batches_cover_everything_without_a_deadline():
+    assert list(deadline.batches(5, 2)) == [(0, 2), (2, 4), (4, 5)]
+
+
+def test_batches_shrink_to_the_remaining_budget():
+    sizes = []
+    with deadline.deadline_scope(0.3):
+        for start, end in deadline.batches(1000, 100, "work"):
+            sizes.append(end - start)
+            time.sleep((end - start) * 0.002)  # 2ms per item: ~0.1s left covers ~50
+            if len(sizes) == 2:
+                break
+    assert sizes[0] == 100
+    assert sizes[1] < 100
+
+
+def test_batches_stop_before_a_batch_that_cannot_fit():
+    started = []
+    with deadline.deadline_scope(0.1):
+        with pytest.raises(DeadlineExceeded):
+            for start, end in deadline.batches(100, 2, "work"):
+                started.append(start)
+                time.sleep(0.08)  # 40ms per item; the ~20ms left can't fit another
+    assert started == [0]
@@ -0,0 +1,77 @@
+from app.services.hashing import HashScheme, canonicalize, content_hash_from_canonical, stored_item_fields
+from app.services.integrity import check_inspection
+from app.services.merkle import MerkleTree, leaf_hash_canonical
+
+ITEMS = [
+    {"room_key": "kitchen", "item_key": "sink", "ordinal": 0, "condition_rating": 4, "notes": "Chipped rim"},
+    {"room_key": "kitchen", "item_key": "oven", "is_damaged": True, "damage_description": "Door hinge"},
+    {"room_key": "bath", "item_key": "mirror", "ordinal": 1, "extra": {"photo_count": 2}},
+]
+
+
+def submitted_inspection(items: list[dict], scheme: HashScheme = HashScheme.V1) -> dict:
+    """An inspection dict as the sweep builds it, for a clean submission of `items`."""
+    stored = []
+    leaves = {}
+    for position, item in enumerate(items):
+        canonical = canonicalize(item)
+        digest = leaf_hash_canonical(canonical)
+        key = (item["room_key"], item["item_key"], item.get("ordinal", 0))
+        leaves[key] = digest
+        stored.append({
+            "room_key": key[0], "item_key": key[1], "ordinal": key[2], "position": position,
+            "canonical_json": canonical, "leaf_hash": digest.hex(), **stored_item_fields(item),
+        })
+    root = MerkleTree(leaves).root()
+    v1 = content_hash_from_canonical([row["canonical_json"] for row in stored])
+    return {
+        "id": "insp-1",
+        "content_hash": root if scheme == HashScheme.V2 else v1,
+        "hash_scheme": scheme.value,
+        "merkle_root": root,
+        "items": stored,
+        "evidence": [],
+    }
+
+
+def kinds(result: dict) -> list[str]:
+    return [finding["kind"] for finding in result["findings"]]
+
+
+def test_clean_submission_has_no_findings():
+    for scheme in HashScheme:
+        assert check_inspection(submitted_inspection(ITEMS, scheme))["findings"] == []
+
+
+def test_tampered_column_is_flagged_while_hashes_still_match():
+    inspection = submitted_inspection(ITEMS)
+    inspection["items"][0]["notes"] = "Pristine"
+    inspection["items"][1]["is_damaged"] = False
+
+    findings = check_inspection(inspection)["findings"]
+    assert [(f["kind"], f["item"], f["columns"]) for f in findings] == [
+        ("item_column_mismatch", "kitchen/sink/0", ["notes"]),
+        ("item_column_mismatch", "kitchen/oven/0", ["is_damaged"]),
+    ]
+
+
+def test_tampered_key_column_is_flagged():
+    inspection = submitted_inspection(ITEMS)
+    inspection["items"][2]["ordinal"] = 5
+    findings = check_inspection(inspection)["findings"]
+    assert findings[0]["kind"] == "item_column_mismatch"
+    assert findings[0]["columns"] == ["ordinal"]
+
+
+def test_tampered_json_breaks_the_hash():
+    inspection = submitted_inspection(ITEMS)
+    inspection["items"][0]["canonical_json"] = canonicalize(dict(ITEMS[0], notes="Pristine"))
+    assert "item_leaf_mismatch" in kinds(check_inspection(inspection))
+
+
+def test_inspection_without_stored_items_is_unverifiable_not_mismatched():
+    legacy = dict(submitted_inspection(ITEMS), items=[], merkle_root=None)
+    assert kinds(check_inspection(legacy)) == ["unverifiable"]
+
+    empty = submitted_inspection([])
+    assert check_inspection(empty)["findings"] == []
@@ -0,0 +1,100 @@
+import hashlib
+
+from app.services.hashing import canonicalize, compute_content_hash, content_hash_from_canonical
+from app.services.merkle import MerkleTree, ProofStep, leaf_hash_canonical, node_hash
+
+
+def make_items(n: int) -> dict:
+    return {
+        ("kitchen", "sink", i): {
+            "room_key": "kitchen", "item_key": "sink", "ordinal": i, "condition_rating": i % 5, "notes": f"n{i}",
+        }
+        for i in range(n)
+    }
+
+
+def make_tree(n: int) -> MerkleTree:
+    return MerkleTree({key: leaf_hash_canonical(canonicalize(item)) for key, item in make_items(n).items()})
+
+
+def reference_root(leaves: list[bytes]) -> bytes:
+    """RFC 6962 section 2.1 Merkle Tree Hash, written out independently."""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return hashlib.sha256(b"\x01" + reference_root(leaves[:k]) + reference_root(leaves[k:])).digest()
+
+
+# Roots stored by submissions before the tree's update machinery was removed
+STORED_ROOTS = {
+    1: "47ad08a2c8c3ee308edfd1c3b82b1cf0477f8321223384d3c23681472cf283cf",
+    2: "badfc6a619f3098417a73869b89df1da5757877f30015e636a3bd58fc84500b9",
+    3: "747d884b76bdcec8f33eb3c65f4fd5083f5025d9ee14ad8d1384aec58eaa81e9",
+    5: "53db46b44db153a292819ae4259407ee56faf1797ff0bc011e43ba42d18b9ff5",
+    7: "11aceabfecb1a3519305e3606762df6dd0d24d4b30b1b2928d52a2d5e9af2658",
+}
+
+
+def test_roots_match_stored_roots():
+    for size, root in STORED_ROOTS.items():
+        assert make_tree(size).root() == root
+
+
+def test_roots_match_rfc6962_for_every_size():
+    assert MerkleTree().root() == hashlib.sha256(b"").hexdigest()
+    for size in range(1, 18):
+        tree = make_tree(size)
+        leaves = [tree.leaf(key) for key in tree.keys()]
+        assert tree.root() == reference_root(leaves).hex()
+
+
+def test_leaves_are_ordered_by_key_not_insertion():
+    items = make_items(5)
+    leaves = {key: leaf_hash_canonical(canonicalize(item)) for key, item in reversed(list(items.items()))}
+    assert MerkleTree(leaves).root() == STORED_ROOTS[5]
+
+
+def test_odd_tree_splits_at_largest_power_of_two():
+    # 3 leaves: root = node(node(l0, l1), l2), so l2's path is one left sibling
+    tree = make_tree(3)
+    l0, l1, l2 = (tree.leaf(key) for key in tree.keys())
+    assert tree.proof(tree.keys()[2]) == [ProofStep(side="left", hash=node_hash(l0, l1).hex())]
+    assert tree.proof(tree.keys()[0]) == [ProofStep(side="right", hash=l1.hex()), ProofStep(side="right", hash=l2.hex())]
+
+
+def test_inclusion_proofs_verify_for_every_leaf():
+    for size in range(1, 18):
+        tree = make_tree(size)
+        root = tree.root()
+        for key in tree.keys():
+            proof = tree.proof(key)
+            assert MerkleTree.verify(tree.leaf(key), proof, root)
+            assert not MerkleTree.verify(hashlib.sha256(b"tampered").digest(), proof, root)
+
+
+def test_tampered_proof_fails():
+    tree = make_tree(7)
+    key = tree.keys()[4]
+    proof = tree.proof(key)
+    proof[0] = ProofStep(side=proof[0].side, hash="00" * 32)
+    assert not MerkleTree.verify(tree.leaf(key), proof, tree.root())
+
+
+def test_proofs_from_persisted_leaves():
+    tree = make_tree(6)
+    restored = MerkleTree.from_json(tree.to_json())
+    assert restored.root() == tree.root()
+    key = tree.keys()[5]
+    assert restored.index_of(key) == 5
+    assert restored.proof(key) == tree.proof(key)
+
+
+def test_v1_content_hash_is_unchanged():
+    items = [dict(item, damage_description=None) for item in make_items(3).values()]
+    v1 = "453c30bf07c17ea93632e0b8198b40f2c3f9d8675b80bf7caba08b42da1ac7be"
+    assert compute_content_hash(items) == v1
+    assert content_hash_from_canonical([canonicalize(item) for item in items]) == v1
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from app.services.idempotency import IdempotencyKeyReusedError, IdempotencyStore, request_fingerprint
+from app.services.quote_cache import QuoteCache
+
+INPUTS = {"asset_id": "asset-1", "coverage_type": "transit", "term_days": 30}
+
+
+def make_fetch(calls: list, delay: float = 0.0):
+    async def fetch() -> dict:
+        calls.append(1)
+        quote_id = f"q{len(calls)}"
+        await asyncio.sleep(delay)
+        return {"quote_id": quote_id}
+
+    return fetch
+
+
+def test_identical_misses_share_one_fetch_then_hit():
+    cache = QuoteCache()
+    calls = []
+    fetch = make_fetch(calls, delay=0.01)
+
+    async def scenario():
+        first = await asyncio.gather(*(cache.get_or_fetch("asset-1", INPUTS, fetch) for _ in range(3)))
+        return first, await cache.get_or_fetch("asset-1", INPUTS, fetch)
+
+    first, again = asyncio.run(scenario())
+    assert len(calls) == 1
+    # Only the caller that went upstream reports a miss
+    assert sorted(hit for _, hit in first) == [False, True, True]
+    assert again == ({"quote_id": "q1"}, True)
+
+
+def test_invalidation_drops_only_that_assets_quotes():
+    cache = QuoteCache()
+    calls = []
+    fetch = make_fetch(calls)
+    other = dict(INPUTS, asset_id="asset-2")
+
+    async def scenario():
+        await cache.get_or_fetch("asset-1", INPUTS, fetch)
+        await cache.get_or_fetch("asset-2", other, fetch)
+        cache.invalidate_asset("asset-1")
+        return await cache.get_or_fetch("asset-1", INPUTS, fetch), await cache.get_or_fetch("asset-2", other, fetch)
+
+    refetched, untouched = asyncio.run(scenario())
+    assert refetched == ({"quote_id": "q3"}, False)
+    assert untouched == ({"quote_id": "q2"}, True)
+    assert cache.invalidations == 1
+
+
+def test_fetch_overtaken_by_invalidation_is_returned_but_not_stored():
+    cache = QuoteCache()
+    calls = []
+    slow = make_fetch(calls, delay=0.05)
+    later_inputs = dict(INPUTS, term_days=60)
+
+    async def scenario():
+        stale = asyncio.create_task(cache.get_or_fetch("asset-1", INPUTS, slow))
+        await asyncio.sleep(0.01)
+        cache.invalidate_asset("asset-1")
+        # Started after the invalidation, while the stale fetch is still in flight
+        fresh = asyncio.create_task(cache.get_or_fetch("asset-1", later_inputs, slow))
+        results = await asyncio.gather(stale, fresh)
+        return results, await cache.get_or_fetch("asset-1", INPUTS, slow), await cache.get_or_fetch("asset-1", later_inputs, slow)
+
+    (stale, fresh), after_stale, after_fresh = asyncio.run(scenario())
+    assert stale == ({"quote_id": "q1"}, False)
+    assert fresh == ({"quote_id": "q2"}, False)
+    assert after_stale == ({"quote_id": "q3"}, False)
+    assert after_fresh == ({"quote_id": "q2"}, True)
+
+
+def test_generation_is_reset_once_fetches_finish():
+    cache = QuoteCache()
+    calls = []
+    slow = make_fetch(calls, delay=0.02)
+
+    async def scenario():
+        in_flight = asyncio.create_task(cache.get_or_fetch("asset-1", INPUTS, slow))
+        await asyncio.sleep(0.005)
+        cache.invalidate_asset("asset-1")
+        await in_flight
+        # A fetch after the asset went idle stores normally
+        await cache.get_or_fetch("asset-1", INPUTS, slow)
+        return await cache.get_or_fetch("asset-1", INPUTS, slow)
+
+    assert asyncio.run(scenario()) == ({"quote_id": "q2"}, True)
+    assert len(calls) == 2
+
+
+def test_failed_fetch_is_not_cached():
+    cache = QuoteCache()
+    calls = []
+
+    async def failing() -> dict:
+        calls.append(1)
+        raise RuntimeError("protect down")
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("asset-1", INPUTS, failing)
+        return await cache.get_or_fetch("asset-1", INPUTS, make_fetch(calls))
+
+    assert asyncio.run(scenario()) == ({"quote_id": "q2"}, False)
+
+
+def test_idempotent_replay_returns_the_recorded_quote_and_headers_after_invalidation():
+    # Composed the way the gateway's quote route does: the idempotency
+    # record holds the quote and the X-Quote-Cache header the client got
+    cache = QuoteCache()
+    store = IdempotencyStore()
+    calls = []
+    fetch = make_fetch(calls)
+    fingerprint = request_fingerprint(INPUTS)
+
+    async def quote_route(key: str):
+        async def record():
+            quote, hit = await cache.get_or_fetch("asset-1", INPUTS, fetch)
+            return quote, {"X-Quote-Cache": "hit" if hit else "miss"}
+
+        return await store.run(f"user-1:protect.quote:{key}", fingerprint, record)
+
+    async def scenario():
+        first = await quote_route("key-a")
+        cache.invalidate_asset("asset-1")
+        return first, await quote_route("key-a"), await quote_route("key-b"), await quote_route("key-c")
+
+    first, replay, new_key, cached = asyncio.run(scenario())
+    assert first == (({"quote_id": "q1"}, {"X-Quote-Cache": "miss"}), False)
+    # The replay ignores the invalidation: it answers what the client already got
+    assert replay == (({"quote_id": "q1"}, {"X-Quote-Cache": "miss"}), True)
+    assert new_key == (({"quote_id": "q2"}, {"X-Quote-Cache": "miss"}), False)
+    assert cached == (({"quote_id": "q2"}, {"X-Quote-Cache": "hit"}), False)
+    assert store.replays == 1
+
+
+def test_idempotency_key_reused_with_other_quote_inputs_is_rejected():
+    store = IdempotencyStore()
+    calls = []
+    fetch = make_fetch(calls)
+
+    async def scenario():
+        await store.run("user-1:protect.quote:key-a", request_fingerprint(INPUTS), fetch)
+        await store.run("user-1:protect.quote:key-a", request_fingerprint(dict(INPUTS, term_days=60)), fetch)
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        asyncio.run(scenario())
+    assert len(calls) == 1